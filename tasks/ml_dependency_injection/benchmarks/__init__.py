@@ -0,0 +1,4 @@
+"""
+Microbenchmarks for the ML components. Run from the package directory, e.g.
+python -m benchmarks.optimizer_step
+"""
\ No newline at end of file
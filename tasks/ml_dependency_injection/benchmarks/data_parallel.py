@@ -0,0 +1,81 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from components.trainloop import TrainLoop
+
+
+def make_config(data_path: str, log_path: str, input_dim: int, trainloop: dict) -> dict:
+    model = {'class': 'LinearModel', 'input_dim': input_dim}
+    return {
+        'dataloader': {'class': 'CSVDataLoader', 'filename': data_path},
+        'metricfunction': {'class': 'MSE'},
+        'tracker': {'class': 'LogfileTracker', 'logfile': log_path},
+        'model': model,
+        'optimizer': {'class': 'SGD', 'learning_rate': 0.01},
+        'trainloop': dict(trainloop, model_config=model) if trainloop['class'] == 'DataParallelTrainLoop' else trainloop
+    }
+
+
+def run(config: dict, seed: int):
+    """Train from config with a fixed seed and return (best epoch samples/s, final params)."""
+    np.random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        train_loop = TrainLoop.create(config)
+    
+    # Time only the training passes so data loading and worker startup are excluded
+    rates = []
+    train_on_array = train_loop._train_on_array
+    def timed(X, y):
+        start = time.perf_counter()
+        loss = train_on_array(X, y)
+        rates.append(len(y) / (time.perf_counter() - start))
+        return loss
+    train_loop._train_on_array = timed
+    
+    # Per-epoch output would interleave with the results table
+    with contextlib.redirect_stdout(io.StringIO()):
+        train_loop.execute()
+    return max(rates), train_loop.model.flat_params().copy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Training throughput: StandardTrainLoop vs DataParallelTrainLoop')
+    parser.add_argument('--samples', type=int, default=200000)
+    parser.add_argument('--input-dim', type=int, default=256)
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    X = rng.normal(size=(args.samples, args.input_dim))
+    y = X @ rng.normal(size=args.input_dim) + rng.normal(scale=0.1, size=args.samples)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, 'data.csv')
+        frame = pd.DataFrame(X, columns=[f'feature{i}' for i in range(args.input_dim)])
+        frame['target'] = y
+        frame.to_csv(data_path, index=False)
+        log_path = os.path.join(tmp, 'benchmark.log')
+        
+        loop = {'epochs': args.epochs, 'batch_size': args.batch_size}
+        base_rate, base_params = run(make_config(data_path, log_path, args.input_dim,
+                                                 dict(loop, **{'class': 'StandardTrainLoop'})), args.seed)
+        
+        print(f"{'trainloop':>24} {'workers':>8} {'samples/s':>12} {'speedup':>8} {'max |dparam|':>13}")
+        print(f"{'StandardTrainLoop':>24} {1:>8} {base_rate:>12.0f}")
+        for workers in args.workers:
+            config = make_config(data_path, log_path, args.input_dim,
+                                 dict(loop, **{'class': 'DataParallelTrainLoop', 'num_workers': workers}))
+            rate, params = run(config, args.seed)
+            diff = np.max(np.abs(params - base_params))
+            print(f"{'DataParallelTrainLoop':>24} {workers:>8} {rate:>12.0f} {rate / base_rate:>7.2f}x {diff:>13.2e}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
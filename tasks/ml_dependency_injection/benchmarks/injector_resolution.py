@@ -0,0 +1,36 @@
+import argparse
+import contextlib
+import io
+import time
+import yaml
+from components.trainloop import TrainLoop
+from core.dependency_injection import DependencyInjector
+
+
+def microseconds_per_build(config, repeats: int, cold: bool) -> float:
+    """Mean time to create the train loop and its dependencies from config; cold clears the cache first."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        TrainLoop.create(config)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            if cold:
+                DependencyInjector.clear_cache()
+            TrainLoop.create(config)
+        return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pipeline construction time with and without the resolution cache')
+    parser.add_argument('--config', default='configs/sample_config.yaml')
+    parser.add_argument('--repeats', type=int, default=500)
+    args = parser.parse_args()
+    config = yaml.safe_load(open(args.config))
+    
+    print(f"{'source':>6} {'cold us':>10} {'cached us':>10} {'speedup':>8}")
+    for source, value in (('dict', config), ('yaml', args.config)):
+        cold = microseconds_per_build(value, args.repeats, cold=True)
+        cached = microseconds_per_build(value, args.repeats, cold=False)
+        print(f"{source:>6} {cold:>10.1f} {cached:>10.1f} {cold / cached:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import argparse
+import contextlib
+import io
+import tempfile
+import numpy as np
+import yaml
+from components.trainloop import TrainLoop
+
+
+SCHEDULES = {
+    'constant': None,
+    'warmup': {'class': 'WarmupScheduler', 'warmup_epochs': 1},
+    'cosine': {'class': 'CosineScheduler', 'warmup_epochs': 1},
+    'step': {'class': 'StepScheduler', 'step_epochs': 5, 'gamma': 0.3},
+    'one-cycle': {'class': 'OneCycleScheduler'},
+    'plateau': {'class': 'ReduceOnPlateauScheduler', 'patience': 1, 'gamma': 0.3}
+}
+
+
+def epoch_metrics(config: dict) -> np.ndarray:
+    """Train from config and return the per-epoch training metric from the tracker's store."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = dict(config, tracker={'class': 'LocalStoreTracker', 'directory': tmp})
+        with contextlib.redirect_stdout(io.StringIO()):
+            train_loop = TrainLoop.create(config)
+            train_loop.execute()
+        return train_loop.tracker.store.read('metric')[1]
+
+
+def closed_form_mse(config: dict) -> float:
+    """Lowest reachable training MSE, from NormalEquationTrainLoop."""
+    config = dict(config, trainloop={'class': 'NormalEquationTrainLoop'})
+    config.pop('optimizer')
+    return epoch_metrics(config)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Epochs to reach a target training MSE per learning-rate schedule')
+    parser.add_argument('--config', default='configs/sample_config.yaml')
+    parser.add_argument('--epochs', type=int, default=30)
+    parser.add_argument('--learning-rates', type=float, nargs='+', default=[0.01, 0.1, 0.3],
+                        help='Peak learning rates to try each schedule with')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Target is (1 + tolerance) times the closed-form MSE')
+    parser.add_argument('--seeds', type=int, default=5)
+    args = parser.parse_args()
+    
+    base = yaml.safe_load(open(args.config))
+    base['metricfunction'] = {'class': 'MSE'}
+    base['trainloop']['epochs'] = args.epochs
+    
+    target = (1 + args.tolerance) * closed_form_mse(base)
+    print(f"target MSE {target:.5f} ({args.tolerance:.0%} above the closed-form fit), "
+          f"median over {args.seeds} seeds, '-' = not reached in {args.epochs} epochs")
+    print(f"{'schedule':>10} {'lr':>6} {'epochs to target':>17} {'final MSE':>10}")
+    
+    for name, schedule in SCHEDULES.items():
+        for learning_rate in args.learning_rates:
+            reached = []
+            final = []
+            for seed in range(args.seeds):
+                config = dict(base, optimizer=dict(base['optimizer'], learning_rate=learning_rate))
+                if schedule is not None:
+                    config['scheduler'] = schedule
+                np.random.seed(seed)
+                metrics = epoch_metrics(config)
+                hits = np.flatnonzero(metrics <= target)
+                reached.append(hits[0] + 1 if len(hits) else np.inf)
+                final.append(metrics[-1])
+            epochs = np.median(reached)
+            epochs = f"{epochs:.0f}" if np.isfinite(epochs) else '-'
+            print(f"{name:>10} {learning_rate:>6g} {epochs:>17} {np.median(final):>10.5f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
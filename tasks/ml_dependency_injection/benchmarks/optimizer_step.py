@@ -0,0 +1,78 @@
+import argparse
+import time
+import numpy as np
+from components.optimizer import Optimizer
+
+
+class LegacyAdam:
+    """The per-parameter Adam update that allocates temporaries on every step, kept as a baseline."""
+    
+    def __init__(self, params, learning_rate=0.001, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        self.params = params
+        self.learning_rate = learning_rate
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.m = None
+        self.v = None
+        self.t = 0
+    
+    def step(self, gradients):
+        if self.m is None:
+            self.m = [np.zeros_like(grad) for grad in gradients]
+            self.v = [np.zeros_like(grad) for grad in gradients]
+        
+        self.t += 1
+        
+        for i, (param, grad) in enumerate(zip(self.params, gradients)):
+            self.m[i] = self.beta1 * self.m[i] + (1 - self.beta1) * grad
+            self.v[i] = self.beta2 * self.v[i] + (1 - self.beta2) * np.square(grad)
+            m_hat = self.m[i] / (1 - self.beta1 ** self.t)
+            v_hat = self.v[i] / (1 - self.beta2 ** self.t)
+            self.params[i] = param - self.learning_rate * m_hat / (np.sqrt(v_hat) + self.epsilon)
+
+
+def steps_per_second(step, gradients, min_time: float) -> float:
+    """Call step(gradients) repeatedly for at least min_time seconds."""
+    step(gradients)
+    n_steps = 0
+    start = time.perf_counter()
+    while True:
+        for _ in range(100):
+            step(gradients)
+        n_steps += 100
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return n_steps / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Adam step throughput: legacy vs in-place kernel')
+    parser.add_argument('--dims', type=int, nargs='+', default=[16, 1024, 65536, 1048576])
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds to run each case')
+    args = parser.parse_args()
+    
+    print(f"{'input_dim':>10} {'optimizer':>10} {'steps/s':>12} {'speedup':>8}")
+    for dim in args.dims:
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(32, dim))
+        y = rng.normal(size=32)
+        
+        legacy_rate = None
+        for name in ['Adam', 'AdamW']:
+            optimizer = Optimizer.create({
+                'model': {'class': 'LinearModel', 'input_dim': dim},
+                'optimizer': {'class': name, 'learning_rate': 1e-3}
+            })
+            _, gradients = optimizer.model.loss_and_gradients(X, y)
+            
+            if legacy_rate is None:
+                legacy = LegacyAdam([p.copy() for p in optimizer.model.get_params()])
+                legacy_rate = steps_per_second(legacy.step, [g.copy() for g in gradients], args.min_time)
+                print(f"{dim:>10} {'legacy':>10} {legacy_rate:>12.0f}")
+            
+            rate = steps_per_second(optimizer.step, gradients, args.min_time)
+            print(f"{dim:>10} {name:>10} {rate:>12.0f} {rate / legacy_rate:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
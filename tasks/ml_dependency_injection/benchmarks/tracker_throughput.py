@@ -0,0 +1,58 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from components.tracker import Tracker
+
+
+def trackers(directory: str):
+    """(label, config) of each tracker to compare, writing under directory."""
+    mlruns = os.path.join(directory, 'mlruns')
+    return [
+        ('MLFlowTracker flush_size=1', {'class': 'MLFlowTracker', 'tracking_uri': mlruns, 'flush_size': 1}),
+        ('MLFlowTracker', {'class': 'MLFlowTracker', 'tracking_uri': mlruns}),
+        ('AsyncTracker(MLFlowTracker)', {'class': 'AsyncTracker',
+                                         'tracker': {'class': 'MLFlowTracker', 'tracking_uri': mlruns}}),
+        ('LogfileTracker', {'class': 'LogfileTracker', 'logfile': os.path.join(directory, 'experiment.log')}),
+        ('LocalStoreTracker', {'class': 'LocalStoreTracker', 'directory': os.path.join(directory, 'store')})
+    ]
+
+
+def metrics_per_second(tracker: Tracker, steps: int, names: list) -> float:
+    """Log every metric in names at each of `steps` steps, flush, and return the rate."""
+    start = time.perf_counter()
+    for step in range(steps):
+        tracker.log_metrics({name: step * 0.5 for name in names}, step)
+    tracker.flush()
+    return steps * len(names) / (time.perf_counter() - start)
+
+
+def finish(tracker: Tracker) -> None:
+    """Close tracker and any tracker it wraps before the directory is removed."""
+    for close in ('close', 'end_run'):
+        if hasattr(tracker, close):
+            getattr(tracker, close)()
+    if isinstance(getattr(tracker, 'tracker', None), Tracker):
+        finish(tracker.tracker)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tracker throughput when logging every step')
+    parser.add_argument('--steps', type=int, default=20000)
+    parser.add_argument('--metrics', type=int, default=4, help='Distinct metrics logged per step')
+    args = parser.parse_args()
+    names = [f'metric_{i}' for i in range(args.metrics)]
+    
+    print(f"{'tracker':>28} {'metrics/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, config in trackers(tmp):
+            with contextlib.redirect_stdout(io.StringIO()):
+                tracker = Tracker.create({'tracker': config})
+            rate = metrics_per_second(tracker, args.steps, names)
+            finish(tracker)
+            print(f"{label:>28} {rate:>12.0f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -5,6 +5,9 @@ from components.preprocessor import Preprocessor
 from components.optimizer import Optimizer
 from components.trainloop import TrainLoop
 from components.model import Model
+from components.batchiterator import BatchIterator
+from components.sampler import Sampler
+from components.scheduler import Scheduler
 
 __all__ = [
     'DataLoader',
@@ -13,5 +16,8 @@ __all__ = [
     'Preprocessor',
     'Optimizer',
     'TrainLoop',
-    'Model'
+    'Model',
+    'BatchIterator',
+    'Sampler',
+    'Scheduler'
 ] 
\ No newline at end of file
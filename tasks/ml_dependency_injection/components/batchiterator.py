@@ -0,0 +1,137 @@
+from abc import ABC, abstractmethod
+import queue
+import threading
+import time
+import numpy as np
+from typing import Dict, Any, Union, Iterable, Iterator, Tuple, Optional, Callable
+from core.factory import Factory
+
+
+BatchIndices = Union[np.ndarray, slice]
+
+
+def _put_unless_stopped(buffer: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put item into a bounded queue, giving up (and returning False) once stop is set."""
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+@Factory.register_component_type
+class BatchIterator(ABC):
+    """
+    Base class for batch iterators that gather index batches into (X, y) minibatches.
+    
+    wait_time counts the time the step loop spent waiting for batches. Iterators
+    that prefetch also count starved_batches, the batches that were not ready when
+    requested.
+    """
+    
+    prefetches = False
+    
+    def __init__(self, transform: Optional[Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]] = None,
+                 **kwargs):
+        self.transform = transform
+        self.reset_stats()
+    
+    @abstractmethod
+    def iterate(self, X: np.ndarray, y: np.ndarray,
+                batches: Iterable[BatchIndices]) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield the (X, y) minibatch for each entry of `batches`, in order."""
+        pass
+    
+    def reset_stats(self) -> None:
+        """Reset the data wait counters."""
+        self.wait_time = 0.0
+        self.starved_batches = 0
+        self.batches = 0
+    
+    def _gather(self, X: np.ndarray, y: np.ndarray, indices: BatchIndices) -> Tuple[np.ndarray, np.ndarray]:
+        X_batch = X[indices]
+        y_batch = y[indices]
+        if self.transform:
+            X_batch, y_batch = self.transform(X_batch, y_batch)
+        return X_batch, y_batch
+    
+    @classmethod
+    def create(cls, config: Union[str, Dict[str, Any]]):
+        """Factory method to create a BatchIterator instance."""
+        if isinstance(config, str):
+            return Factory.create_from_config('batchiterator', config_path=config)
+        else:
+            return Factory.create_from_config('batchiterator', config_dict=config)
+
+
+class SynchronousBatchIterator(BatchIterator):
+    """Gathers each batch on the calling thread when it is requested."""
+    
+    def __init__(self, transform: Optional[Callable] = None, **kwargs):
+        super().__init__(transform)
+    
+    def iterate(self, X: np.ndarray, y: np.ndarray,
+                batches: Iterable[BatchIndices]) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        for indices in batches:
+            start = time.perf_counter()
+            batch = self._gather(X, y, indices)
+            # The step loop waits for every batch; there is no queue to starve
+            self.wait_time += time.perf_counter() - start
+            self.batches += 1
+            yield batch
+
+
+class PrefetchBatchIterator(BatchIterator):
+    """
+    Gathers upcoming batches on a background thread into a bounded queue.
+    
+    With prefetch=2 this is double buffering: the next batch is prepared while the
+    current one is being consumed. wait_time is the time the consumer spent blocked
+    on an empty queue.
+    """
+    
+    _DONE = object()
+    prefetches = True
+    
+    def __init__(self, prefetch: int = 2, transform: Optional[Callable] = None, **kwargs):
+        super().__init__(transform)
+        self.prefetch = prefetch
+    
+    def iterate(self, X: np.ndarray, y: np.ndarray,
+                batches: Iterable[BatchIndices]) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        buffer = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        
+        def produce():
+            try:
+                for indices in batches:
+                    item = self._gather(X, y, indices)
+                    if not _put_unless_stopped(buffer, item, stop):
+                        return
+                _put_unless_stopped(buffer, self._DONE, stop)
+            except BaseException as e:
+                _put_unless_stopped(buffer, e, stop)
+        
+        worker = threading.Thread(target=produce, name='batch-prefetch', daemon=True)
+        worker.start()
+        
+        try:
+            while True:
+                starved = buffer.empty()
+                start = time.perf_counter()
+                item = buffer.get()
+                self.wait_time += time.perf_counter() - start
+                
+                if item is self._DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                self.starved_batches += starved
+                self.batches += 1
+                yield item
+        finally:
+            # Unblock the producer if the consumer stopped early
+            stop.set()
+            worker.join()
\ No newline at end of file
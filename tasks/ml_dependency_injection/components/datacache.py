@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+from typing import Callable, Iterator, List, Optional, Tuple
+
+
+# Rows parsed per chunk while converting a source file into a cache entry
+BUILD_CHUNK_ROWS = 65536
+
+
+class DatasetCache:
+    """
+    On-disk cache of parsed datasets, stored as raw feature/target arrays and opened with np.memmap.
+    
+    Each entry lives in its own directory named after a hash of the source path, size,
+    modification time and dtype, so an edited source file never hits a stale entry.
+    """
+    
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def load(self, path: str, iter_chunks: Callable[[int], Iterator[Tuple[np.ndarray, np.ndarray]]],
+             dtype: str = 'float64', variant: str = '') -> Tuple[np.memmap, np.memmap]:
+        """
+        Returns read-only memmaps of (X, y) for `path`, converting it on a cache miss.
+        
+        Args:
+            path: Source file the entry is derived from
+            iter_chunks: Callable yielding (X, y) chunks of the source, e.g. DataLoader.iter_chunks
+            dtype: Dtype the arrays are stored in
+            variant: Extra key material for anything else that changes the arrays, e.g. a column selection
+            
+        Returns:
+            Tuple of the feature matrix and target vector
+        """
+        entry = os.path.join(self.cache_dir, self._key(path, dtype, variant))
+        if not os.path.exists(os.path.join(entry, 'meta.json')):
+            self._drop_stale(path)
+            self._build(entry, path, iter_chunks, dtype)
+            self._evict(keep=entry)
+        
+        with open(os.path.join(entry, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+        # The directory mtime is the LRU clock
+        os.utime(entry)
+        
+        n_rows, n_features = meta['shape']
+        X = self._open(os.path.join(entry, 'X.bin'), meta['dtype'], (n_rows, n_features))
+        y = self._open(os.path.join(entry, 'y.bin'), meta['dtype'], (n_rows,))
+        return X, y
+    
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Remove all entries derived from `path`, or every entry if no path is given."""
+        source = os.path.abspath(path) if path is not None else None
+        for entry in self._entries():
+            if source is None or self._read_meta(entry).get('source') == source:
+                shutil.rmtree(entry, ignore_errors=True)
+    
+    def size_bytes(self) -> int:
+        """Total size of all cache entries on disk."""
+        return sum(self._entry_size(entry) for entry in self._entries())
+    
+    def _key(self, path: str, dtype: str, variant: str) -> str:
+        fingerprint = f"{os.path.abspath(path)}|{self._version(path)}|{np.dtype(dtype).str}|{variant}"
+        return hashlib.sha1(fingerprint.encode()).hexdigest()
+    
+    @staticmethod
+    def _version(path: str) -> str:
+        stat = os.stat(path)
+        return f"{stat.st_size}|{stat.st_mtime_ns}"
+    
+    def _drop_stale(self, path: str) -> None:
+        """Remove entries built from an older version of `path`."""
+        source = os.path.abspath(path)
+        version = self._version(path)
+        for entry in self._entries():
+            meta = self._read_meta(entry)
+            if meta.get('source') == source and meta.get('version') != version:
+                shutil.rmtree(entry, ignore_errors=True)
+    
+    def _build(self, entry: str, path: str,
+               iter_chunks: Callable[[int], Iterator[Tuple[np.ndarray, np.ndarray]]], dtype: str) -> None:
+        """Stream the source into a temporary directory and move it into place."""
+        tmp_entry = f"{entry}.tmp-{os.getpid()}"
+        os.makedirs(tmp_entry, exist_ok=True)
+        
+        n_rows = 0
+        n_features = 0
+        with open(os.path.join(tmp_entry, 'X.bin'), 'wb') as fx, open(os.path.join(tmp_entry, 'y.bin'), 'wb') as fy:
+            for X, y in iter_chunks(BUILD_CHUNK_ROWS):
+                fx.write(np.ascontiguousarray(X, dtype=dtype).tobytes())
+                fy.write(np.ascontiguousarray(y, dtype=dtype).tobytes())
+                n_rows += X.shape[0]
+                n_features = X.shape[1]
+        
+        meta = {
+            'source': os.path.abspath(path),
+            'version': self._version(path),
+            'dtype': np.dtype(dtype).str,
+            'shape': [n_rows, n_features],
+            'created': time.time()
+        }
+        with open(os.path.join(tmp_entry, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        
+        try:
+            os.replace(tmp_entry, entry)
+        except OSError:
+            # Another process finished the same entry first
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+    
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        if self.max_bytes is None:
+            return
+        
+        entries = sorted(self._entries(), key=os.path.getmtime)
+        total = sum(self._entry_size(entry) for entry in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            total -= self._entry_size(entry)
+            shutil.rmtree(entry, ignore_errors=True)
+    
+    def _entries(self) -> List[str]:
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                if '.tmp-' not in name and os.path.isdir(os.path.join(self.cache_dir, name))]
+    
+    @staticmethod
+    def _entry_size(entry: str) -> int:
+        return sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+    
+    @staticmethod
+    def _read_meta(entry: str) -> dict:
+        try:
+            with open(os.path.join(entry, 'meta.json'), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def _open(filename: str, dtype: str, shape: Tuple[int, ...]) -> np.ndarray:
+        # np.memmap cannot map an empty file
+        if shape[0] == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(filename, dtype=dtype, mode='r', shape=shape)
\ No newline at end of file
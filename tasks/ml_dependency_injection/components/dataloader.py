@@ -1,17 +1,137 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import glob
+import itertools
+import operator
+import os
+import socket
+import sys
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Union
+from typing import Dict, Any, Union, Iterable, Iterator, Tuple, Optional, List, Callable
 from core.factory import Factory
+from components.datacache import DatasetCache
+
+
+# Row filters are (column, op, value) triples that must all hold, as in pyarrow's `filters`
+Filters = List[Tuple[str, str, Any]]
+
+_FILTER_OPS = {
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda column, value: column.isin(value),
+    'not in': lambda column, value: ~column.isin(value)
+}
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+
+def _apply_filters(frame: pd.DataFrame, filters: Optional[Filters]) -> pd.DataFrame:
+    """Keep the rows of `frame` that satisfy every filter."""
+    if not filters:
+        return frame
+    mask = np.ones(len(frame), dtype=bool)
+    for column, op, value in filters:
+        if op not in _FILTER_OPS:
+            raise ValueError(f"Unknown filter operator: {op}")
+        mask &= np.asarray(_FILTER_OPS[op](frame[column], value))
+    return frame[mask]
+
+
+def _read_shard(path: str, options: Dict[str, Any], as_frame: bool = False):
+    """Read one shard with the matching file loader. Module level so worker processes can unpickle it."""
+    loader_class = ParquetFileDataLoader if path.endswith(PARQUET_EXTENSIONS) else CSVDataLoader
+    loader = loader_class(path, **options)
+    return loader.load_data() if as_frame else loader.load_arrays()
 
 
 @Factory.register_component_type
 class DataLoader(ABC):
-    """Base class for data loaders."""
+    """
+    Base class for data loaders.
+    
+    Without a column selection the last column is the target and all others are
+    features. `feature_columns`/`target_column` pick columns by name, `filters` keeps
+    only matching rows and `dtype` is the dtype of the returned arrays.
+    """
+    
+    feature_columns: Optional[List[str]] = None
+    target_column: Optional[str] = None
+    filters: Optional[Filters] = None
+    dtype: str = 'float64'
+    
+    def __init__(self, feature_columns: Optional[List[str]] = None, target_column: Optional[str] = None,
+                 filters: Optional[Filters] = None, dtype: str = 'float64', **kwargs):
+        if feature_columns and not target_column:
+            raise ValueError("feature_columns requires target_column")
+        self.feature_columns = list(feature_columns) if feature_columns else None
+        self.target_column = target_column
+        self.filters = [tuple(f) for f in filters] if filters else None
+        self.dtype = np.dtype(dtype).name
     
     @abstractmethod
     def load_data(self):
         pass
     
+    def iter_chunks(self, rows: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield (X, y) ndarray chunks of at most `rows` rows.
+        
+        Subclasses override this to read the source incrementally; the default
+        slices the result of load_data().
+        """
+        data = _apply_filters(self.load_data(), self.filters)
+        for start in range(0, len(data), rows):
+            yield self._to_arrays(data.iloc[start:start + rows])
+    
+    def load_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Load the whole dataset as an (X, y) pair of ndarrays."""
+        return self._to_arrays(_apply_filters(self.load_data(), self.filters))
+    
+    def _selection(self) -> Dict[str, Any]:
+        """Constructor arguments that reproduce this loader's column selection."""
+        return {
+            'feature_columns': self.feature_columns,
+            'target_column': self.target_column,
+            'filters': self.filters,
+            'dtype': self.dtype
+        }
+    
+    def _projected_columns(self) -> Optional[List[str]]:
+        """Columns that end up in (X, y), or None if every column is needed."""
+        if self.feature_columns is None:
+            return None
+        return self.feature_columns + [self.target_column]
+    
+    def _to_arrays(self, data) -> Tuple[np.ndarray, np.ndarray]:
+        """Copy the selected columns of a DataFrame or pyarrow table straight into (X, y)."""
+        names = list(data.columns) if isinstance(data, pd.DataFrame) else data.schema.names
+        target = self.target_column if self.target_column is not None else names[-1]
+        features = self.feature_columns or [name for name in names if name != target]
+        
+        X = np.empty((len(data), len(features)), dtype=self.dtype)
+        for j, column in enumerate(features):
+            X[:, j] = self._column(data, column)
+        y = self._column(data, target)
+        return X, y
+    
+    def _column(self, data, name: str) -> np.ndarray:
+        """One column of a DataFrame or pyarrow table/batch as a `dtype` array."""
+        column = data[name]
+        if isinstance(data, pd.DataFrame):
+            return np.asarray(column.to_numpy(), dtype=self.dtype)
+        import pyarrow as pa
+        
+        # Arrow only converts without copying by default, which fails for nulls and booleans;
+        # casting first turns nulls into NaN as pandas does
+        return column.cast(pa.from_numpy_dtype(np.dtype(self.dtype))).to_numpy(zero_copy_only=False)
+    
     @classmethod
     def create(cls, config: Union[str, Dict[str, Any]]):
         if isinstance(config, str):
@@ -21,20 +141,260 @@ class DataLoader(ABC):
 
 
 class ParquetFileDataLoader(DataLoader):
-    """DataLoader for Parquet files."""
+    """
+    DataLoader for Parquet files.
     
-    def __init__(self, filename: str, **kwargs):
+    Only the projected columns are read and filters are pushed down to pyarrow,
+    which skips row groups whose statistics rule them out.
+    """
+    
+    def __init__(self, filename: str, cache_dir: Optional[str] = None,
+                 cache_max_bytes: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
         self.filename = filename
+        self.cache = DatasetCache(cache_dir, cache_max_bytes) if cache_dir else None
     
     def load_data(self):
-        return pd.read_parquet(self.filename)
+        return pd.read_parquet(self.filename, columns=self._projected_columns(), filters=self.filters)
+    
+    def load_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self.cache is not None:
+            return self.cache.load(self.filename, self.iter_chunks, self.dtype, repr(self._selection()))
+        
+        import pyarrow.parquet as pq
+        
+        table = pq.read_table(self.filename, columns=self._projected_columns(), filters=self.filters)
+        return self._to_arrays(table)
+    
+    def iter_chunks(self, rows: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Read the file one row group at a time, split into batches of `rows`."""
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+        
+        expression = pq.filters_to_expression(self.filters) if self.filters else None
+        fragments = ds.dataset(self.filename, format='parquet').get_fragments(filter=expression)
+        for fragment in fragments:
+            # Row groups are visited in file order; the filter prunes them by their statistics
+            for row_group in fragment.split_by_row_group(filter=expression):
+                for batch in row_group.to_batches(columns=self._projected_columns(), filter=expression,
+                                                  batch_size=rows, use_threads=False):
+                    if batch.num_rows:
+                        yield self._to_arrays(batch)
 
 
 class CSVDataLoader(DataLoader):
-    """DataLoader for CSV files."""
+    """DataLoader for CSV files. Only the projected columns are parsed, directly as `dtype`."""
     
-    def __init__(self, filename: str, **kwargs):
+    def __init__(self, filename: str, cache_dir: Optional[str] = None,
+                 cache_max_bytes: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
         self.filename = filename
+        self.cache = DatasetCache(cache_dir, cache_max_bytes) if cache_dir else None
     
     def load_data(self):
-        return pd.read_csv(self.filename) 
\ No newline at end of file
+        return _apply_filters(self._read_csv(), self.filters)
+    
+    def load_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self.cache is not None:
+            return self.cache.load(self.filename, self.iter_chunks, self.dtype, repr(self._selection()))
+        return self._to_arrays(self.load_data())
+    
+    def iter_chunks(self, rows: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Parse the file `rows` lines at a time."""
+        for frame in self._read_csv(chunksize=rows):
+            frame = _apply_filters(frame, self.filters)
+            if len(frame):
+                yield self._to_arrays(frame)
+    
+    def _read_csv(self, **kwargs):
+        columns = self._projected_columns()
+        if columns is None:
+            return pd.read_csv(self.filename, **kwargs)
+        
+        filter_columns = [column for column, _, _ in self.filters or [] if column not in columns]
+        return pd.read_csv(self.filename, usecols=columns + filter_columns,
+                           dtype={column: self.dtype for column in columns}, **kwargs)
+
+
+class ShardedDataLoader(DataLoader):
+    """
+    DataLoader for a dataset split across many CSV/Parquet part files.
+    
+    `path` is a directory (every .csv/.parquet file in it) or a glob pattern. Shards are
+    read in parallel by a process pool and handed out in sorted order ('sequential'),
+    in a seeded random order ('shuffle'), or round-robin across the shards being
+    read at the same time ('interleave').
+    """
+    
+    SHARD_EXTENSIONS = ('.csv',) + PARQUET_EXTENSIONS
+    
+    def __init__(self, path: str, num_workers: Optional[int] = None, order: str = 'sequential',
+                 seed: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        if order not in ('sequential', 'shuffle', 'interleave'):
+            raise ValueError(f"Unknown shard order: {order}")
+        self.path = path
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.order = order
+        self.seed = seed
+    
+    def shards(self) -> List[str]:
+        """List the shard files in the order they are read."""
+        if os.path.isdir(self.path):
+            shards = [os.path.join(self.path, name) for name in os.listdir(self.path)
+                      if name.endswith(self.SHARD_EXTENSIONS)]
+        else:
+            shards = glob.glob(self.path)
+        shards.sort()
+        
+        if not shards:
+            raise ValueError(f"No shards found for: {self.path}")
+        if self.order == 'shuffle':
+            rng = np.random.default_rng(self.seed)
+            shards = [shards[i] for i in rng.permutation(len(shards))]
+        return shards
+    
+    def load_data(self):
+        reader = functools.partial(_read_shard, options=self._selection(), as_frame=True)
+        return pd.concat(list(self._read_shards(self.shards(), reader)), ignore_index=True)
+    
+    def load_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        parts = list(self._read_shards(self.shards(), self._shard_reader()))
+        X = np.concatenate([X for X, _ in parts])
+        y = np.concatenate([y for _, y in parts])
+        return X, y
+    
+    def iter_chunks(self, rows: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield chunks while the next `num_workers` shards are read in the background."""
+        shards = self.shards()
+        
+        if self.order != 'interleave':
+            for X, y in self._read_shards(shards, self._shard_reader()):
+                for start in range(0, len(y), rows):
+                    yield X[start:start + rows], y[start:start + rows]
+            return
+        
+        # Round-robin over each group of num_workers shards; the next group is read meanwhile
+        results = self._read_shards(shards, self._shard_reader())
+        while True:
+            group = list(itertools.islice(results, self.num_workers))
+            if not group:
+                return
+            longest = max(len(y) for _, y in group)
+            for start in range(0, longest, rows):
+                for X, y in group:
+                    if start < len(y):
+                        yield X[start:start + rows], y[start:start + rows]
+    
+    def _shard_reader(self) -> Callable[[str], Tuple[np.ndarray, np.ndarray]]:
+        return functools.partial(_read_shard, options=self._selection())
+    
+    def _read_shards(self, shards: List[str], reader: Callable[[str], Any]) -> Iterator[Any]:
+        """Apply `reader` to shards in parallel, yielding in input order with at most num_workers in flight."""
+        if self.num_workers == 1 or len(shards) == 1:
+            for shard in shards:
+                yield reader(shard)
+            return
+        
+        with ProcessPoolExecutor(max_workers=min(self.num_workers, len(shards))) as executor:
+            pending = [executor.submit(reader, shard) for shard in shards[:self.num_workers]]
+            next_shard = len(pending)
+            while pending:
+                result = pending.pop(0).result()
+                if next_shard < len(shards):
+                    pending.append(executor.submit(reader, shards[next_shard]))
+                    next_shard += 1
+                yield result
+
+
+class StreamDataLoader(DataLoader):
+    """
+    DataLoader for an unbounded stream of samples.
+    
+    `source` is an iterable or a string: '-' for stdin, 'tcp://host:port' or
+    'unix:///path/to/socket' to connect to a local socket, or the path of a file or
+    named pipe. Text sources carry one comma separated sample per line with the target
+    last; `columns` names the fields so feature_columns/target_column can pick them.
+    An iterable yields (x, y) samples or (X, y) chunks. iter_chunks() hands out whatever
+    has arrived, in chunks of at most `rows` samples, and never holds more than one
+    read buffer, so the stream can be consumed for as long as it runs.
+    """
+    
+    READ_BYTES = 65536
+    
+    def __init__(self, source: Union[str, Iterable], columns: Optional[List[str]] = None, **kwargs):
+        super().__init__(**kwargs)
+        if self.filters:
+            raise ValueError("StreamDataLoader does not support filters")
+        if self.target_column and not columns:
+            raise ValueError("Selecting columns requires the stream's columns")
+        self.source = source
+        self.columns = list(columns) if columns else None
+    
+    def load_data(self):
+        raise ValueError("StreamDataLoader reads an unbounded stream; use iter_chunks()")
+    
+    def load_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        raise ValueError("StreamDataLoader reads an unbounded stream; use iter_chunks()")
+    
+    def iter_chunks(self, rows: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        chunks = self._iter_items() if not isinstance(self.source, str) else self._iter_text()
+        for X, y in chunks:
+            for start in range(0, len(y), rows):
+                yield X[start:start + rows], y[start:start + rows]
+    
+    def _iter_items(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        for X, y in self.source:
+            X = np.asarray(X, dtype=self.dtype)
+            if X.ndim == 1:
+                X = X[np.newaxis]
+            yield X, np.atleast_1d(np.asarray(y, dtype=self.dtype))
+    
+    def _iter_text(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        stream = self._open()
+        try:
+            partial = b''
+            while True:
+                data = stream.read(self.READ_BYTES)
+                if not data:
+                    break
+                # Only complete lines are parsed; the tail waits for the next read
+                data = partial + data
+                end = data.rfind(b'\n') + 1
+                partial = data[end:]
+                if end:
+                    yield self._parse(data[:end])
+            if partial.strip():
+                yield self._parse(partial)
+        finally:
+            stream.close()
+    
+    def _open(self):
+        """Open the source as an unbuffered binary stream whose read() returns what is available."""
+        if self.source == '-':
+            return open(sys.stdin.fileno(), 'rb', buffering=0, closefd=False)
+        if self.source.startswith('tcp://'):
+            host, _, port = self.source[len('tcp://'):].rpartition(':')
+            connection = socket.create_connection((host, int(port)))
+        elif self.source.startswith('unix://'):
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.connect(self.source[len('unix://'):])
+        else:
+            return open(self.source, 'rb', buffering=0)
+        stream = connection.makefile('rb', buffering=0)
+        # The stream keeps its own reference to the socket
+        connection.close()
+        return stream
+    
+    def _parse(self, text: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        lines = [line for line in text.split(b'\n') if line.strip()]
+        n_fields = lines[0].count(b',') + 1
+        values = np.array(b','.join(lines).split(b',')).astype(self.dtype).reshape(len(lines), n_fields)
+        
+        if self.feature_columns is None:
+            target = self.columns.index(self.target_column) if self.target_column else n_fields - 1
+            features = [j for j in range(n_fields) if j != target]
+        else:
+            target = self.columns.index(self.target_column)
+            features = [self.columns.index(column) for column in self.feature_columns]
+        return values[:, features], values[:, target]
\ No newline at end of file
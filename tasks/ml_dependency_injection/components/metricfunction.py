@@ -1,18 +1,54 @@
 from abc import ABC, abstractmethod
 import numpy as np
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Union, List, Optional, Tuple
 from core.factory import Factory
 
 
 @Factory.register_component_type
 class MetricFunction(ABC):
-    """Base class for metric functions."""
+    """
+    Base class for metric functions.
+    
+    calculate() scores one set of predictions. The train loops score the predictions
+    their training steps already made through update() with one batch at a time,
+    compute() for the result so far, reset() and merge() of another accumulator's
+    state. By default these keep the batches and compute() calls calculate() on
+    all of them, so a metric only has to implement calculate(); metrics that can
+    be accumulated in constant memory override them.
+    """
     
     @abstractmethod
     def calculate(self, y_true: Union[np.ndarray, List], y_pred: Union[np.ndarray, List]) -> float:
         """Calculate the metric between true values and predictions."""
         pass
     
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        """Add a batch of targets and predictions to the accumulator."""
+        # Copies, since the train loops reuse their batch buffers
+        self._batches().append((np.array(y_true), np.array(y_pred)))
+    
+    def compute(self) -> Union[float, np.ndarray]:
+        """Metric over every batch added since the last reset()."""
+        batches = self._batches()
+        if not batches:
+            raise ValueError("No samples were added to the metric")
+        y_true, y_pred = zip(*batches)
+        return self.calculate(np.concatenate(y_true), np.concatenate(y_pred))
+    
+    def reset(self) -> None:
+        """Clear the accumulator."""
+        self._batches().clear()
+    
+    def merge(self, other: 'MetricFunction') -> None:
+        """Add another accumulator's state to this one, e.g. from a worker."""
+        self._batches().extend(other._batches())
+    
+    def _batches(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """(y_true, y_pred) batches kept by the default accumulator."""
+        if '_batch_buffer' not in self.__dict__:
+            self._batch_buffer = []
+        return self._batch_buffer
+    
     @classmethod
     def create(cls, config: Union[str, Dict[str, Any]]):
         """Factory method to create a MetricFunction instance."""
@@ -22,25 +58,197 @@ class MetricFunction(ABC):
             return Factory.create_from_config('metricfunction', config_dict=config)
 
 
-class MAE(MetricFunction):
-    """Mean Absolute Error metric."""
+def _residual(y_true: Union[np.ndarray, List], y_pred: Union[np.ndarray, List]) -> np.ndarray:
+    """y_pred - y_true without copying the inputs; (n, K) predictions of a batched model give (n, K)."""
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    if y_pred.ndim == 2 and y_true.ndim == 1:
+        y_true = y_true[:, None]
+    return y_pred - y_true
+
+
+class MeanMetric(MetricFunction):
+    """
+    Metric that is the mean of a per-sample term, accumulated as a running sum and count.
+    
+    For the (n, K) predictions of a batched model the metric is computed per model.
+    """
     
     def __init__(self, **kwargs):
+        self.reset()
+    
+    @abstractmethod
+    def _sum(self, residual: np.ndarray) -> Union[float, np.ndarray]:
+        """Sum of the per-sample terms over the first axis."""
         pass
     
-    def calculate(self, y_true: Union[np.ndarray, List], y_pred: Union[np.ndarray, List]) -> float:
-        y_true = np.array(y_true)
-        y_pred = np.array(y_pred)
-        return np.mean(np.abs(y_true - y_pred))
+    def calculate(self, y_true: Union[np.ndarray, List], y_pred: Union[np.ndarray, List]) -> Union[float, np.ndarray]:
+        residual = _residual(y_true, y_pred)
+        return self._sum(residual) / len(residual)
+    
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        residual = _residual(y_true, y_pred)
+        self.total = self.total + self._sum(residual)
+        self.count += len(residual)
+    
+    def compute(self) -> Union[float, np.ndarray]:
+        if not self.count:
+            raise ValueError("No samples were added to the metric")
+        return self.total / self.count
+    
+    def reset(self) -> None:
+        self.total = 0.0
+        self.count = 0
+    
+    def merge(self, other: 'MeanMetric') -> None:
+        self.total = self.total + other.total
+        self.count += other.count
 
 
-class MSE(MetricFunction):
+class MAE(MeanMetric):
+    """Mean Absolute Error metric."""
+    
+    def _sum(self, residual: np.ndarray) -> Union[float, np.ndarray]:
+        np.abs(residual, out=residual)
+        return residual.sum(axis=0)
+
+
+class MSE(MeanMetric):
     """Mean Squared Error metric."""
     
-    def __init__(self, **kwargs):
-        pass
+    def _sum(self, residual: np.ndarray) -> Union[float, np.ndarray]:
+        if residual.ndim == 1:
+            return np.dot(residual, residual)
+        return np.einsum('ij,ij->j', residual, residual)
+
+
+class MetricSuite(MetricFunction):
+    """
+    Several regression metrics from one pass over one residual buffer.
     
-    def calculate(self, y_true: Union[np.ndarray, List], y_pred: Union[np.ndarray, List]) -> float:
-        y_true = np.array(y_true)
-        y_pred = np.array(y_pred)
-        return np.mean(np.square(y_true - y_pred)) 
\ No newline at end of file
+    `metrics` picks from mae, mse, rmse, r2, max_error, bias (mean of y_pred - y_true)
+    and pinball_<q> (mean pinball loss of quantile q, e.g. pinball_0.9). Inputs are
+    processed chunk_size rows at a time through a reused residual buffer, and every
+    metric is derived from a few running sums, so the suite accumulates and merges
+    like the single metrics. dtype='float32' computes the residuals in single
+    precision; sums are always kept in float64. Results are dicts keyed by metric
+    name, the first metric being the primary one.
+    """
+    
+    METRICS = ('mae', 'mse', 'rmse', 'r2', 'max_error', 'bias')
+    
+    def __init__(self, metrics: Optional[List[str]] = None, chunk_size: int = 65536,
+                 dtype: str = 'float64', **kwargs):
+        self.metrics = list(metrics) if metrics else ['mse', 'mae', 'rmse', 'r2']
+        for name in self.metrics:
+            if name not in self.METRICS and not self._quantile(name):
+                raise ValueError(f"Unknown metric: {name}")
+        self.primary = self.metrics[0]
+        self.chunk_size = chunk_size
+        self.dtype = np.dtype(dtype)
+        self._residual = None
+        self._scratch = None
+        self.reset()
+    
+    def calculate(self, y_true: Union[np.ndarray, List], y_pred: Union[np.ndarray, List]) -> Dict[str, Any]:
+        state = self._empty_state()
+        self._accumulate(state, np.asarray(y_true), np.asarray(y_pred))
+        return self._results(state)
+    
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        self._accumulate(self.state, np.asarray(y_true), np.asarray(y_pred))
+    
+    def compute(self) -> Dict[str, Any]:
+        if not self.state['count']:
+            raise ValueError("No samples were added to the metric")
+        return self._results(self.state)
+    
+    def reset(self) -> None:
+        self.state = self._empty_state()
+    
+    def merge(self, other: 'MetricSuite') -> None:
+        a, b = self.state, other.state
+        if not b['count']:
+            return
+        if not a['count']:
+            self.state = dict(b)
+            return
+        # Chan et al. parallel update of the target mean and sum of squared deviations
+        n = a['count'] + b['count']
+        delta = b['y_mean'] - a['y_mean']
+        a['y_m2'] += b['y_m2'] + delta ** 2 * a['count'] * b['count'] / n
+        a['y_mean'] += delta * b['count'] / n
+        for key in ('sum', 'sum_sq', 'sum_pos'):
+            a[key] = a[key] + b[key]
+        a['max_abs'] = np.maximum(a['max_abs'], b['max_abs'])
+        a['count'] = n
+    
+    @staticmethod
+    def _quantile(name: str) -> Optional[float]:
+        if not name.startswith('pinball_'):
+            return None
+        try:
+            q = float(name[len('pinball_'):])
+        except ValueError:
+            return None
+        return q if 0.0 < q < 1.0 else None
+    
+    @staticmethod
+    def _empty_state() -> Dict[str, Any]:
+        return {'count': 0, 'sum': 0.0, 'sum_sq': 0.0, 'sum_pos': 0.0, 'max_abs': 0.0,
+                'y_mean': 0.0, 'y_m2': 0.0}
+    
+    def _accumulate(self, state: Dict[str, Any], y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        batched = y_pred.ndim == 2 and y_true.ndim == 1
+        for start in range(0, len(y_true), self.chunk_size):
+            y_chunk = y_true[start:start + self.chunk_size]
+            pred_chunk = y_pred[start:start + self.chunk_size]
+            m = len(y_chunk)
+            
+            if self._residual is None or self._residual.shape[1:] != pred_chunk.shape[1:] or len(self._residual) < m:
+                self._residual = np.empty((min(len(y_true), self.chunk_size),) + pred_chunk.shape[1:], dtype=self.dtype)
+                self._scratch = np.empty_like(self._residual)
+            residual = self._residual[:m]
+            scratch = self._scratch[:m]
+            
+            np.subtract(pred_chunk, y_chunk[:, None] if batched else y_chunk, out=residual, casting='unsafe')
+            state['sum'] = state['sum'] + residual.sum(axis=0, dtype=np.float64)
+            state['sum_sq'] = state['sum_sq'] + np.einsum('i...,i...->...', residual, residual, dtype=np.float64)
+            np.maximum(residual, 0, out=scratch)
+            state['sum_pos'] = state['sum_pos'] + scratch.sum(axis=0, dtype=np.float64)
+            np.abs(residual, out=scratch)
+            state['max_abs'] = np.maximum(state['max_abs'], scratch.max(axis=0))
+            
+            # Merge this chunk's target mean and squared deviations (for r2)
+            chunk_mean = y_chunk.mean(dtype=np.float64)
+            chunk_m2 = np.dot(y_chunk - chunk_mean, y_chunk - chunk_mean)
+            n = state['count'] + m
+            delta = chunk_mean - state['y_mean']
+            state['y_m2'] += chunk_m2 + delta ** 2 * state['count'] * m / n
+            state['y_mean'] += delta * m / n
+            state['count'] = n
+    
+    def _results(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        n = state['count']
+        # With r = y_pred - y_true: sum|r| = 2 * sum(max(r, 0)) - sum(r)
+        sum_neg = state['sum_pos'] - state['sum']
+        mse = state['sum_sq'] / n
+        results = {}
+        for name in self.metrics:
+            if name == 'mae':
+                results[name] = (state['sum_pos'] + sum_neg) / n
+            elif name == 'mse':
+                results[name] = mse
+            elif name == 'rmse':
+                results[name] = np.sqrt(mse)
+            elif name == 'r2':
+                results[name] = 1.0 - state['sum_sq'] / state['y_m2'] if state['y_m2'] > 0 else np.nan
+            elif name == 'max_error':
+                results[name] = state['max_abs']
+            elif name == 'bias':
+                results[name] = state['sum'] / n
+            else:
+                # Pinball loss on e = y_true - y_pred: under-predictions cost q, over-predictions 1 - q
+                q = self._quantile(name)
+                results[name] = (q * sum_neg + (1.0 - q) * state['sum_pos']) / n
+        return results
\ No newline at end of file
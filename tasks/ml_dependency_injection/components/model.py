@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 import numpy as np
-from typing import Dict, Any, List, Tuple, Union
+from typing import Dict, Any, List, Tuple, Union, Optional
 from core.factory import Factory
 
 
@@ -23,6 +23,25 @@ class Model(ABC):
         """Compute gradients of the loss with respect to model parameters."""
         pass
     
+    def loss_and_gradients(self, X: np.ndarray, y: np.ndarray) -> Tuple[float, List[np.ndarray]]:
+        """
+        Compute the loss and its gradients together.
+        
+        The default calls compute_loss and compute_gradients; models override it to
+        share a single forward pass between the two.
+        """
+        return self.compute_loss(X, y), self.compute_gradients(X, y)
+    
+    def forward_backward(self, X: np.ndarray, y: np.ndarray) -> Tuple[float, List[np.ndarray], np.ndarray]:
+        """
+        Compute the loss, its gradients and the predictions they were computed from.
+        
+        Train loops use the predictions to accumulate metrics without another forward
+        pass. The default predicts separately; models override it to share one pass.
+        """
+        loss, gradients = self.loss_and_gradients(X, y)
+        return loss, gradients, self.predict(X)
+    
     @abstractmethod
     def get_params(self) -> List[np.ndarray]:
         """Get model parameters."""
@@ -33,6 +52,28 @@ class Model(ABC):
         """Set model parameters."""
         pass
     
+    def flat_params(self) -> Optional[np.ndarray]:
+        """
+        Contiguous buffer holding every parameter, or None if the model has none.
+        
+        get_params() returns views into this buffer, so optimizers can update all
+        parameters in place with whole-buffer operations.
+        """
+        return None
+    
+    def flat_gradients(self) -> Optional[np.ndarray]:
+        """Contiguous gradient buffer laid out like flat_params(), or None."""
+        return None
+    
+    def expand_per_model(self, values: np.ndarray) -> np.ndarray:
+        """
+        Expand one value per model into an array laid out like flat_params().
+        
+        Used by optimizers for per-model hyperparameters; only models that train
+        several independent models at once support it.
+        """
+        raise ValueError(f"{self.__class__.__name__} is a single model; per-model hyperparameters need a batched model")
+    
     @classmethod
     def create(cls, config: Union[str, Dict[str, Any]]):
         """Factory method to create a Model instance."""
@@ -43,13 +84,24 @@ class Model(ABC):
 
 
 class LinearModel(Model):
-    """Simple linear regression model."""
+    """
+    Simple linear regression model.
+    
+    Weights and bias are views into one flat parameter buffer, and gradients are
+    written into a matching flat buffer. The gradient arrays returned by
+    compute_gradients/loss_and_gradients are overwritten by the next call.
+    """
     
     def __init__(self, input_dim: int = 1, **kwargs):
         self.input_dim = input_dim
+        self._params = np.empty(input_dim + 1)
+        self._grads = np.zeros(input_dim + 1)
+        self.weights = self._params[:input_dim]
+        self.bias = self._params[input_dim:]
+        self._grad_views = [self._grads[:input_dim], self._grads[input_dim:]]
         # Initialize weights and bias
-        self.weights = np.random.randn(input_dim) * 0.01
-        self.bias = np.zeros(1)
+        self.weights[:] = np.random.randn(input_dim) * 0.01
+        self.bias[:] = 0.0
     
     def predict(self, X: np.ndarray) -> np.ndarray:
         return np.dot(X, self.weights) + self.bias
@@ -61,20 +113,119 @@ class LinearModel(Model):
     
     def compute_gradients(self, X: np.ndarray, y: np.ndarray) -> List[np.ndarray]:
         """Compute gradients of MSE loss w.r.t. weights and bias."""
+        error = self.predict(X) - y
+        return self._gradients_from_error(X, error)
+    
+    def loss_and_gradients(self, X: np.ndarray, y: np.ndarray) -> Tuple[float, List[np.ndarray]]:
+        """MSE loss and its gradients from a single forward pass."""
+        loss, gradients, _ = self.forward_backward(X, y)
+        return loss, gradients
+    
+    def forward_backward(self, X: np.ndarray, y: np.ndarray) -> Tuple[float, List[np.ndarray], np.ndarray]:
         predictions = self.predict(X)
         error = predictions - y
+        loss = np.dot(error, error) / len(y)
+        return loss, self._gradients_from_error(X, error), predictions
+    
+    def _gradients_from_error(self, X: np.ndarray, error: np.ndarray) -> List[np.ndarray]:
+        dw, db = self._grad_views
+        scale = 2.0 / len(error)
         
         # Gradient of loss w.r.t. weights
-        dw = (2.0 / len(y)) * np.dot(X.T, error)
+        np.dot(X.T, error, out=dw)
+        dw *= scale
         
         # Gradient of loss w.r.t. bias
-        db = (2.0 / len(y)) * np.sum(error)
+        db[0] = scale * np.sum(error)
         
-        return [dw, np.array([db])]
+        return self._grad_views
     
     def get_params(self) -> List[np.ndarray]:
         return [self.weights, self.bias]
     
     def set_params(self, params: List[np.ndarray]) -> None:
-        self.weights = params[0]
-        self.bias = params[1] 
\ No newline at end of file
+        # Copy into the flat buffer so the views (and optimizer state) stay valid
+        self.weights[...] = params[0]
+        self.bias[...] = params[1]
+    
+    def flat_params(self) -> np.ndarray:
+        return self._params
+    
+    def flat_gradients(self) -> np.ndarray:
+        return self._grads
+
+
+class BatchedLinearModel(Model):
+    """
+    K independent linear regression models trained side by side, e.g. for a sweep.
+    
+    Weights form a (K, input_dim) matrix so one matmul predicts for every model;
+    predict() returns (n_samples, K) and the losses are per-model arrays of shape (K,).
+    Weights and bias are views into one flat buffer laid out as [weights, bias].
+    """
+    
+    def __init__(self, input_dim: int = 1, n_models: int = 1, **kwargs):
+        self.input_dim = input_dim
+        self.n_models = n_models
+        n_weights = n_models * input_dim
+        self._params = np.empty(n_weights + n_models)
+        self._grads = np.zeros(n_weights + n_models)
+        self.weights = self._params[:n_weights].reshape(n_models, input_dim)
+        self.bias = self._params[n_weights:]
+        self._grad_views = [self._grads[:n_weights].reshape(n_models, input_dim), self._grads[n_weights:]]
+        # Initialize weights and bias
+        self.weights[:] = np.random.randn(n_models, input_dim) * 0.01
+        self.bias[:] = 0.0
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return np.dot(X, self.weights.T) + self.bias
+    
+    def compute_loss(self, X: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Mean squared error of each model."""
+        return np.mean(np.square(self.predict(X) - y[:, None]), axis=0)
+    
+    def compute_gradients(self, X: np.ndarray, y: np.ndarray) -> List[np.ndarray]:
+        """Gradients of each model's MSE; model k only affects its own loss."""
+        error = self.predict(X) - y[:, None]
+        return self._gradients_from_error(X, error)
+    
+    def loss_and_gradients(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray]]:
+        loss, gradients, _ = self.forward_backward(X, y)
+        return loss, gradients
+    
+    def forward_backward(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray], np.ndarray]:
+        predictions = self.predict(X)
+        error = predictions - y[:, None]
+        loss = np.einsum('ij,ij->j', error, error) / len(y)
+        return loss, self._gradients_from_error(X, error), predictions
+    
+    def _gradients_from_error(self, X: np.ndarray, error: np.ndarray) -> List[np.ndarray]:
+        dw, db = self._grad_views
+        scale = 2.0 / len(error)
+        
+        np.dot(error.T, X, out=dw)
+        dw *= scale
+        
+        np.sum(error, axis=0, out=db)
+        db *= scale
+        
+        return self._grad_views
+    
+    def get_params(self) -> List[np.ndarray]:
+        return [self.weights, self.bias]
+    
+    def set_params(self, params: List[np.ndarray]) -> None:
+        self.weights[...] = params[0]
+        self.bias[...] = params[1]
+    
+    def flat_params(self) -> np.ndarray:
+        return self._params
+    
+    def flat_gradients(self) -> np.ndarray:
+        return self._grads
+    
+    def expand_per_model(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (self.n_models,):
+            raise ValueError(f"Expected {self.n_models} per-model values, got shape {values.shape}")
+        return np.concatenate([np.repeat(values, self.input_dim), values])
\ No newline at end of file
@@ -7,16 +7,86 @@ from components.model import Model
 
 @Factory.register_component_type
 class Optimizer(ABC):
-    """Base class for optimizers."""
+    """
+    Base class for optimizers.
+    
+    lr_scale multiplies the configured learning_rate on every step; a Scheduler sets
+    it, so per-model learning rates keep their cached flat expansion.
+    """
     
     def __init__(self, model: Model, **kwargs):
         self.model = model
+        self.lr_scale = 1.0
+        self._expanded = {}
     
     @abstractmethod
     def step(self, gradients: List[np.ndarray]) -> None:
         """Apply gradients and update model parameters."""
         pass
     
+    def state_dict(self) -> Dict[str, Any]:
+        """Return a snapshot of the optimizer state (arrays, lists of arrays and scalars)."""
+        return {}
+    
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        """Restore a state returned by state_dict()."""
+        pass
+    
+    def save_state(self, path: str) -> None:
+        """Save state_dict() to an .npz file; lists of arrays are stored as name.0, name.1, ..."""
+        arrays = {}
+        for name, value in self.state_dict().items():
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    arrays[f"{name}.{i}"] = item
+            else:
+                arrays[name] = np.asarray(value)
+        np.savez(path, **arrays)
+    
+    def load_state(self, path: str) -> None:
+        """Load a state written by save_state()."""
+        state = {}
+        lists = {}
+        with np.load(path, allow_pickle=False) as archive:
+            for key in archive.files:
+                name, _, index = key.partition('.')
+                if index:
+                    lists.setdefault(name, {})[int(index)] = archive[key]
+                else:
+                    value = archive[key]
+                    state[name] = value.item() if value.ndim == 0 else value
+        for name, items in lists.items():
+            state[name] = [items[i] for i in sorted(items)]
+        self.load_state_dict(state)
+    
+    def _flat_buffers(self, gradients: List[np.ndarray]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Return the model's flat (params, grads) buffers, or None if it does not keep them.
+        
+        Gradients that are not views into the model's gradient buffer are copied into it.
+        """
+        params = self.model.flat_params()
+        grads = self.model.flat_gradients()
+        if params is None or grads is None:
+            return None
+        if not all(grad.base is grads for grad in gradients):
+            np.concatenate([np.ravel(grad) for grad in gradients], out=grads)
+        return params, grads
+    
+    def _per_parameter(self, value: Union[float, List[float], np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Resolve a hyperparameter for the flat update.
+        
+        Scalars pass through; a sequence holds one value per model of a batched model
+        and is expanded to the flat parameter layout once and cached.
+        """
+        if np.ndim(value) == 0:
+            return value
+        key = tuple(np.ravel(value))
+        if key not in self._expanded:
+            self._expanded[key] = self.model.expand_per_model(np.asarray(key))
+        return self._expanded[key]
+    
     @classmethod
     def create(cls, config: Union[str, Dict[str, Any]]):
         """Factory method to create an Optimizer instance."""
@@ -27,23 +97,51 @@ class Optimizer(ABC):
 
 
 class SGD(Optimizer):
-    """Stochastic Gradient Descent optimizer."""
+    """
+    Stochastic Gradient Descent optimizer.
+    
+    learning_rate may be a list with one value per model when training a batched model.
+    """
     
     def __init__(self, model: Model, learning_rate: float = 0.01, **kwargs):
         super().__init__(model)
         self.learning_rate = learning_rate
+        self._scratch = None
     
     def step(self, gradients: List[np.ndarray]) -> None:
+        buffers = self._flat_buffers(gradients)
+        if buffers is not None:
+            params, grads = buffers
+            if self._scratch is None:
+                self._scratch = np.empty_like(params)
+            np.multiply(grads, self._per_parameter(self.learning_rate), out=self._scratch)
+            if self.lr_scale != 1.0:
+                self._scratch *= self.lr_scale
+            params -= self._scratch
+            return
+        
         params = self.model.get_params()
+        learning_rate = np.multiply(self.learning_rate, self.lr_scale)
         
         for i, (param, grad) in enumerate(zip(params, gradients)):
-            params[i] = param - self.learning_rate * grad
+            params[i] = param - learning_rate * grad
         
         self.model.set_params(params)
 
 
 class Adam(Optimizer):
-    """Adam optimizer."""
+    """
+    Adam optimizer.
+    
+    Moment estimates and scratch buffers are allocated on the first step and reused.
+    The bias corrections are folded into a scalar step size and epsilon,
+    
+        update = lr * sqrt(1 - beta2^t) / (1 - beta1^t) * m / (sqrt(v) + epsilon * sqrt(1 - beta2^t))
+    
+    which equals lr * m_hat / (sqrt(v_hat) + epsilon), and the update runs as in-place
+    ufuncs over the model's flat parameter buffer, or over each parameter otherwise.
+    For batched models learning_rate may be a list with one value per model.
+    """
     
     def __init__(self, model: Model, learning_rate: float = 0.001, 
                  beta1: float = 0.9, beta2: float = 0.999, epsilon: float = 1e-8, **kwargs):
@@ -56,27 +154,102 @@ class Adam(Optimizer):
         self.m = None
         self.v = None
         self.t = 0
+        # beta1^t and beta2^t, tracked incrementally instead of recomputing the powers
+        self.beta1_power = 1.0
+        self.beta2_power = 1.0
+        self._scratch = None
+        self._denom = None
     
     def step(self, gradients: List[np.ndarray]) -> None:
-        params = self.model.get_params()
+        buffers = self._flat_buffers(gradients)
+        if buffers is not None:
+            params, grads = [buffers[0]], [buffers[1]]
+        else:
+            params, grads = self.model.get_params(), gradients
         
         # Initialize moment estimates if this is the first step
         if self.m is None:
-            self.m = [np.zeros_like(grad) for grad in gradients]
-            self.v = [np.zeros_like(grad) for grad in gradients]
+            self.m = [np.zeros_like(param) for param in params]
+            self.v = [np.zeros_like(param) for param in params]
+        if self._scratch is None:
+            self._scratch = [np.empty_like(m) for m in self.m]
+            self._denom = [np.empty_like(m) for m in self.m]
         
         self.t += 1
+        self.beta1_power *= self.beta1
+        self.beta2_power *= self.beta2
+        bias_correction2 = np.sqrt(1 - self.beta2_power)
+        learning_rate = self._per_parameter(self.learning_rate)
+        step_size = bias_correction2 / (1 - self.beta1_power) * self.lr_scale
+        epsilon = self.epsilon * bias_correction2
         
-        # Update parameters
-        for i, (param, grad) in enumerate(zip(params, gradients)):
-            self.m[i] = self.beta1 * self.m[i] + (1 - self.beta1) * grad
-            
-            self.v[i] = self.beta2 * self.v[i] + (1 - self.beta2) * np.square(grad)
+        for param, grad, m, v, scratch, denom in zip(params, grads, self.m, self.v, self._scratch, self._denom):
+            self._decay(param, learning_rate, scratch)
             
-            m_hat = self.m[i] / (1 - self.beta1 ** self.t)
+            m *= self.beta1
+            np.multiply(grad, 1 - self.beta1, out=scratch)
+            m += scratch
             
-            v_hat = self.v[i] / (1 - self.beta2 ** self.t)
+            v *= self.beta2
+            np.multiply(grad, grad, out=scratch)
+            scratch *= 1 - self.beta2
+            v += scratch
             
-            params[i] = param - self.learning_rate * m_hat / (np.sqrt(v_hat) + self.epsilon)
+            np.sqrt(v, out=denom)
+            denom += epsilon
+            np.divide(m, denom, out=scratch)
+            if np.ndim(learning_rate) == 0:
+                scratch *= learning_rate * step_size
+            else:
+                scratch *= learning_rate
+                scratch *= step_size
+            param -= scratch
         
-        self.model.set_params(params) 
\ No newline at end of file
+        if buffers is None:
+            self.model.set_params(params)
+    
+    def _decay(self, param: np.ndarray, learning_rate: Union[float, np.ndarray], scratch: np.ndarray) -> None:
+        """Hook for decoupled weight decay, applied before the Adam update."""
+        pass
+    
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            't': self.t,
+            'beta1_power': self.beta1_power,
+            'beta2_power': self.beta2_power,
+            'm': [m.copy() for m in self.m] if self.m is not None else [],
+            'v': [v.copy() for v in self.v] if self.v is not None else []
+        }
+    
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        self.t = int(state['t'])
+        self.beta1_power = float(state['beta1_power'])
+        self.beta2_power = float(state['beta2_power'])
+        self.m = [np.array(m) for m in state.get('m', [])] or None
+        self.v = [np.array(v) for v in state.get('v', [])] or None
+        self._scratch = None
+        self._denom = None
+
+
+class AdamW(Adam):
+    """
+    Adam with decoupled weight decay: parameters shrink by learning_rate * weight_decay each step.
+    
+    Like learning_rate, weight_decay may hold one value per model of a batched model.
+    """
+    
+    def __init__(self, model: Model, learning_rate: float = 0.001, 
+                 beta1: float = 0.9, beta2: float = 0.999, epsilon: float = 1e-8,
+                 weight_decay: float = 0.01, **kwargs):
+        super().__init__(model, learning_rate, beta1, beta2, epsilon)
+        self.weight_decay = weight_decay
+    
+    def _decay(self, param: np.ndarray, learning_rate: Union[float, np.ndarray], scratch: np.ndarray) -> None:
+        if np.ndim(self.weight_decay) == 0 and not self.weight_decay:
+            return
+        weight_decay = self._per_parameter(self.weight_decay)
+        np.multiply(param, learning_rate, out=scratch)
+        scratch *= weight_decay
+        if self.lr_scale != 1.0:
+            scratch *= self.lr_scale
+        param -= scratch
\ No newline at end of file
@@ -1,10 +1,41 @@
 from abc import ABC, abstractmethod
+import hashlib
+import json
+import os
+import pickle
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, Union, Tuple
+from typing import Dict, Any, Union, Tuple, Optional, List, Callable, Iterable
 from core.factory import Factory
 
 
+def _float_dtype(data: np.ndarray, dtype: Optional[np.dtype]) -> np.dtype:
+    """Output dtype of an affine transform: the configured dtype, else the input's float dtype."""
+    if dtype is not None:
+        return dtype
+    if np.issubdtype(data.dtype, np.floating):
+        return data.dtype
+    return np.dtype(np.float64)
+
+
+def _apply_affine(data: np.ndarray, scale: np.ndarray, offset: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Compute data * scale + offset into `out`, which may be `data` itself."""
+    np.multiply(data, scale.astype(out.dtype, copy=False), out=out)
+    np.add(out, offset.astype(out.dtype, copy=False), out=out)
+    return out
+
+
+def _fingerprint(data: np.ndarray) -> str:
+    """Hash the shape, dtype and contents of an array, reading it in blocks of about 16 MB."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((data.shape, data.dtype.str)).encode())
+    row_bytes = max(1, data.itemsize * int(np.prod(data.shape[1:])))
+    rows = max(1, (16 << 20) // row_bytes)
+    for start in range(0, len(data), rows):
+        digest.update(np.ascontiguousarray(data[start:start + rows]).data)
+    return digest.hexdigest()
+
+
 @Factory.register_component_type
 class Preprocessor(ABC):
     """Base class for data preprocessors."""
@@ -19,10 +50,33 @@ class Preprocessor(ABC):
         """Transform the data."""
         pass
     
-    def fit_transform(self, data: Union[np.ndarray, pd.DataFrame]) -> Union[np.ndarray, pd.DataFrame]:
-        """Fit and transform the data."""
+    def fit_transform(self, data: Union[np.ndarray, pd.DataFrame], **kwargs) -> Union[np.ndarray, pd.DataFrame]:
+        """Fit and transform the data. Extra arguments are passed on to transform."""
         self.fit(data)
-        return self.transform(data)
+        return self.transform(data, **kwargs)
+    
+    def partial_fit(self, data: Union[np.ndarray, pd.DataFrame]) -> None:
+        """Update the fitted state with one more chunk of data."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support incremental fitting")
+    
+    def merge(self, other: 'Preprocessor') -> None:
+        """Combine the fitted state of `other`, fitted on different rows, into this one."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support merging")
+    
+    def reset(self) -> None:
+        """Forget the fitted state so partial_fit starts from scratch."""
+        pass
+    
+    def fit_chunks(self, chunks: Callable[[], Iterable[np.ndarray]]) -> None:
+        """
+        Fit on data that arrives in chunks, e.g. from DataLoader.iter_chunks.
+        
+        chunks() returns a new iterator over the same chunks for every pass; this
+        takes one pass of partial_fit and raises NotImplementedError without it.
+        """
+        self.reset()
+        for data in chunks():
+            self.partial_fit(data)
     
     @classmethod
     def create(cls, config: Union[str, Dict[str, Any]]):
@@ -33,12 +87,76 @@ class Preprocessor(ABC):
             return Factory.create_from_config('preprocessor', config_dict=config)
 
 
-class MinMaxNormalizer(Preprocessor):
+class AffinePreprocessor(Preprocessor):
+    """
+    Base class for per-feature affine transforms, data * scale + offset.
+    
+    Subclasses compute scale and offset from their fitted statistics; they are cached
+    per dtype until the statistics change. transform() writes into `out` or, with
+    inplace=True, into the input array, so it allocates at most one array.
+    The output dtype is `dtype` if configured, else the input's float dtype (float64
+    for integer input).
+    """
+    
+    def __init__(self, dtype: Optional[str] = None, **kwargs):
+        self.dtype = np.dtype(dtype) if dtype else None
+        self._affine_cache = {}
+    
+    @abstractmethod
+    def _compute_affine(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute float64 (scale, offset) from the fitted statistics."""
+        pass
+    
+    def affine_params(self, dtype: Union[str, np.dtype] = np.float64) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the cached (scale, offset) of the transform in `dtype`."""
+        dtype = np.dtype(dtype)
+        if dtype not in self._affine_cache:
+            scale, offset = self._compute_affine()
+            self._affine_cache[dtype] = (scale.astype(dtype), offset.astype(dtype))
+        return self._affine_cache[dtype]
+    
+    def output_dtype(self, data: np.ndarray) -> np.dtype:
+        """Dtype transform() produces for `data`."""
+        return _float_dtype(data, self.dtype)
+    
+    def transform(self, data: Union[np.ndarray, pd.DataFrame], out: Optional[np.ndarray] = None,
+                  inplace: bool = False) -> Union[np.ndarray, pd.DataFrame]:
+        is_df = isinstance(data, pd.DataFrame)
+        if is_df:
+            columns = data.columns
+            index = data.index
+            data = data.values
+        
+        if inplace:
+            if not data.flags.writeable or not np.issubdtype(data.dtype, np.floating):
+                raise ValueError("In-place transform needs a writeable floating point array")
+            out = data
+        elif out is None:
+            out = np.empty(data.shape, dtype=self.output_dtype(data))
+        
+        scale, offset = self.affine_params(out.dtype)
+        _apply_affine(data, scale, offset, out)
+        
+        if is_df:
+            return pd.DataFrame(out, columns=columns, index=index, copy=False)
+        return out
+    
+    def _invalidate(self) -> None:
+        """Drop the cached scale and offset after the statistics change."""
+        self._affine_cache = {}
+
+
+class MinMaxNormalizer(AffinePreprocessor):
     """Normalize features to [0, 1] range."""
     
-    def __init__(self, **kwargs):
+    def __init__(self, dtype: Optional[str] = None, **kwargs):
+        super().__init__(dtype)
+        self.reset()
+    
+    def reset(self) -> None:
         self.min_vals = None
         self.max_vals = None
+        self._invalidate()
     
     def fit(self, data: Union[np.ndarray, pd.DataFrame]) -> None:
         if isinstance(data, pd.DataFrame):
@@ -46,31 +164,58 @@ class MinMaxNormalizer(Preprocessor):
         
         self.min_vals = np.min(data, axis=0)
         self.max_vals = np.max(data, axis=0)
+        self._invalidate()
     
-    def transform(self, data: Union[np.ndarray, pd.DataFrame]) -> Union[np.ndarray, pd.DataFrame]:
-        is_df = isinstance(data, pd.DataFrame)
-        if is_df:
-            columns = data.columns
-            index = data.index
+    def partial_fit(self, data: Union[np.ndarray, pd.DataFrame]) -> None:
+        if isinstance(data, pd.DataFrame):
             data = data.values
+        if len(data) == 0:
+            return
         
+        chunk_min = np.min(data, axis=0)
+        chunk_max = np.max(data, axis=0)
+        if self.min_vals is None:
+            self.min_vals = chunk_min
+            self.max_vals = chunk_max
+        else:
+            np.minimum(self.min_vals, chunk_min, out=self.min_vals)
+            np.maximum(self.max_vals, chunk_max, out=self.max_vals)
+        self._invalidate()
+    
+    def merge(self, other: 'MinMaxNormalizer') -> None:
+        if other.min_vals is None:
+            return
+        if self.min_vals is None:
+            self.min_vals = other.min_vals.copy()
+            self.max_vals = other.max_vals.copy()
+        else:
+            self.min_vals = np.minimum(self.min_vals, other.min_vals)
+            self.max_vals = np.maximum(self.max_vals, other.max_vals)
+        self._invalidate()
+    
+    def _compute_affine(self) -> Tuple[np.ndarray, np.ndarray]:
         # Avoid division by zero
-        range_vals = self.max_vals - self.min_vals
+        range_vals = (self.max_vals - self.min_vals).astype(np.float64)
         range_vals[range_vals == 0] = 1
         
-        normalized = (data - self.min_vals) / range_vals
-        
-        if is_df:
-            return pd.DataFrame(normalized, columns=columns, index=index)
-        return normalized
+        scale = 1.0 / range_vals
+        return scale, -self.min_vals * scale
 
 
-class MeanVarNormalizer(Preprocessor):
+class MeanVarNormalizer(AffinePreprocessor):
     """Normalize features to mean=0 and variance=1."""
     
-    def __init__(self, **kwargs):
+    def __init__(self, dtype: Optional[str] = None, **kwargs):
+        super().__init__(dtype)
+        self.reset()
+    
+    def reset(self) -> None:
         self.mean_vals = None
         self.std_vals = None
+        # Running statistics: sample count and sum of squared deviations from the mean
+        self.n_samples = 0
+        self.m2_vals = None
+        self._invalidate()
     
     def fit(self, data: Union[np.ndarray, pd.DataFrame]) -> None:
         if isinstance(data, pd.DataFrame):
@@ -78,20 +223,221 @@ class MeanVarNormalizer(Preprocessor):
         
         self.mean_vals = np.mean(data, axis=0)
         self.std_vals = np.std(data, axis=0)
+        self.n_samples = len(data)
+        self.m2_vals = np.square(self.std_vals) * self.n_samples
+        self._invalidate()
     
-    def transform(self, data: Union[np.ndarray, pd.DataFrame]) -> Union[np.ndarray, pd.DataFrame]:
+    def partial_fit(self, data: Union[np.ndarray, pd.DataFrame]) -> None:
+        if isinstance(data, pd.DataFrame):
+            data = data.values
+        if len(data) == 0:
+            return
+        
+        chunk_mean = np.mean(data, axis=0)
+        chunk_m2 = np.sum(np.square(data - chunk_mean), axis=0)
+        self._combine(len(data), chunk_mean, chunk_m2)
+    
+    def merge(self, other: 'MeanVarNormalizer') -> None:
+        if other.n_samples:
+            self._combine(other.n_samples, other.mean_vals, other.m2_vals)
+    
+    def _combine(self, n_other: int, mean_other: np.ndarray, m2_other: np.ndarray) -> None:
+        """Pairwise update of count, mean and M2 (Chan et al.), stable for any chunk sizes."""
+        if not self.n_samples:
+            self.n_samples = n_other
+            self.mean_vals = np.array(mean_other, dtype=np.float64)
+            self.m2_vals = np.array(m2_other, dtype=np.float64)
+        else:
+            n_total = self.n_samples + n_other
+            delta = mean_other - self.mean_vals
+            self.mean_vals = self.mean_vals + delta * (n_other / n_total)
+            self.m2_vals = self.m2_vals + m2_other + np.square(delta) * (self.n_samples * n_other / n_total)
+            self.n_samples = n_total
+        
+        self.std_vals = np.sqrt(self.m2_vals / self.n_samples)
+        self._invalidate()
+    
+    def _compute_affine(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Avoid division by zero
+        std_vals = self.std_vals.astype(np.float64)
+        std_vals[std_vals == 0] = 1
+        
+        scale = 1.0 / std_vals
+        return scale, -self.mean_vals * scale
+
+
+class PreprocessorPipeline(Preprocessor):
+    """
+    Applies a list of preprocessors in order, each configured like a `preprocessor` entry.
+    
+    Runs of adjacent affine steps are fused into a single scale and offset, so they cost
+    one pass over the data. With `cache_dir` set, the fitted steps are saved under a key
+    built from a fingerprint of the data and the step configs, and reused by later fits
+    on the same data; with `cache_transformed` the transformed matrix is saved as well
+    and fit_transform() returns it as a read-only memmap.
+    
+    Since every step is fitted on the output of the steps before it, the pipeline
+    has no single-pass partial_fit or merge; fit_chunks() fits it from chunks in
+    one pass per step, which is what the chunked train loops use.
+    """
+    
+    def __init__(self, steps: List[Dict[str, Any]], cache_dir: Optional[str] = None,
+                 cache_transformed: bool = True, dtype: Optional[str] = None, **kwargs):
+        self.step_configs = [dict(step) for step in steps]
+        self.steps = [Preprocessor.create({'preprocessor': step}) for step in self.step_configs]
+        self.cache_dir = cache_dir
+        self.cache_transformed = cache_transformed
+        self.dtype = np.dtype(dtype) if dtype else None
+        self._stages = None
+    
+    def reset(self) -> None:
+        for step in self.steps:
+            step.reset()
+        self._stages = None
+    
+    def partial_fit(self, data: Union[np.ndarray, pd.DataFrame]) -> None:
+        raise NotImplementedError(
+            "PreprocessorPipeline fits each step on the output of the steps before it, which takes one pass "
+            "over the data per step; use fit_chunks() to fit it from chunks")
+    
+    def merge(self, other: 'Preprocessor') -> None:
+        raise NotImplementedError("PreprocessorPipeline steps are fitted on each other's output and cannot be merged")
+    
+    def fit_chunks(self, chunks: Callable[[], Iterable[np.ndarray]]) -> None:
+        """
+        Fit step by step, one pass over the chunks per step: each pass feeds the
+        chunks through the steps fitted so far into the next step's partial_fit.
+        A step without partial_fit raises NotImplementedError.
+        """
+        self.reset()
+        for i, step in enumerate(self.steps):
+            fitted = self.steps[:i]
+            for data in chunks():
+                if isinstance(data, pd.DataFrame):
+                    data = data.values
+                for previous in fitted:
+                    data = previous.transform(data)
+                step.partial_fit(data)
+        self._fuse()
+    
+    def fit(self, data: Union[np.ndarray, pd.DataFrame]) -> None:
+        if isinstance(data, pd.DataFrame):
+            data = data.values
+        
+        key = self._cache_key(data) if self.cache_dir else None
+        if key and self._load_state(key):
+            return
+        
+        # Each step is fitted on the output of the steps before it. Only arrays an affine step
+        # allocated here are overwritten: other steps may return their input or a view of it
+        current = data
+        owned = False
+        for i, step in enumerate(self.steps):
+            if i == len(self.steps) - 1:
+                step.fit(current)
+            elif isinstance(step, AffinePreprocessor):
+                if owned and np.issubdtype(current.dtype, np.floating):
+                    step.fit(current)
+                    current = step.transform(current, inplace=True)
+                else:
+                    current = step.fit_transform(current)
+                owned = True
+            else:
+                current = step.fit_transform(current)
+                owned = False
+        
+        self._fuse()
+        if key:
+            self._save(key, 'state.pkl', lambda f: pickle.dump(self.steps, f))
+    
+    def fit_transform(self, data: Union[np.ndarray, pd.DataFrame], **kwargs) -> Union[np.ndarray, pd.DataFrame]:
+        if not self.cache_dir or not self.cache_transformed or kwargs or isinstance(data, pd.DataFrame):
+            return super().fit_transform(data, **kwargs)
+        
+        key = self._cache_key(data)
+        transformed_path = os.path.join(self.cache_dir, key, 'transformed.npy')
+        if self._load_state(key) and os.path.exists(transformed_path):
+            return np.load(transformed_path, mmap_mode='r')
+        
+        self.fit(data)
+        transformed = self.transform(data)
+        self._save(key, 'transformed.npy', lambda f: np.save(f, transformed))
+        return transformed
+    
+    def transform(self, data: Union[np.ndarray, pd.DataFrame], out: Optional[np.ndarray] = None,
+                  inplace: bool = False) -> Union[np.ndarray, pd.DataFrame]:
         is_df = isinstance(data, pd.DataFrame)
         if is_df:
             columns = data.columns
             index = data.index
             data = data.values
+        if self._stages is None:
+            self._fuse()
         
-        # Avoid division by zero
-        std_vals = self.std_vals.copy()
-        std_vals[std_vals == 0] = 1
+        # Affine stages write in place only into the input when inplace=True or into arrays
+        # allocated here; a non-affine step's output may share memory with its input
+        current = data
+        owned = inplace
+        for stage in self._stages:
+            if isinstance(stage, Preprocessor):
+                current = stage.transform(current)
+                owned = False
+                continue
+            
+            scale, offset = stage
+            if owned and current.flags.writeable and np.issubdtype(current.dtype, np.floating):
+                target = current
+            elif out is not None:
+                target = out
+            else:
+                target = np.empty(current.shape, dtype=_float_dtype(current, self.dtype))
+            current = _apply_affine(current, scale, offset, target)
+            owned = True
         
-        normalized = (data - self.mean_vals) / std_vals
+        if out is not None and current is not out:
+            out[...] = current
+            current = out
         
         if is_df:
-            return pd.DataFrame(normalized, columns=columns, index=index)
-        return normalized 
\ No newline at end of file
+            return pd.DataFrame(current, columns=columns, index=index, copy=False)
+        return current
+    
+    def _fuse(self) -> None:
+        """Collapse runs of affine steps into single (scale, offset) stages."""
+        stages = []
+        for step in self.steps:
+            if not isinstance(step, AffinePreprocessor):
+                stages.append(step)
+                continue
+            
+            scale, offset = step.affine_params(np.float64)
+            if stages and isinstance(stages[-1], tuple):
+                # (x * s1 + o1) * s2 + o2 == x * (s1 * s2) + (o1 * s2 + o2)
+                prev_scale, prev_offset = stages[-1]
+                stages[-1] = (prev_scale * scale, prev_offset * scale + offset)
+            else:
+                stages.append((scale, offset))
+        self._stages = stages
+    
+    def _cache_key(self, data: np.ndarray) -> str:
+        config = json.dumps({'steps': self.step_configs, 'dtype': str(self.dtype)}, sort_keys=True, default=str)
+        return hashlib.blake2b(f"{_fingerprint(data)}|{config}".encode(), digest_size=16).hexdigest()
+    
+    def _load_state(self, key: str) -> bool:
+        """Restore fitted steps saved under `key`; returns False on a cache miss."""
+        state_path = os.path.join(self.cache_dir, key, 'state.pkl')
+        if not os.path.exists(state_path):
+            return False
+        with open(state_path, 'rb') as f:
+            self.steps = pickle.load(f)
+        self._fuse()
+        return True
+    
+    def _save(self, key: str, name: str, write) -> None:
+        """Write a cache file through a temporary name so readers never see partial files."""
+        entry = os.path.join(self.cache_dir, key)
+        os.makedirs(entry, exist_ok=True)
+        tmp_path = os.path.join(entry, f".{name}.tmp-{os.getpid()}")
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, os.path.join(entry, name))
\ No newline at end of file
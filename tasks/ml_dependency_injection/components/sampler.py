@@ -0,0 +1,127 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from typing import Dict, Any, List, Union, Iterator, Optional
+from core.factory import Factory
+from components.batchiterator import BatchIndices
+
+
+@Factory.register_component_type
+class Sampler(ABC):
+    """
+    Base class for samplers that decide which samples make up each minibatch.
+    
+    A sampler only yields indices (index arrays or slices); the batch iterator gathers
+    each batch from X and y, so the dataset is never copied as a whole and memmapped
+    arrays are read one batch at a time. Without a seed the samplers draw from numpy's
+    global RNG, so np.random.seed makes a run reproducible.
+    """
+    
+    def __init__(self, seed: Optional[int] = None, **kwargs):
+        self.seed = seed
+        self._rng = np.random.default_rng(seed) if seed is not None else None
+    
+    @abstractmethod
+    def batches(self, n_samples: int, batch_size: int) -> Iterator[BatchIndices]:
+        """Yield the indices of each minibatch for one pass over n_samples samples."""
+        pass
+    
+    def _permutation(self, n: int) -> np.ndarray:
+        if self._rng is None:
+            return np.random.permutation(n)
+        return self._rng.permutation(n)
+    
+    @classmethod
+    def create(cls, config: Union[str, Dict[str, Any]]):
+        """Factory method to create a Sampler instance."""
+        if isinstance(config, str):
+            return Factory.create_from_config('sampler', config_path=config)
+        else:
+            return Factory.create_from_config('sampler', config_dict=config)
+
+
+class SequentialSampler(Sampler):
+    """Batches in dataset order, as slices, so memmapped inputs are read sequentially."""
+    
+    def batches(self, n_samples: int, batch_size: int) -> Iterator[BatchIndices]:
+        for start in range(0, n_samples, batch_size):
+            yield slice(start, min(start + batch_size, n_samples))
+
+
+class RandomSampler(Sampler):
+    """Batches from a fresh random permutation of the samples on every pass."""
+    
+    def batches(self, n_samples: int, batch_size: int) -> Iterator[BatchIndices]:
+        indices = self._permutation(n_samples)
+        for start in range(0, n_samples, batch_size):
+            yield indices[start:start + batch_size]
+
+
+class BlockShuffleSampler(Sampler):
+    """
+    Shuffles contiguous blocks of block_size samples instead of single samples.
+    
+    Blocks are visited in random order and, with shuffle_within_blocks, samples are
+    shuffled inside each block, so a batch touches only one or two contiguous regions
+    of X. This keeps gathers cache- and page-friendly, which matters most for
+    memmapped inputs, at the cost of less thorough mixing than RandomSampler.
+    """
+    
+    def __init__(self, block_size: int = 1024, shuffle_within_blocks: bool = True,
+                 seed: Optional[int] = None, **kwargs):
+        super().__init__(seed)
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.block_size = block_size
+        self.shuffle_within_blocks = shuffle_within_blocks
+    
+    def batches(self, n_samples: int, batch_size: int) -> Iterator[BatchIndices]:
+        n_blocks = -(-n_samples // self.block_size)
+        indices = np.empty(n_samples, dtype=np.int64)
+        position = 0
+        for block in self._permutation(n_blocks):
+            start = block * self.block_size
+            stop = min(start + self.block_size, n_samples)
+            if self.shuffle_within_blocks:
+                indices[position:position + stop - start] = start + self._permutation(stop - start)
+            else:
+                indices[position:position + stop - start] = np.arange(start, stop)
+            position += stop - start
+        
+        for start in range(0, n_samples, batch_size):
+            yield indices[start:start + batch_size]
+
+
+class WeightedSampler(Sampler):
+    """
+    Draws samples with probability proportional to per-sample weights.
+    
+    weights is a sequence with one non-negative weight per sample or the path to a
+    .npy file holding them. num_samples draws are made per pass (default: the dataset
+    size), with replacement unless replacement is False.
+    """
+    
+    def __init__(self, weights: Union[str, List[float], np.ndarray],
+                 num_samples: Optional[int] = None, replacement: bool = True,
+                 seed: Optional[int] = None, **kwargs):
+        super().__init__(seed)
+        if isinstance(weights, str):
+            weights = np.load(weights)
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or np.any(weights < 0) or weights.sum() <= 0:
+            raise ValueError("weights must be a 1-D array of non-negative values with a positive sum")
+        self.weights = weights
+        self.num_samples = num_samples
+        self.replacement = replacement
+    
+    def batches(self, n_samples: int, batch_size: int) -> Iterator[BatchIndices]:
+        if len(self.weights) != n_samples:
+            raise ValueError(f"WeightedSampler has {len(self.weights)} weights for {n_samples} samples")
+        num_samples = self.num_samples or n_samples
+        probabilities = self.weights / self.weights.sum()
+        if self._rng is None:
+            indices = np.random.choice(n_samples, size=num_samples, replace=self.replacement, p=probabilities)
+        else:
+            indices = self._rng.choice(n_samples, size=num_samples, replace=self.replacement, p=probabilities)
+        
+        for start in range(0, num_samples, batch_size):
+            yield indices[start:start + batch_size]
\ No newline at end of file
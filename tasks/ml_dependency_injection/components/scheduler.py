@@ -0,0 +1,252 @@
+from abc import ABC, abstractmethod
+import math
+import numpy as np
+from typing import Dict, Any, Union, Optional
+from core.factory import Factory
+from components.optimizer import Optimizer
+
+
+@Factory.register_component_type
+class Scheduler(ABC):
+    """
+    Base class for learning-rate schedules.
+    
+    A scheduler scales its optimizer's configured learning_rate (scalar or per-model
+    list) by a multiplier written to optimizer.lr_scale. The train loop calls
+    start() before training, step() after every optimizer step and end_epoch() after
+    every epoch, so schedules are written in (fractional) epochs and still change
+    the rate between minibatches. Steps per epoch are estimated by the train loop
+    and replaced by the count observed in the first epoch.
+    
+    warmup_epochs ramps the multiplier linearly from warmup_start_factor to the
+    schedule's value; OneCycleScheduler has its own warmup phase.
+    """
+    
+    def __init__(self, optimizer: Optimizer, warmup_epochs: float = 0.0, warmup_start_factor: float = 0.1,
+                 **kwargs):
+        self.optimizer = optimizer
+        self.warmup_epochs = warmup_epochs
+        self.warmup_start_factor = warmup_start_factor
+        self.total_epochs = None
+        self.steps_per_epoch = None
+        self.epoch = 0
+        self.step_in_epoch = 0
+    
+    @abstractmethod
+    def multiplier(self, progress: float) -> float:
+        """Learning-rate multiplier after `progress` epochs, before warmup."""
+        pass
+    
+    def start(self, total_epochs: int, steps_per_epoch: Optional[int] = None) -> None:
+        """Set the run length and apply the initial rate."""
+        self.total_epochs = total_epochs
+        if self.steps_per_epoch is None:
+            self.steps_per_epoch = steps_per_epoch
+        self._apply()
+    
+    def step(self) -> None:
+        """Advance by one optimizer step."""
+        self.step_in_epoch += 1
+        if self.steps_per_epoch:
+            self._apply()
+    
+    def end_epoch(self, score: Optional[float] = None) -> None:
+        """
+        Advance to the next epoch.
+        
+        score is the monitored metric of the epoch (lower is better) when there is
+        one; only ReduceOnPlateauScheduler uses it.
+        """
+        if self.epoch == 0 and self.step_in_epoch:
+            self.steps_per_epoch = self.step_in_epoch
+        self.epoch += 1
+        self.step_in_epoch = 0
+        self._apply()
+    
+    @property
+    def progress(self) -> float:
+        if not self.steps_per_epoch:
+            return float(self.epoch)
+        return self.epoch + min(self.step_in_epoch / self.steps_per_epoch, 1.0)
+    
+    def _apply(self) -> None:
+        progress = self.progress
+        scale = self.multiplier(progress)
+        if progress < self.warmup_epochs:
+            scale *= self.warmup_start_factor + (1 - self.warmup_start_factor) * progress / self.warmup_epochs
+        self.optimizer.lr_scale = scale
+    
+    def _horizon(self, epochs: Optional[int]) -> float:
+        """Schedule length in epochs: `epochs` if given, else the train loop's epochs."""
+        horizon = epochs if epochs is not None else self.total_epochs
+        if not horizon:
+            raise ValueError(f"{type(self).__name__} needs `epochs` when not run by an epoch train loop")
+        return float(horizon)
+    
+    def state_dict(self) -> Dict[str, Any]:
+        """Return a snapshot of the schedule position (scalars only)."""
+        return {
+            'epoch': self.epoch,
+            'step_in_epoch': self.step_in_epoch,
+            'steps_per_epoch': self.steps_per_epoch or 0,
+            'total_epochs': self.total_epochs or 0
+        }
+    
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        """Restore a state returned by state_dict() and reapply its rate."""
+        self.epoch = int(state['epoch'])
+        self.step_in_epoch = int(state['step_in_epoch'])
+        self.steps_per_epoch = int(state['steps_per_epoch']) or None
+        self.total_epochs = int(state['total_epochs']) or None
+        self._apply()
+    
+    def save_state(self, path: str) -> None:
+        """Save state_dict() to an .npz file."""
+        np.savez(path, **{name: np.asarray(value) for name, value in self.state_dict().items()})
+    
+    def load_state(self, path: str) -> None:
+        """Load a state written by save_state()."""
+        with np.load(path, allow_pickle=False) as archive:
+            self.load_state_dict({key: archive[key].item() for key in archive.files})
+    
+    @classmethod
+    def create(cls, config: Union[str, Dict[str, Any]]):
+        """Factory method to create a Scheduler instance."""
+        if isinstance(config, str):
+            return Factory.create_from_config('scheduler', config_path=config)
+        else:
+            return Factory.create_from_config('scheduler', config_dict=config)
+
+
+class WarmupScheduler(Scheduler):
+    """Linear warmup over warmup_epochs, then the configured learning rate."""
+    
+    def __init__(self, optimizer: Optimizer, warmup_epochs: float = 1.0, warmup_start_factor: float = 0.1,
+                 **kwargs):
+        super().__init__(optimizer, warmup_epochs, warmup_start_factor)
+    
+    def multiplier(self, progress: float) -> float:
+        return 1.0
+
+
+class CosineScheduler(Scheduler):
+    """Cosine decay from the configured rate to min_factor times it over `epochs` (default: all epochs)."""
+    
+    def __init__(self, optimizer: Optimizer, epochs: Optional[int] = None, min_factor: float = 0.0,
+                 warmup_epochs: float = 0.0, warmup_start_factor: float = 0.1, **kwargs):
+        super().__init__(optimizer, warmup_epochs, warmup_start_factor)
+        self.epochs = epochs
+        self.min_factor = min_factor
+    
+    def multiplier(self, progress: float) -> float:
+        # The decay starts after warmup
+        start = min(self.warmup_epochs, self._horizon(self.epochs))
+        span = self._horizon(self.epochs) - start
+        fraction = min(max(progress - start, 0.0) / span, 1.0) if span > 0 else 1.0
+        return self.min_factor + (1 - self.min_factor) * 0.5 * (1 + math.cos(math.pi * fraction))
+
+
+class StepScheduler(Scheduler):
+    """Multiply the rate by gamma every step_epochs epochs."""
+    
+    def __init__(self, optimizer: Optimizer, step_epochs: int = 10, gamma: float = 0.1,
+                 warmup_epochs: float = 0.0, warmup_start_factor: float = 0.1, **kwargs):
+        super().__init__(optimizer, warmup_epochs, warmup_start_factor)
+        if step_epochs < 1:
+            raise ValueError("step_epochs must be at least 1")
+        self.step_epochs = step_epochs
+        self.gamma = gamma
+    
+    def multiplier(self, progress: float) -> float:
+        return self.gamma ** int(progress // self.step_epochs)
+
+
+class OneCycleScheduler(Scheduler):
+    """
+    One-cycle policy: the configured learning rate is the peak.
+    
+    The rate rises from 1 / div_factor of the peak to the peak over the first
+    pct_start of `epochs` (default: all epochs), then anneals with a cosine to
+    1 / (div_factor * final_div_factor) of it.
+    """
+    
+    def __init__(self, optimizer: Optimizer, epochs: Optional[int] = None, pct_start: float = 0.3,
+                 div_factor: float = 25.0, final_div_factor: float = 1e4, **kwargs):
+        super().__init__(optimizer)
+        if not 0.0 < pct_start < 1.0:
+            raise ValueError("pct_start must be in (0, 1)")
+        self.epochs = epochs
+        self.pct_start = pct_start
+        self.div_factor = div_factor
+        self.final_div_factor = final_div_factor
+    
+    def multiplier(self, progress: float) -> float:
+        fraction = min(progress / self._horizon(self.epochs), 1.0)
+        initial = 1.0 / self.div_factor
+        final = initial / self.final_div_factor
+        if fraction < self.pct_start:
+            low, high, phase = initial, 1.0, fraction / self.pct_start
+        else:
+            low, high, phase = final, 1.0, 1.0 - (fraction - self.pct_start) / (1.0 - self.pct_start)
+        # Cosine interpolation from low (phase 0) to high (phase 1)
+        return low + (high - low) * 0.5 * (1 - math.cos(math.pi * phase))
+
+
+class ReduceOnPlateauScheduler(Scheduler):
+    """
+    Multiply the rate by gamma when the monitored score stops improving.
+    
+    The train loop reports the same score early stopping monitors (validation
+    metric if there is an evaluation, otherwise the training metric); after
+    `patience` reported epochs without an improvement of more than threshold
+    (relative), the rate is reduced, down to min_factor, and cooldown epochs pass
+    before counting again.
+    """
+    
+    def __init__(self, optimizer: Optimizer, patience: int = 5, gamma: float = 0.1, threshold: float = 1e-4,
+                 cooldown: int = 0, min_factor: float = 0.0, warmup_epochs: float = 0.0,
+                 warmup_start_factor: float = 0.1, **kwargs):
+        super().__init__(optimizer, warmup_epochs, warmup_start_factor)
+        self.patience = patience
+        self.gamma = gamma
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.min_factor = min_factor
+        self.reduction = 1.0
+        self.best = math.inf
+        self.stale = 0
+        self.cooldown_left = 0
+    
+    def end_epoch(self, score: Optional[float] = None) -> None:
+        if score is not None:
+            if not math.isfinite(self.best) or score < self.best - abs(self.best) * self.threshold:
+                self.best = score
+                self.stale = 0
+            elif self.cooldown_left > 0:
+                self.cooldown_left -= 1
+            else:
+                self.stale += 1
+                if self.stale > self.patience:
+                    self.reduction = max(self.reduction * self.gamma, self.min_factor)
+                    self.stale = 0
+                    self.cooldown_left = self.cooldown
+        super().end_epoch(score)
+    
+    def multiplier(self, progress: float) -> float:
+        return self.reduction
+    
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            **super().state_dict(),
+            'reduction': self.reduction,
+            'best': self.best,
+            'stale': self.stale,
+            'cooldown_left': self.cooldown_left
+        }
+    
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        self.reduction = float(state['reduction'])
+        self.best = float(state['best'])
+        self.stale = int(state['stale'])
+        self.cooldown_left = int(state['cooldown_left'])
+        super().load_state_dict(state)
\ No newline at end of file
@@ -1,23 +1,54 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Union, List, Optional, Tuple
+import atexit
+import collections
+import json
 import os
+import struct
+import sys
+import threading
+import time
+import uuid
+import numpy as np
+import yaml
 from core.factory import Factory
 
 
+def _metric_line(name: str, value: Union[float, int], step: Optional[int]) -> str:
+    if step is None:
+        return f"{name} = {value}"
+    return f"{name} = {value} (step {step})"
+
+
 @Factory.register_component_type
 class Tracker(ABC):
-    """Base class for experiment trackers."""
+    """
+    Base class for experiment trackers.
+    
+    Metrics are identified by a fixed name plus an optional integer step (the
+    epoch, or the sample count for online training), so a run has a bounded set
+    of metric names however long it trains.
+    """
     
     @abstractmethod
-    def log_metric(self, name: str, value: Union[float, int]) -> None:
-        """Log a numerical metric."""
+    def log_metric(self, name: str, value: Union[float, int], step: Optional[int] = None) -> None:
+        """Log a numerical metric, optionally at a step."""
         pass
     
+    def log_metrics(self, metrics: Dict[str, Union[float, int]], step: Optional[int] = None) -> None:
+        """Log several metrics at the same step; trackers override this to write them as one batch."""
+        for name, value in metrics.items():
+            self.log_metric(name, value, step)
+    
     @abstractmethod
     def log_params(self, params: Dict[str, Any]) -> None:
         """Log parameters."""
         pass
     
+    def flush(self) -> None:
+        """Write out anything buffered; the train loops call this when they finish."""
+        pass
+    
     @classmethod
     def create(cls, config: Union[str, Dict[str, Any]]):
         """Factory method to create a Tracker instance."""
@@ -33,8 +64,11 @@ class StdoutTracker(Tracker):
     def __init__(self, **kwargs):
         pass
     
-    def log_metric(self, name: str, value: Union[float, int]) -> None:
-        print(f"METRIC: {name} = {value}")
+    def log_metric(self, name: str, value: Union[float, int], step: Optional[int] = None) -> None:
+        print(f"METRIC: {_metric_line(name, value, step)}")
+    
+    def log_metrics(self, metrics: Dict[str, Union[float, int]], step: Optional[int] = None) -> None:
+        print("\n".join(f"METRIC: {_metric_line(name, value, step)}" for name, value in metrics.items()))
     
     def log_params(self, params: Dict[str, Any]) -> None:
         print("PARAMS:")
@@ -43,19 +77,167 @@ class StdoutTracker(Tracker):
 
 
 class MLFlowTracker(Tracker):
-    """Tracker that logs to MLFlow."""
+    """
+    Tracker that records runs in MLflow's local file-store layout, without a server.
+    
+    tracking_uri is the mlruns directory (a path or file:// URI) that
+    `mlflow ui --backend-store-uri` and the mlflow client read. The run is created
+    in experiment_name, which is created if needed, with run_name and `tags`.
+    Metrics are buffered and written like MLflow's log_batch: every flush_size
+    metrics (and on flush()) each metric file gets one append of its
+    "timestamp value step" lines. Params are written once per key; logging a key
+    again with a different value raises ValueError, as MLflow does. end_run(), or
+    interpreter exit, writes the remaining metrics and marks the run FINISHED.
+    """
     
-    def __init__(self, experiment_name: str = "default", **kwargs):
+    DEFAULT_EXPERIMENT_ID = '0'
+    RUN_STATUS = {'RUNNING': 1, 'FINISHED': 3, 'FAILED': 4, 'KILLED': 5}
+    SOURCE_TYPE_LOCAL = 4
+    
+    def __init__(self,
+                 experiment_name: str = "Default",
+                 tracking_uri: str = "mlruns",
+                 run_name: Optional[str] = None,
+                 tags: Optional[Dict[str, Any]] = None,
+                 flush_size: int = 1000,
+                 **kwargs):
         self.experiment_name = experiment_name
-        print(f"Initializing MLFlow with experiment: {experiment_name}")
+        self.root = os.path.abspath(tracking_uri[len('file://'):] if tracking_uri.startswith('file://') else tracking_uri)
+        self.flush_size = flush_size
+        self._pending = {}
+        self._n_pending = 0
+        self._ended = False
+        
+        self.experiment_id = self._experiment_id(experiment_name)
+        self.run_id = uuid.uuid4().hex
+        self.run_name = run_name or f"run-{self.run_id[:8]}"
+        self.run_dir = os.path.join(self.root, self.experiment_id, self.run_id)
+        for folder in ('metrics', 'params', 'tags', 'artifacts'):
+            os.makedirs(os.path.join(self.run_dir, folder))
+        self._write_run_meta('RUNNING', end_time=None, start_time=self._now())
+        
+        user = os.environ.get('USER') or os.environ.get('USERNAME') or 'unknown'
+        run_tags = {'mlflow.runName': self.run_name, 'mlflow.user': user,
+                    'mlflow.source.name': os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else '',
+                    'mlflow.source.type': 'LOCAL', **(tags or {})}
+        for key, value in run_tags.items():
+            self._write_value(os.path.join(self.run_dir, 'tags', key), value)
+        atexit.register(self.end_run)
+        print(f"MLflow run {self.run_id} in experiment '{experiment_name}' ({self.experiment_id}) at {self.root}")
+    
+    def log_metric(self, name: str, value: Union[float, int], step: Optional[int] = None) -> None:
+        self._pending.setdefault(name, []).append(f"{self._now()} {float(value)} {step or 0}\n")
+        self._n_pending += 1
+        if self._n_pending >= self.flush_size:
+            self.flush()
     
-    def log_metric(self, name: str, value: Union[float, int]) -> None:
-        print(f"MLFLOW METRIC: {name} = {value}")
+    def log_metrics(self, metrics: Dict[str, Union[float, int]], step: Optional[int] = None) -> None:
+        timestamp = self._now()
+        for name, value in metrics.items():
+            self._pending.setdefault(name, []).append(f"{timestamp} {float(value)} {step or 0}\n")
+        self._n_pending += len(metrics)
+        if self._n_pending >= self.flush_size:
+            self.flush()
     
     def log_params(self, params: Dict[str, Any]) -> None:
-        print("MLFLOW PARAMS:")
         for key, value in params.items():
-            print(f"  {key} = {value}")
+            path = os.path.join(self.run_dir, 'params', key)
+            if os.path.exists(path):
+                with open(path) as f:
+                    current = f.read()
+                if current != str(value):
+                    raise ValueError(f"Param '{key}' was already logged as {current!r}; MLflow params are immutable")
+                continue
+            self._write_value(path, value)
+    
+    def flush(self) -> None:
+        for name, lines in self._pending.items():
+            path = os.path.join(self.run_dir, 'metrics', name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a') as f:
+                f.write(''.join(lines))
+        self._pending = {}
+        self._n_pending = 0
+    
+    def end_run(self, status: str = 'FINISHED') -> None:
+        """Write the remaining metrics and record the run's end time and status."""
+        if self._ended:
+            return
+        self._ended = True
+        atexit.unregister(self.end_run)
+        self.flush()
+        self._write_run_meta(status, end_time=self._now())
+    
+    @staticmethod
+    def _now() -> int:
+        return int(time.time() * 1000)
+    
+    @staticmethod
+    def _write_value(path: str, value: Any) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(str(value))
+    
+    def _write_run_meta(self, status: str, end_time: Optional[int], start_time: Optional[int] = None) -> None:
+        path = os.path.join(self.run_dir, 'meta.yaml')
+        if start_time is None:
+            with open(path) as f:
+                start_time = yaml.safe_load(f)['start_time']
+        meta = {
+            'artifact_uri': 'file://' + os.path.join(self.run_dir, 'artifacts'),
+            'end_time': end_time,
+            'entry_point_name': '',
+            'experiment_id': self.experiment_id,
+            'lifecycle_stage': 'active',
+            'run_id': self.run_id,
+            'run_name': self.run_name,
+            'run_uuid': self.run_id,
+            'source_name': '',
+            'source_type': self.SOURCE_TYPE_LOCAL,
+            'source_version': '',
+            'start_time': start_time,
+            'status': self.RUN_STATUS[status],
+            'tags': [],
+            'user_id': os.environ.get('USER') or 'unknown',
+            'deleted_time': None
+        }
+        with open(path, 'w') as f:
+            yaml.safe_dump(meta, f, default_flow_style=False)
+    
+    def _experiment_id(self, name: str) -> str:
+        """Id of the active experiment called `name`, creating it (and the store's Default experiment) if needed."""
+        os.makedirs(self.root, exist_ok=True)
+        if not os.path.exists(os.path.join(self.root, self.DEFAULT_EXPERIMENT_ID, 'meta.yaml')):
+            self._create_experiment('Default', self.DEFAULT_EXPERIMENT_ID)
+        
+        ids = []
+        for entry in os.listdir(self.root):
+            meta_path = os.path.join(self.root, entry, 'meta.yaml')
+            if not entry.isdigit() or not os.path.exists(meta_path):
+                continue
+            ids.append(int(entry))
+            with open(meta_path) as f:
+                meta = yaml.safe_load(f)
+            if meta.get('name') == name and meta.get('lifecycle_stage', 'active') == 'active':
+                return entry
+        experiment_id = str(max(ids) + 1)
+        self._create_experiment(name, experiment_id)
+        return experiment_id
+    
+    def _create_experiment(self, name: str, experiment_id: str) -> None:
+        directory = os.path.join(self.root, experiment_id)
+        os.makedirs(directory, exist_ok=True)
+        now = self._now()
+        meta = {
+            'artifact_location': 'file://' + directory,
+            'creation_time': now,
+            'experiment_id': experiment_id,
+            'last_update_time': now,
+            'lifecycle_stage': 'active',
+            'name': name
+        }
+        with open(os.path.join(directory, 'meta.yaml'), 'w') as f:
+            yaml.safe_dump(meta, f, default_flow_style=False)
 
 
 class LogfileTracker(Tracker):
@@ -66,12 +248,373 @@ class LogfileTracker(Tracker):
         with open(self.logfile, 'w') as f:
             f.write("=== Experiment Log ===\n")
     
-    def log_metric(self, name: str, value: Union[float, int]) -> None:
+    def log_metric(self, name: str, value: Union[float, int], step: Optional[int] = None) -> None:
+        with open(self.logfile, 'a') as f:
+            f.write(f"METRIC: {_metric_line(name, value, step)}\n")
+    
+    def log_metrics(self, metrics: Dict[str, Union[float, int]], step: Optional[int] = None) -> None:
         with open(self.logfile, 'a') as f:
-            f.write(f"METRIC: {name} = {value}\n")
+            f.write("".join(f"METRIC: {_metric_line(name, value, step)}\n" for name, value in metrics.items()))
     
     def log_params(self, params: Dict[str, Any]) -> None:
         with open(self.logfile, 'a') as f:
             f.write("PARAMS:\n")
             for key, value in params.items():
-                f.write(f"  {key} = {value}\n") 
\ No newline at end of file
+                f.write(f"  {key} = {value}\n")
+
+
+class AsyncTracker(Tracker):
+    """
+    Wraps another tracker and hands its writes to a background thread.
+    
+    log_metric/log_metrics/log_params only append to a bounded ring buffer of
+    `capacity` entries, so the training thread never waits on I/O. The writer thread
+    drains the buffer when it holds flush_size entries or flush_interval seconds
+    have passed, and passes consecutive metrics to the inner tracker's log_metrics
+    as one batch. When the buffer is full, overflow='block' waits for the writer
+    (blocked_seconds counts the time) and overflow='drop' discards the entry
+    (counted in dropped). flush() waits until everything queued so far is written;
+    the buffer is also flushed by close() and at interpreter exit.
+    
+    `tracker` is the wrapped Tracker or its config, e.g.
+    {class: AsyncTracker, tracker: {class: StdoutTracker}}. Errors raised by the
+    inner tracker are re-raised on the next call from the training thread.
+    """
+    
+    def __init__(self,
+                 tracker: Union[Tracker, Dict[str, Any]],
+                 capacity: int = 65536,
+                 flush_size: int = 1024,
+                 flush_interval: float = 1.0,
+                 overflow: str = 'block',
+                 **kwargs):
+        if overflow not in ('block', 'drop'):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if capacity < 1 or flush_size < 1:
+            raise ValueError("capacity and flush_size must be at least 1")
+        if isinstance(tracker, dict):
+            tracker = Tracker.create({'tracker': tracker})
+        self.tracker = tracker
+        self.capacity = capacity
+        self.flush_size = min(flush_size, capacity)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        
+        self.dropped = 0
+        self.blocked_seconds = 0.0
+        self.batches_written = 0
+        
+        # Entries are (name, value, step) metrics or (None, params, None)
+        self._buffer = collections.deque()
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._has_room = threading.Condition(self._lock)
+        self._enqueued = 0
+        self._written = 0
+        self._flush_target = 0
+        self._error = None
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name='async-tracker', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+    
+    def log_metric(self, name: str, value: Union[float, int], step: Optional[int] = None) -> None:
+        self._put([(name, value, step)])
+    
+    def log_metrics(self, metrics: Dict[str, Union[float, int]], step: Optional[int] = None) -> None:
+        self._put([(name, value, step) for name, value in metrics.items()])
+    
+    def log_params(self, params: Dict[str, Any]) -> None:
+        self._put([(None, dict(params), None)])
+    
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_target = self._enqueued
+            self._has_work.notify()
+            while self._written < self._flush_target and self._error is None and self._writer.is_alive():
+                self._has_room.wait(0.1)
+        self._raise_error()
+        self.tracker.flush()
+    
+    def close(self) -> None:
+        """Flush, stop the writer thread and flush the inner tracker."""
+        if self._closed:
+            return
+        with self._lock:
+            self._closed = True
+            self._has_work.notify()
+        self._writer.join()
+        atexit.unregister(self.close)
+        self._raise_error()
+        self.tracker.flush()
+    
+    def _put(self, items: List[tuple]) -> None:
+        self._raise_error()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("AsyncTracker is closed")
+            for item in items:
+                if len(self._buffer) >= self.capacity:
+                    if self.overflow == 'drop':
+                        self.dropped += 1
+                        continue
+                    start = time.perf_counter()
+                    while len(self._buffer) >= self.capacity and self._error is None:
+                        self._has_work.notify()
+                        self._has_room.wait()
+                    self.blocked_seconds += time.perf_counter() - start
+                    self._raise_error()
+                self._buffer.append(item)
+                self._enqueued += 1
+                if len(self._buffer) == self.flush_size:
+                    self._has_work.notify()
+    
+    def _write_loop(self) -> None:
+        while True:
+            deadline = time.monotonic() + self.flush_interval
+            with self._lock:
+                # Everything not yet written is in the buffer, so a pending flush() has work here
+                while (len(self._buffer) < self.flush_size and not self._closed
+                       and self._written >= self._flush_target):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._has_work.wait(remaining)
+                items = list(self._buffer)
+                self._buffer.clear()
+                self._has_room.notify_all()
+                closed = self._closed
+            
+            if items:
+                try:
+                    self._write(items)
+                except BaseException as e:
+                    with self._lock:
+                        self._error = e
+                        self._has_room.notify_all()
+                    return
+                with self._lock:
+                    self._written += len(items)
+                    self._has_room.notify_all()
+            elif closed:
+                return
+    
+    def _write(self, items: List[tuple]) -> None:
+        """Pass runs of metrics at one step to the inner tracker as batches, params in between as they came."""
+        batch = {}
+        batch_step = None
+        for name, value, step in items:
+            if name is None or name in batch or step != batch_step:
+                if batch:
+                    self.tracker.log_metrics(batch, batch_step)
+                    self.batches_written += 1
+                    batch = {}
+                batch_step = step
+            if name is None:
+                self.tracker.log_params(value)
+            else:
+                batch[name] = value
+        if batch:
+            self.tracker.log_metrics(batch, batch_step)
+            self.batches_written += 1
+    
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("AsyncTracker's inner tracker failed; its writer thread has stopped") from self._error
+
+
+class MetricStore:
+    """
+    Step-indexed metric storage: per-metric typed arrays spilled to an append-only file.
+    
+    Each metric keeps an int64 step array and a float64 value array of spill_size
+    entries in memory; when they fill up (or on flush()) they are appended to the
+    file as one block of the form
+    
+        header (magic, name length, n, min step, max step) | name | n steps | n values
+    
+    so memory stays bounded and a write is one sequential append. Blocks are
+    columnar: range reads skip blocks by their step range and read each column
+    with one np.fromfile. Opening an existing file indexes its blocks, drops a
+    torn final block and continues appending. A metric logged without a step gets
+    the step after its previous one.
+    """
+    
+    MAGIC = b'MBLK'
+    HEADER = struct.Struct('<4sIIqq')
+    
+    def __init__(self, path: str, spill_size: int = 4096):
+        if spill_size < 1:
+            raise ValueError("spill_size must be at least 1")
+        self.path = path
+        self.spill_size = spill_size
+        # name -> [(values offset, n, min step, max step)]
+        self._blocks = {}
+        self._buffers = {}
+        self._next_step = {}
+        self._file = None
+        self._valid_size = self._index() if os.path.exists(path) else 0
+    
+    def append(self, name: str, value: Union[float, int], step: Optional[int] = None) -> None:
+        buffer = self._buffers.get(name)
+        if buffer is None:
+            buffer = self._buffers[name] = [np.empty(self.spill_size, np.int64),
+                                            np.empty(self.spill_size, np.float64), 0]
+        if step is None:
+            step = self._next_step.get(name, 0)
+        steps, values, n = buffer
+        steps[n] = step
+        values[n] = value
+        buffer[2] = n + 1
+        self._next_step[name] = step + 1
+        if n + 1 == self.spill_size:
+            self._spill(name)
+    
+    def flush(self) -> None:
+        """Append every non-empty buffer to the file."""
+        for name in list(self._buffers):
+            if self._buffers[name][2]:
+                self._spill(name)
+        if self._file is not None:
+            self._file.flush()
+    
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def names(self) -> List[str]:
+        return sorted(set(self._blocks) | {name for name, buffer in self._buffers.items() if buffer[2]})
+    
+    def read(self, name: str, start: Optional[int] = None, stop: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Steps and values of `name` with start <= step < stop, in logging order."""
+        low = -np.inf if start is None else start
+        high = np.inf if stop is None else stop
+        steps, values = [], []
+        if self._file is not None:
+            self._file.flush()
+        blocks = [block for block in self._blocks.get(name, []) if block[3] >= low and block[2] < high]
+        if blocks:
+            with open(self.path, 'rb') as f:
+                for offset, n, _, _ in blocks:
+                    f.seek(offset)
+                    steps.append(np.fromfile(f, dtype='<i8', count=n))
+                    values.append(np.fromfile(f, dtype='<f8', count=n))
+        buffer = self._buffers.get(name)
+        if buffer is not None and buffer[2]:
+            steps.append(buffer[0][:buffer[2]].copy())
+            values.append(buffer[1][:buffer[2]].copy())
+        if not steps:
+            return np.empty(0, np.int64), np.empty(0, np.float64)
+        steps = np.concatenate(steps)
+        values = np.concatenate(values)
+        if start is not None or stop is not None:
+            mask = (steps >= low) & (steps < high)
+            steps, values = steps[mask], values[mask]
+        return steps, values
+    
+    def downsample(self, name: str, max_points: int, start: Optional[int] = None, stop: Optional[int] = None,
+                   how: str = 'mean') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        At most max_points points of `name` over [start, stop).
+        
+        Consecutive entries are grouped into equal-count buckets, each reported at
+        its last step with the bucket's mean, min, max or last value (`how`).
+        """
+        if how not in ('mean', 'min', 'max', 'last'):
+            raise ValueError(f"Unknown downsampling method: {how}")
+        steps, values = self.read(name, start, stop)
+        if len(steps) <= max_points:
+            return steps, values
+        bounds = np.unique(np.linspace(0, len(steps), max_points + 1).astype(np.int64))
+        starts, ends = bounds[:-1], bounds[1:]
+        if how == 'mean':
+            reduced = np.add.reduceat(values, starts) / (ends - starts)
+        elif how == 'min':
+            reduced = np.minimum.reduceat(values, starts)
+        elif how == 'max':
+            reduced = np.maximum.reduceat(values, starts)
+        else:
+            reduced = values[ends - 1]
+        return steps[ends - 1], reduced
+    
+    def _spill(self, name: str) -> None:
+        steps, values, n = self._buffers[name]
+        encoded = name.encode('utf-8')
+        if self._file is None:
+            # Continue after the last complete block, dropping a torn one
+            self._file = open(self.path, 'r+b' if os.path.exists(self.path) else 'wb')
+            self._file.seek(self._valid_size)
+            self._file.truncate()
+        offset = self._file.tell() + self.HEADER.size + len(encoded)
+        step_min, step_max = int(steps[:n].min()), int(steps[:n].max())
+        self._file.write(self.HEADER.pack(self.MAGIC, len(encoded), n, step_min, step_max))
+        self._file.write(encoded)
+        self._file.write(steps[:n].astype('<i8', copy=False).tobytes())
+        self._file.write(values[:n].astype('<f8', copy=False).tobytes())
+        self._blocks.setdefault(name, []).append((offset, n, step_min, step_max))
+        self._buffers[name][2] = 0
+        # Where a reopened file continues after close()
+        self._valid_size = self._file.tell()
+    
+    def _index(self) -> int:
+        """Index the blocks of an existing file; returns the size of its complete blocks."""
+        size = os.path.getsize(self.path)
+        position = 0
+        with open(self.path, 'rb') as f:
+            while position + self.HEADER.size <= size:
+                f.seek(position)
+                magic, name_length, n, step_min, step_max = self.HEADER.unpack(f.read(self.HEADER.size))
+                end = position + self.HEADER.size + name_length + 16 * n
+                if magic != self.MAGIC or end > size:
+                    break
+                name = f.read(name_length).decode('utf-8')
+                self._blocks.setdefault(name, []).append((position + self.HEADER.size + name_length, n,
+                                                          step_min, step_max))
+                self._next_step[name] = max(self._next_step.get(name, 0), step_max + 1)
+                position = end
+        return position
+
+
+class LocalStoreTracker(Tracker):
+    """
+    Tracker that keeps metrics in a MetricStore at directory/metrics.bin.
+    
+    Params are merged into directory/params.json. The store is available as
+    .store for range reads and downsampling, during or after the run (a new
+    MetricStore on the same file reads a finished run). close(), or interpreter
+    exit, writes the buffered metrics and closes the file.
+    """
+    
+    def __init__(self, directory: str = "metrics", spill_size: int = 4096, **kwargs):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.store = MetricStore(os.path.join(directory, 'metrics.bin'), spill_size)
+        atexit.register(self.close)
+    
+    def log_metric(self, name: str, value: Union[float, int], step: Optional[int] = None) -> None:
+        self.store.append(name, value, step)
+    
+    def log_metrics(self, metrics: Dict[str, Union[float, int]], step: Optional[int] = None) -> None:
+        for name, value in metrics.items():
+            self.store.append(name, value, step)
+    
+    def log_params(self, params: Dict[str, Any]) -> None:
+        path = os.path.join(self.directory, 'params.json')
+        merged = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                merged = json.load(f)
+        merged.update({key: value if isinstance(value, (int, float, str, bool)) or value is None else str(value)
+                       for key, value in params.items()})
+        with open(path, 'w') as f:
+            json.dump(merged, f, indent=2)
+    
+    def flush(self) -> None:
+        self.store.flush()
+    
+    def close(self) -> None:
+        """Write the buffered metrics and close the store's file."""
+        atexit.unregister(self.close)
+        self.store.close()
\ No newline at end of file
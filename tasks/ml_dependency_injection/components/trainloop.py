@@ -1,18 +1,54 @@
 from abc import ABC, abstractmethod
+import multiprocessing
+from multiprocessing import shared_memory
+import queue
+import threading
+import warnings
+import time
 import numpy as np
-from typing import Dict, Any, List, Tuple, Optional, Union
+from typing import Dict, Any, List, Tuple, Optional, Union, Iterator, Callable
 from core.factory import Factory
 from components.dataloader import DataLoader
-from components.preprocessor import Preprocessor
+from components.preprocessor import Preprocessor, AffinePreprocessor
 from components.model import Model
 from components.optimizer import Optimizer
 from components.metricfunction import MetricFunction
 from components.tracker import Tracker
+from components.batchiterator import BatchIterator, SynchronousBatchIterator, _put_unless_stopped
+from components.sampler import Sampler, RandomSampler
+from components.scheduler import Scheduler
+
+
+# A single metric, per-model metrics of a batched model, or a MetricSuite's {name: value}
+MetricValue = Union[float, np.ndarray, Dict[str, Any]]
 
 
 @Factory.register_component_type
 class TrainLoop(ABC):
-    """Base class for training loops."""
+    """
+    Base class for training loops.
+    
+    Epoch metrics are accumulated with the metric function's update() from the
+    predictions the training steps already make, so they describe the model as it
+    trained through the epoch and cost no extra pass.
+    
+    A separate evaluation pass runs every eval_every epochs (and after the last one)
+    on a validation set: a held-out validation_fraction of the loaded data, or the
+    data of validation_loader (a DataLoader or its config). Without a validation set,
+    setting max_eval_samples evaluates on the training data instead. Evaluation is
+    capped at max_eval_samples samples (a fixed subset) and logged as eval_metric.
+    
+    Per-epoch metrics are logged under fixed names with the epoch as their step.
+    
+    With early_stopping_patience set, training stops once the evaluation metric (or
+    the training metric if there is no evaluation) has not improved by more than
+    early_stopping_min_delta for that many evaluations, and the best parameters are
+    restored if restore_best. For a MetricSuite the first metric is monitored; r2 is
+    maximized, everything else minimized.
+    
+    An optional scheduler is stepped after every optimizer step and at the end of
+    every epoch, where it also receives the monitored score.
+    """
     
     def __init__(self, 
                  dataloader: DataLoader,
@@ -21,19 +57,243 @@ class TrainLoop(ABC):
                  tracker: Tracker,
                  metricfunction: MetricFunction,
                  preprocessor: Optional[Preprocessor] = None,
+                 batchiterator: Optional[BatchIterator] = None,
+                 sampler: Optional[Sampler] = None,
+                 max_eval_samples: Optional[int] = None,
+                 scheduler: Optional[Scheduler] = None,
+                 eval_every: int = 1,
+                 validation_fraction: float = 0.0,
+                 validation_loader: Optional[Union[DataLoader, Dict[str, Any]]] = None,
+                 early_stopping_patience: Optional[int] = None,
+                 early_stopping_min_delta: float = 0.0,
+                 restore_best: bool = True,
                  **kwargs):
+        if eval_every < 1:
+            raise ValueError("eval_every must be at least 1")
+        if not 0.0 <= validation_fraction < 1.0:
+            raise ValueError("validation_fraction must be in [0, 1)")
+        if validation_fraction and validation_loader is not None:
+            raise ValueError("Use either validation_fraction or validation_loader, not both")
+        if isinstance(validation_loader, dict):
+            validation_loader = DataLoader.create({'dataloader': validation_loader})
         self.dataloader = dataloader
         self.model = model
         self.optimizer = optimizer
         self.tracker = tracker
         self.metric_function = metricfunction
         self.preprocessor = preprocessor
+        self.batch_iterator = batchiterator or SynchronousBatchIterator()
+        self.sampler = sampler or RandomSampler()
+        self.max_eval_samples = max_eval_samples
+        self.scheduler = scheduler
+        self.eval_every = eval_every
+        self.validation_fraction = validation_fraction
+        self.validation_loader = validation_loader
+        self.early_stopping_patience = early_stopping_patience
+        self.early_stopping_min_delta = early_stopping_min_delta
+        self.restore_best = restore_best
+        self.stopped_epoch = None
     
     @abstractmethod
     def execute(self) -> None:
         """Execute the training loop."""
         pass
     
+    def _iter_training_chunks(self, chunk_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Stream preprocessed (X, y) chunks from the dataloader."""
+        for X, y in self.dataloader.iter_chunks(chunk_size):
+            if self.preprocessor:
+                X = self.preprocessor.transform(X)
+            yield X, y
+    
+    def _fit_preprocessor_streaming(self, chunk_size: int) -> int:
+        """
+        Fit the preprocessor from the chunks and return the input dimension.
+        
+        This takes the passes the preprocessor's fit_chunks needs (one for the
+        normalizers, one per step for a PreprocessorPipeline).
+        """
+        input_dim = None
+        
+        def chunks() -> Iterator[np.ndarray]:
+            nonlocal input_dim
+            for X, _ in self.dataloader.iter_chunks(chunk_size):
+                input_dim = X.shape[1]
+                yield X
+        
+        if not self.preprocessor:
+            next(chunks(), None)
+        else:
+            try:
+                self.preprocessor.fit_chunks(chunks)
+            except NotImplementedError as e:
+                # Without incremental fitting the first chunk stands in for the dataset
+                warnings.warn(f"{e}; fitting it on the first chunk of {chunk_size} rows only", stacklevel=2)
+                first = next(chunks(), None)
+                if first is not None:
+                    self.preprocessor.fit(first)
+        
+        if input_dim is None:
+            raise ValueError("DataLoader produced no data")
+        return input_dim
+    
+    def _calculate_metric(self, y: np.ndarray, y_pred: np.ndarray) -> MetricValue:
+        return self.metric_function.calculate(y, y_pred)
+    
+    def _metric_items(self, value: MetricValue, name: str) -> Dict[str, Any]:
+        """
+        Tracker entries for a metric value under `name`.
+        
+        A MetricSuite result gives one entry per metric, named by replacing 'metric'
+        in `name` with the metric's name (eval_metric -> eval_mae, ...).
+        """
+        if isinstance(value, dict):
+            return {name.replace('metric', key, 1): item for key, item in value.items()}
+        return {name: value}
+    
+    def _format_metric(self, value: MetricValue) -> str:
+        if isinstance(value, dict):
+            return ", ".join(f"{key} = {item:.4f}" for key, item in value.items())
+        return f"Metric = {value:.4f}"
+    
+    def _track_batch(self, y: np.ndarray, y_pred: np.ndarray) -> None:
+        """Add a training batch's predictions to the epoch metric."""
+        self.metric_function.update(y, y_pred)
+    
+    def _load_training_arrays(self) -> Tuple[np.ndarray, np.ndarray, Optional[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Load (X, y) and the validation set, fit the preprocessor and transform both.
+        
+        The preprocessor is fitted on the training part only.
+        """
+        X, y = self.dataloader.load_arrays()
+        validation = None
+        if self.validation_loader is not None:
+            validation = self.validation_loader.load_arrays()
+        elif self.validation_fraction:
+            # A separate generator keeps the training RNG (and so seeded runs) unaffected
+            order = np.random.default_rng(0).permutation(len(y))
+            n_validation = int(round(len(y) * self.validation_fraction))
+            if not 0 < n_validation < len(y):
+                raise ValueError(f"validation_fraction {self.validation_fraction} leaves no training or validation data")
+            held_out, kept = np.sort(order[:n_validation]), np.sort(order[n_validation:])
+            validation = (X[held_out], y[held_out])
+            X, y = X[kept], y[kept]
+        
+        if self.preprocessor:
+            X = self.preprocessor.fit_transform(X)
+            if validation is not None:
+                validation = (self.preprocessor.transform(validation[0]), validation[1])
+        return X, y, validation
+    
+    def _evaluates(self) -> bool:
+        return self.validation_fraction > 0 or self.validation_loader is not None or self.max_eval_samples is not None
+    
+    def _evaluate_arrays(self, X: np.ndarray, y: np.ndarray,
+                         validation: Optional[Tuple[np.ndarray, np.ndarray]]) -> MetricValue:
+        """Metric on the validation set, or the training data, capped at a fixed subset of max_eval_samples."""
+        if validation is not None:
+            X, y = validation
+        if self.max_eval_samples is not None and self.max_eval_samples < len(y):
+            subset = np.sort(np.random.default_rng(0).choice(len(y), size=self.max_eval_samples, replace=False))
+            X, y = X[subset], y[subset]
+        return self._calculate_metric(y, self.model.predict(X))
+    
+    def _evaluate_chunks(self, chunk_size: int) -> MetricValue:
+        """Streaming evaluation on validation_loader, or the training data, over at most max_eval_samples samples."""
+        if self.validation_loader is None:
+            return self._evaluate_streaming(chunk_size, self.max_eval_samples)
+        
+        chunks = self.validation_loader.iter_chunks(chunk_size)
+        if self.preprocessor:
+            chunks = ((self.preprocessor.transform(X), y) for X, y in chunks)
+        return self._evaluate_streaming(chunk_size, self.max_eval_samples, chunks)
+    
+    def _evaluate_streaming(self, chunk_size: int, max_samples: Optional[int] = None,
+                            chunks: Optional[Iterator[Tuple[np.ndarray, np.ndarray]]] = None) -> MetricValue:
+        """Accumulate the metric chunk by chunk (training chunks by default), over at most max_samples samples."""
+        if chunks is None:
+            chunks = self._iter_training_chunks(chunk_size)
+        self.metric_function.reset()
+        n_samples = 0
+        for X, y in chunks:
+            if max_samples is not None:
+                X, y = X[:max_samples - n_samples], y[:max_samples - n_samples]
+            self.metric_function.update(y, self.model.predict(X))
+            n_samples += len(y)
+            if max_samples is not None and n_samples >= max_samples:
+                break
+        return self.metric_function.compute()
+    
+    def _run_epochs(self, epochs: int, train_epoch: Callable[[], float],
+                    evaluate: Callable[[], MetricValue], steps_per_epoch: Optional[int] = None) -> None:
+        """
+        Run the epochs with evaluation cadence, learning-rate schedule and early stopping.
+        
+        train_epoch runs one epoch and returns its mean loss; evaluate runs an
+        evaluation pass. Each epoch is handed to _log_epoch. steps_per_epoch is the
+        scheduler's estimate for the first epoch.
+        """
+        evaluates = self._evaluates()
+        best_score = None
+        best_params = None
+        stale = 0
+        self.stopped_epoch = None
+        if self.scheduler:
+            self.scheduler.start(epochs, steps_per_epoch)
+        
+        for epoch in range(epochs):
+            self.metric_function.reset()
+            epoch_loss = train_epoch()
+            metric_value = self.metric_function.compute()
+            
+            eval_value = None
+            if evaluates and ((epoch + 1) % self.eval_every == 0 or epoch == epochs - 1):
+                eval_value = evaluate()
+            
+            self._log_epoch(epoch, epoch_loss, metric_value, eval_value)
+            
+            monitored = eval_value if evaluates else metric_value
+            score = self._monitored_score(monitored) if monitored is not None else None
+            if self.scheduler:
+                self.tracker.log_metric('lr_scale', self.optimizer.lr_scale, epoch)
+                self.scheduler.end_epoch(score)
+            if self.early_stopping_patience is None or score is None:
+                continue
+            if best_score is None or score < best_score - self.early_stopping_min_delta:
+                best_score = score
+                stale = 0
+                if self.restore_best:
+                    best_params = [np.copy(param) for param in self.model.get_params()]
+            else:
+                stale += 1
+                if stale >= self.early_stopping_patience:
+                    self.stopped_epoch = epoch
+                    self.tracker.log_metric('stopped_epoch', epoch)
+                    print(f"Early stopping at epoch {epoch}: no improvement in {stale} evaluations")
+                    break
+        
+        if best_params is not None:
+            self.model.set_params(best_params)
+        self.tracker.flush()
+    
+    def _monitored_score(self, value: MetricValue) -> float:
+        """Early stopping score, lower is better: the primary suite metric, best model of a batched model."""
+        sign = 1.0
+        if isinstance(value, dict):
+            primary = getattr(self.metric_function, 'primary', next(iter(value)))
+            sign = -1.0 if primary == 'r2' else 1.0
+            value = value[primary]
+        return float(np.min(sign * np.asarray(value)))
+    
+    def _log_data_wait(self, epoch: int) -> None:
+        """Log the batch iterator's data wait this epoch, and its starved batches if it prefetches."""
+        metrics = {'data_wait_seconds': self.batch_iterator.wait_time}
+        if self.batch_iterator.prefetches:
+            metrics['data_starved_batches'] = self.batch_iterator.starved_batches
+        self.tracker.log_metrics(metrics, epoch)
+        self.batch_iterator.reset_stats()
+    
     @classmethod
     def create(cls, config: Union[str, Dict[str, Any]]):
         """Factory method to create a TrainLoop instance."""
@@ -53,21 +313,28 @@ class StandardTrainLoop(TrainLoop):
                  tracker: Tracker,
                  metricfunction: MetricFunction,
                  preprocessor: Optional[Preprocessor] = None,
+                 batchiterator: Optional[BatchIterator] = None,
+                 sampler: Optional[Sampler] = None,
+                 scheduler: Optional[Scheduler] = None,
+                 max_eval_samples: Optional[int] = None,
                  epochs: int = 100,
                  batch_size: int = 32,
+                 chunk_size: Optional[int] = None,
                  **kwargs):
-        super().__init__(dataloader, model, optimizer, tracker, metricfunction, preprocessor)
+        super().__init__(dataloader, model, optimizer, tracker, metricfunction, preprocessor, batchiterator, sampler,
+                         max_eval_samples, scheduler, **kwargs)
+        if chunk_size and self.validation_fraction:
+            raise ValueError("validation_fraction needs in-memory training; use validation_loader with chunk_size")
         self.epochs = epochs
         self.batch_size = batch_size
+        self.chunk_size = chunk_size
     
     def execute(self) -> None:
-        data = self.dataloader.load_data()
+        if self.chunk_size:
+            self._execute_streaming()
+            return
         
-        X = data.iloc[:, :-1].values
-        y = data.iloc[:, -1].values
-        
-        if self.preprocessor:
-            X = self.preprocessor.fit_transform(X)
+        X, y, validation = self._load_training_arrays()
         
         self.tracker.log_params({
             'epochs': self.epochs,
@@ -76,40 +343,375 @@ class StandardTrainLoop(TrainLoop):
         })
         
         n_samples = X.shape[0]
-        n_batches = (n_samples + self.batch_size - 1) // self.batch_size
         
-        for epoch in range(self.epochs):
-            indices = np.random.permutation(n_samples)
-            X_shuffled = X[indices]
-            y_shuffled = y[indices]
-            
-            epoch_loss = 0.0
+        self._run_epochs(self.epochs,
+                         lambda: self._train_on_array(X, y) / n_samples,
+                         lambda: self._evaluate_arrays(X, y, validation),
+                         -(-n_samples // self.batch_size))
+    
+    def _execute_streaming(self) -> None:
+        """Train from dataloader chunks so memory is bounded by chunk_size."""
+        input_dim = self._fit_preprocessor_streaming(self.chunk_size)
+        
+        self.tracker.log_params({
+            'epochs': self.epochs,
+            'batch_size': self.batch_size,
+            'chunk_size': self.chunk_size,
+            'input_dim': input_dim
+        })
+        
+        self._run_epochs(self.epochs, self._train_on_chunks, lambda: self._evaluate_chunks(self.chunk_size))
+    
+    def _train_on_chunks(self) -> float:
+        """Run one epoch over the dataloader chunks and return the mean loss."""
+        epoch_loss = 0.0
+        n_samples = 0
+        
+        # The sampler orders samples within each chunk, chunks arrive in file order
+        for X, y in self._iter_training_chunks(self.chunk_size):
+            epoch_loss += self._train_on_array(X, y)
+            n_samples += len(y)
+        
+        return epoch_loss / n_samples
+    
+    def _train_on_array(self, X: np.ndarray, y: np.ndarray) -> float:
+        """Run one pass of minibatch steps over the sampler's batches and return the summed loss."""
+        n_samples = X.shape[0]
+        
+        batches = self.sampler.batches(n_samples, self.batch_size)
+        
+        total_loss = 0.0
+        
+        for X_batch, y_batch in self.batch_iterator.iterate(X, y, batches):
+            loss, gradients, y_pred = self.model.forward_backward(X_batch, y_batch)
+            self._track_batch(y_batch, y_pred)
             
-            for batch in range(n_batches):
-                start_idx = batch * self.batch_size
-                end_idx = min((batch + 1) * self.batch_size, n_samples)
-                
-                X_batch = X_shuffled[start_idx:end_idx]
-                y_batch = y_shuffled[start_idx:end_idx]
-                
-                loss = self.model.compute_loss(X_batch, y_batch)
-                gradients = self.model.compute_gradients(X_batch, y_batch)
-                
-                self.optimizer.step(gradients)
-                
-                epoch_loss += loss * (end_idx - start_idx)
+            self.optimizer.step(gradients)
+            if self.scheduler:
+                self.scheduler.step()
             
-            epoch_loss /= n_samples
+            total_loss += loss * len(y_batch)
+        
+        return total_loss
+    
+    def _log_epoch(self, epoch: int, epoch_loss: float, metric_value: MetricValue,
+                   eval_value: Optional[MetricValue] = None) -> None:
+        metrics = {'loss': epoch_loss, **self._metric_items(metric_value, 'metric')}
+        if eval_value is not None:
+            metrics.update(self._metric_items(eval_value, 'eval_metric'))
+        self.tracker.log_metrics(metrics, epoch)
+        self._log_data_wait(epoch)
+        
+        if epoch % 10 == 0:
+            self.tracker.log_metric('epoch', epoch)
+            print(f"Epoch {epoch}/{self.epochs}: Loss = {epoch_loss:.4f}, {self._format_metric(metric_value)}")
+
+
+class SweepTrainLoop(StandardTrainLoop):
+    """
+    Batch training loop for a batched model such as BatchedLinearModel.
+    
+    All K models share the data loading, preprocessing, shuffling and minibatches;
+    losses and metrics are logged per model. The metric function must score (n, K)
+    predictions per model, as MAE, MSE and MetricSuite do.
+    """
+    
+    def execute(self) -> None:
+        self.tracker.log_params({'n_models': getattr(self.model, 'n_models', 1)})
+        super().execute()
+    
+    def _log_epoch(self, epoch: int, epoch_loss: np.ndarray, metric_value: MetricValue,
+                   eval_value: Optional[MetricValue] = None) -> None:
+        metrics = {}
+        for k, loss in enumerate(epoch_loss):
+            metrics[f'model_{k}_loss'] = loss
+            metrics.update(self._metric_items(self._model_metric(metric_value, k), f'model_{k}_metric'))
+            if eval_value is not None:
+                metrics.update(self._metric_items(self._model_metric(eval_value, k), f'model_{k}_eval_metric'))
+        self.tracker.log_metrics(metrics, epoch)
+        self._log_data_wait(epoch)
+        
+        if epoch % 10 == 0:
+            self.tracker.log_metric('epoch', epoch)
+            best = int(np.argmin(epoch_loss))
+            print(f"Epoch {epoch}/{self.epochs}: best model {best}, "
+                  f"Loss = {epoch_loss[best]:.4f}, {self._format_metric(self._model_metric(metric_value, best))}")
+    
+    @staticmethod
+    def _model_metric(metric_value: MetricValue, k: int) -> MetricValue:
+        if isinstance(metric_value, dict):
+            return {key: item[k] for key, item in metric_value.items()}
+        return metric_value[k]
+
+
+def _create_shared(shape: Tuple[int, ...], dtype: Any) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Allocate a zeroed array in a new shared memory block."""
+    dtype = np.dtype(dtype)
+    size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    array.fill(0)
+    return block, array
+
+
+def _attach_shared(spec: Tuple[str, Tuple[int, ...], str]) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Attach to a block created by _create_shared, given its (name, shape, dtype) spec."""
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _flatten(arrays: List[np.ndarray], out: np.ndarray) -> np.ndarray:
+    return np.concatenate([np.ravel(array) for array in arrays], out=out)
+
+
+def _unflatten(flat: np.ndarray, shapes: List[Tuple[int, ...]]) -> List[np.ndarray]:
+    arrays = []
+    start = 0
+    for shape in shapes:
+        size = int(np.prod(shape))
+        arrays.append(flat[start:start + size].reshape(shape))
+        start += size
+    return arrays
+
+
+def _data_parallel_worker(rank: int,
+                          num_workers: int,
+                          specs: Dict[str, Tuple[str, Tuple[int, ...], str]],
+                          model_source: Union[Dict[str, Any], Model],
+                          start: Any,
+                          done: Any) -> None:
+    """Entry point of a DataParallelTrainLoop worker process."""
+    blocks = {}
+    arrays = {}
+    try:
+        for name, spec in specs.items():
+            blocks[name], arrays[name] = _attach_shared(spec)
+        if isinstance(model_source, dict):
+            model = Model.create({'model': model_source})
+        else:
+            model = model_source
+        _data_parallel_steps(rank, num_workers, arrays, model, start, done)
+    except BaseException:
+        # Release the parent instead of leaving it blocked on the barriers
+        start.abort()
+        done.abort()
+        raise
+    
+    arrays.clear()
+    for block in blocks.values():
+        block.close()
+
+
+def _data_parallel_steps(rank: int, num_workers: int, arrays: Dict[str, np.ndarray],
+                         model: Model, start: Any, done: Any) -> None:
+    """
+    Serve global batches until the parent sets the stop flag.
+    
+    For each batch the worker computes the gradients of its contiguous slice at the
+    current parameters and writes them, scaled by the slice size, into its row of the
+    shared gradient buffer; its predictions go to the slice's rows of the shared
+    prediction buffer for the parent's epoch metric.
+    """
+    X, y = arrays['X'], arrays['y']
+    indices, control = arrays['indices'], arrays['control']
+    params, grad_sums, loss_sums = arrays['params'], arrays['grad_sums'], arrays['loss_sums']
+    predictions = arrays['predictions']
+    shapes = [np.shape(param) for param in model.get_params()]
+    
+    while True:
+        start.wait()
+        if control[1]:
+            return
+        
+        batch_len = int(control[0])
+        lo = batch_len * rank // num_workers
+        hi = batch_len * (rank + 1) // num_workers
+        if hi > lo:
+            batch = indices[lo:hi]
+            model.set_params(_unflatten(params, shapes))
+            loss, gradients, y_pred = model.forward_backward(X[batch], y[batch])
+            predictions[lo:hi] = y_pred
+            _flatten(gradients, grad_sums[rank])
+            grad_sums[rank] *= hi - lo
+            loss_sums[rank] = np.multiply(loss, hi - lo)
+        else:
+            grad_sums[rank] = 0.0
+            loss_sums[rank] = 0.0
+        
+        done.wait()
+
+
+class DataParallelTrainLoop(StandardTrainLoop):
+    """
+    Synchronous data-parallel minibatch training over worker processes.
+    
+    The preprocessed X and y are copied once into shared memory. For every global batch
+    the parent publishes the batch indices and current parameters, each of the
+    num_workers processes computes the gradients of its slice of the batch, and the
+    parent averages them and takes one optimizer step. Batches come from the parent's
+    sampler, so for a fixed seed the parameters match StandardTrainLoop up to
+    floating point summation order.
+    
+    Workers build their model with Model.create from model_config (the `model` section
+    of the DI config, e.g. via a YAML anchor); without it they get a pickled copy of
+    the model. A worker that fails or stays silent for worker_timeout seconds makes
+    execute() raise RuntimeError. Throughput is logged as samples_per_second.
+    """
+    
+    def __init__(self, 
+                 dataloader: DataLoader,
+                 model: Model,
+                 optimizer: Optimizer,
+                 tracker: Tracker,
+                 metricfunction: MetricFunction,
+                 preprocessor: Optional[Preprocessor] = None,
+                 batchiterator: Optional[BatchIterator] = None,
+                 sampler: Optional[Sampler] = None,
+                 scheduler: Optional[Scheduler] = None,
+                 max_eval_samples: Optional[int] = None,
+                 epochs: int = 100,
+                 batch_size: int = 32,
+                 num_workers: int = 2,
+                 model_config: Optional[Dict[str, Any]] = None,
+                 start_method: Optional[str] = None,
+                 worker_timeout: float = 60.0,
+                 **kwargs):
+        super().__init__(dataloader, model, optimizer, tracker, metricfunction, preprocessor, batchiterator, sampler,
+                         max_eval_samples, scheduler, epochs=epochs, batch_size=batch_size, **kwargs)
+        if kwargs.get('chunk_size'):
+            raise ValueError("DataParallelTrainLoop keeps the whole dataset in shared memory; chunk_size is not supported")
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        self.num_workers = num_workers
+        self.model_config = model_config
+        self.start_method = start_method
+        self.worker_timeout = worker_timeout
+        self.samples_per_second = None
+        self._blocks = []
+        self._shared = {}
+        self._workers = []
+    
+    def execute(self) -> None:
+        X, y, validation = self._load_training_arrays()
+        
+        self.tracker.log_params({
+            'epochs': self.epochs,
+            'batch_size': self.batch_size,
+            'num_workers': self.num_workers,
+            'input_dim': X.shape[1]
+        })
+        
+        n_samples = X.shape[0]
+        
+        def train_epoch() -> float:
+            start = time.perf_counter()
+            epoch_loss = self._train_on_array(X, y) / n_samples
+            self.samples_per_second = n_samples / (time.perf_counter() - start)
+            return epoch_loss
+        
+        try:
+            self._start_workers(X, y)
+            self._run_epochs(self.epochs, train_epoch, lambda: self._evaluate_arrays(X, y, validation),
+                             -(-n_samples // self.batch_size))
+        finally:
+            self._stop_workers()
+    
+    def _train_on_array(self, X: np.ndarray, y: np.ndarray) -> float:
+        """Run one pass of synchronous data-parallel steps and return the summed loss."""
+        n_samples = X.shape[0]
+        shared = self._shared
+        shapes = [np.shape(param) for param in self.model.get_params()]
+        
+        total_loss = 0.0
+        
+        for batch in self.sampler.batches(n_samples, self.batch_size):
+            if isinstance(batch, slice):
+                batch = np.arange(*batch.indices(n_samples))
+            shared['indices'][:len(batch)] = batch
+            shared['control'][0] = len(batch)
+            _flatten(self.model.get_params(), shared['params'])
             
-            y_pred = self.model.predict(X)
-            metric_value = self.metric_function.calculate(y, y_pred)
+            self._sync(self._start)
+            self._sync(self._done)
             
-            self.tracker.log_metric(f'loss_epoch_{epoch}', epoch_loss)
-            self.tracker.log_metric(f'metric_epoch_{epoch}', metric_value)
+            np.sum(shared['grad_sums'], axis=0, out=self._gradient)
+            self._gradient /= len(batch)
+            self.optimizer.step(_unflatten(self._gradient, shapes))
+            if self.scheduler:
+                self.scheduler.step()
             
-            if epoch % 10 == 0:
-                self.tracker.log_metric('epoch', epoch)
-                print(f"Epoch {epoch}/{self.epochs}: Loss = {epoch_loss:.4f}, Metric = {metric_value:.4f}")
+            total_loss += shared['loss_sums'].sum(axis=0)
+            self._track_batch(y[batch], shared['predictions'][:len(batch)])
+        
+        return total_loss
+    
+    def _log_epoch(self, epoch: int, epoch_loss: float, metric_value: MetricValue,
+                   eval_value: Optional[MetricValue] = None) -> None:
+        self.tracker.log_metric('samples_per_second', self.samples_per_second, epoch)
+        super()._log_epoch(epoch, epoch_loss, metric_value, eval_value)
+    
+    def _sync(self, barrier: Any) -> None:
+        try:
+            barrier.wait(timeout=self.worker_timeout)
+        except threading.BrokenBarrierError:
+            raise RuntimeError("Data-parallel step failed: a worker raised an error or did not respond "
+                               f"within {self.worker_timeout}s") from None
+    
+    def _start_workers(self, X: np.ndarray, y: np.ndarray) -> None:
+        # One probe step gives the gradient layout and the loss and prediction shapes
+        # (per model for batched models)
+        loss, gradients, y_pred = self.model.forward_backward(X[:1], y[:1])
+        n_params = sum(np.size(grad) for grad in gradients)
+        
+        layout = {
+            'X': (X.shape, X.dtype),
+            'y': (y.shape, y.dtype),
+            'indices': ((self.batch_size,), np.int64),
+            'control': ((2,), np.int64),
+            'params': ((n_params,), np.float64),
+            'grad_sums': ((self.num_workers, n_params), np.float64),
+            'loss_sums': ((self.num_workers,) + np.shape(loss), np.float64),
+            'predictions': ((self.batch_size,) + np.shape(y_pred)[1:], np.float64)
+        }
+        specs = {}
+        for name, (shape, dtype) in layout.items():
+            block, array = _create_shared(shape, dtype)
+            self._blocks.append(block)
+            self._shared[name] = array
+            specs[name] = (block.name, shape, np.dtype(dtype).str)
+        self._shared['X'][...] = X
+        self._shared['y'][...] = y
+        self._gradient = np.empty(n_params)
+        
+        context = multiprocessing.get_context(self.start_method)
+        self._start = context.Barrier(self.num_workers + 1)
+        self._done = context.Barrier(self.num_workers + 1)
+        model_source = self.model_config if self.model_config is not None else self.model
+        for rank in range(self.num_workers):
+            worker = context.Process(target=_data_parallel_worker,
+                                     args=(rank, self.num_workers, specs, model_source, self._start, self._done),
+                                     daemon=True)
+            worker.start()
+            self._workers.append(worker)
+    
+    def _stop_workers(self) -> None:
+        if self._workers:
+            self._shared['control'][1] = 1
+            try:
+                self._start.wait(timeout=10)
+            except threading.BrokenBarrierError:
+                pass
+            for worker in self._workers:
+                worker.join(timeout=10)
+                if worker.is_alive():
+                    worker.terminate()
+        self._workers = []
+        self._shared = {}
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
 
 
 class OnlineLearningTrainLoop(TrainLoop):
@@ -122,19 +724,27 @@ class OnlineLearningTrainLoop(TrainLoop):
                  tracker: Tracker,
                  metricfunction: MetricFunction,
                  preprocessor: Optional[Preprocessor] = None,
+                 batchiterator: Optional[BatchIterator] = None,
+                 sampler: Optional[Sampler] = None,
+                 scheduler: Optional[Scheduler] = None,
+                 max_eval_samples: Optional[int] = None,
                  epochs: int = 1,
+                 chunk_size: Optional[int] = None,
                  **kwargs):
-        super().__init__(dataloader, model, optimizer, tracker, metricfunction, preprocessor)
+        super().__init__(dataloader, model, optimizer, tracker, metricfunction, preprocessor, batchiterator, sampler,
+                         max_eval_samples, scheduler, **kwargs)
+        if chunk_size and self.validation_fraction:
+            raise ValueError("validation_fraction needs in-memory training; use validation_loader with chunk_size")
         self.epochs = epochs
+        self.chunk_size = chunk_size
+        self.samples_trained = 0
     
     def execute(self) -> None:
-        data = self.dataloader.load_data()
+        if self.chunk_size:
+            self._execute_streaming()
+            return
         
-        X = data.iloc[:, :-1].values
-        y = data.iloc[:, -1].values
-        
-        if self.preprocessor:
-            X = self.preprocessor.fit_transform(X)
+        X, y, validation = self._load_training_arrays()
         
         self.tracker.log_params({
             'epochs': self.epochs,
@@ -144,34 +754,432 @@ class OnlineLearningTrainLoop(TrainLoop):
         
         n_samples = X.shape[0]
         
-        for epoch in range(self.epochs):
-            indices = np.random.permutation(n_samples)
-            X_shuffled = X[indices]
-            y_shuffled = y[indices]
+        self._run_epochs(self.epochs,
+                         lambda: self._train_on_array(X, y) / n_samples,
+                         lambda: self._evaluate_arrays(X, y, validation),
+                         n_samples)
+    
+    def _execute_streaming(self) -> None:
+        """Train from dataloader chunks so memory is bounded by chunk_size."""
+        input_dim = self._fit_preprocessor_streaming(self.chunk_size)
+        
+        self.tracker.log_params({
+            'epochs': self.epochs,
+            'chunk_size': self.chunk_size,
+            'input_dim': input_dim,
+            'training_mode': 'online'
+        })
+        
+        self._run_epochs(self.epochs, self._train_on_chunks, lambda: self._evaluate_chunks(self.chunk_size))
+    
+    def _train_on_chunks(self) -> float:
+        """Run one epoch over the dataloader chunks and return the mean loss."""
+        epoch_loss = 0.0
+        n_samples = 0
+        
+        for X, y in self._iter_training_chunks(self.chunk_size):
+            epoch_loss += self._train_on_array(X, y)
+            n_samples += len(y)
+        
+        return epoch_loss / n_samples
+    
+    def _train_on_array(self, X: np.ndarray, y: np.ndarray) -> float:
+        """
+        Take one step per sample in sampler order and return the summed loss.
+        
+        Every 1000th sample's loss is logged as sample_loss, with the number of
+        samples trained on so far as its step.
+        """
+        n_samples = X.shape[0]
+        
+        samples = self.sampler.batches(n_samples, 1)
+        
+        total_loss = 0.0
+        
+        for X_sample, y_sample in self.batch_iterator.iterate(X, y, samples):
+            loss, gradients, y_pred = self.model.forward_backward(X_sample, y_sample)
+            self._track_batch(y_sample, y_pred)
+            
+            self.optimizer.step(gradients)
+            if self.scheduler:
+                self.scheduler.step()
             
-            epoch_loss = 0.0
+            total_loss += loss
             
-            for i in range(n_samples):
-                X_sample = X_shuffled[i:i+1]
-                y_sample = y_shuffled[i:i+1]
+            self.samples_trained += 1
+            if self.samples_trained % 1000 == 0:
+                self.tracker.log_metric('sample_loss', loss, self.samples_trained)
+        
+        return total_loss
+    
+    def _log_epoch(self, epoch: int, epoch_loss: float, metric_value: MetricValue,
+                   eval_value: Optional[MetricValue] = None) -> None:
+        metrics = {'loss': epoch_loss, **self._metric_items(metric_value, 'metric')}
+        if eval_value is not None:
+            metrics.update(self._metric_items(eval_value, 'eval_metric'))
+        self.tracker.log_metrics(metrics, epoch)
+        self._log_data_wait(epoch)
+        
+        self.tracker.log_metric('epoch', epoch)
+        print(f"Epoch {epoch}/{self.epochs}: Loss = {epoch_loss:.4f}, {self._format_metric(metric_value)}")
+
+
+class StreamingOnlineTrainLoop(TrainLoop):
+    """
+    Online training on an unbounded stream, such as a StreamDataLoader.
+    
+    A reader thread pulls chunks from the dataloader into a bounded queue. Arriving
+    samples are packed into a preallocated micro-batch that is trained on as soon as it
+    holds max_batch_size samples or its oldest sample has waited max_latency seconds,
+    so memory stays constant however long the stream runs. Each micro-batch takes one
+    vectorized optimizer step, or with per_sample=True one step per sample over views
+    of the micro-batch. Loss and metric are prequential: every sample is scored before
+    the model trains on it. A preprocessor is updated with partial_fit on each
+    micro-batch before transforming it (or fitted on the first micro-batch if it
+    cannot fit incrementally).
+    
+    Every log_every samples the loop logs the window's loss, metric, ingest rate in
+    samples/sec and update latency (from the arrival of a micro-batch's oldest sample
+    to the end of its update). The stream is consumed until it ends or max_samples
+    samples have been trained on.
+    
+    A scheduler counts each window of log_every samples as an epoch: it is stepped
+    after every micro-batch and ends an epoch with the window's metric, and the run
+    lasts max_samples / log_every epochs. Without max_samples the stream has no
+    length, so schedules that need one (cosine, one-cycle) must set `epochs`.
+    """
+    
+    def __init__(self, 
+                 dataloader: DataLoader,
+                 model: Model,
+                 optimizer: Optimizer,
+                 tracker: Tracker,
+                 metricfunction: MetricFunction,
+                 preprocessor: Optional[Preprocessor] = None,
+                 batchiterator: Optional[BatchIterator] = None,
+                 sampler: Optional[Sampler] = None,
+                 max_eval_samples: Optional[int] = None,
+                 scheduler: Optional[Scheduler] = None,
+                 max_batch_size: int = 64,
+                 max_latency: float = 0.05,
+                 per_sample: bool = False,
+                 queue_size: int = 16,
+                 max_samples: Optional[int] = None,
+                 log_every: int = 1000,
+                 **kwargs):
+        super().__init__(dataloader, model, optimizer, tracker, metricfunction, preprocessor, batchiterator, sampler,
+                         max_eval_samples, scheduler, **kwargs)
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.per_sample = per_sample
+        self.queue_size = queue_size
+        self.max_samples = max_samples
+        self.log_every = log_every
+    
+    def execute(self) -> None:
+        self.tracker.log_params({
+            'max_batch_size': self.max_batch_size,
+            'max_latency': self.max_latency,
+            'per_sample': self.per_sample,
+            'training_mode': 'streaming'
+        })
+        
+        self.samples_seen = 0
+        self.micro_batches = 0
+        self.max_update_latency = 0.0
+        self._fit_preprocessor = self.preprocessor is not None
+        if self.preprocessor:
+            self.preprocessor.reset()
+        total_latency = 0.0
+        if self.scheduler:
+            windows = -(-self.max_samples // self.log_every) if self.max_samples is not None else None
+            self.scheduler.start(windows, -(-self.log_every // self.max_batch_size))
+        window = self._new_window()
+        start_time = time.perf_counter()
+        
+        buffer = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        reader = threading.Thread(target=self._read_stream, args=(buffer, stop), name='stream-reader', daemon=True)
+        reader.start()
+        
+        try:
+            for X, y, arrived in self._micro_batches(buffer):
+                if self.max_samples is not None:
+                    remaining = self.max_samples - self.samples_seen
+                    X, y = X[:remaining], y[:remaining]
+                
+                loss = self._train_micro_batch(X, y)
+                if self.scheduler:
+                    self.scheduler.step()
+                latency = time.perf_counter() - arrived
                 
-                loss = self.model.compute_loss(X_sample, y_sample)
-                gradients = self.model.compute_gradients(X_sample, y_sample)
+                self.samples_seen += len(y)
+                self.micro_batches += 1
+                total_latency += latency
+                self.max_update_latency = max(self.max_update_latency, latency)
+                window['loss'] += loss
+                window['samples'] += len(y)
+                window['latencies'].append(latency)
+                
+                if window['samples'] >= self.log_every:
+                    self._log_window(window)
+                    window = self._new_window()
+                if self.max_samples is not None and self.samples_seen >= self.max_samples:
+                    break
+        finally:
+            # A reader blocked on the source is left to the daemon thread
+            stop.set()
+            reader.join(timeout=1.0)
+        
+        if window['samples']:
+            self._log_window(window)
+        
+        elapsed = time.perf_counter() - start_time
+        self.ingest_rate = self.samples_seen / elapsed if elapsed > 0 else 0.0
+        self.mean_update_latency = total_latency / self.micro_batches if self.micro_batches else 0.0
+        self.tracker.log_metrics({
+            'stream_samples': self.samples_seen,
+            'stream_micro_batches': self.micro_batches,
+            'stream_ingest_samples_per_second': self.ingest_rate,
+            'stream_update_latency_ms_mean': self.mean_update_latency * 1000,
+            'stream_update_latency_ms_max': self.max_update_latency * 1000
+        })
+        print(f"Stream ended after {self.samples_seen} samples in {self.micro_batches} micro-batches: "
+              f"{self.ingest_rate:.0f} samples/s, mean update latency {self.mean_update_latency * 1000:.2f} ms")
+        self.tracker.flush()
+    
+    def _read_stream(self, buffer: queue.Queue, stop: threading.Event) -> None:
+        """Reader thread: queue (X, y, arrival time) chunks until the stream ends or stop is set."""
+        try:
+            for X, y in self.dataloader.iter_chunks(self.max_batch_size):
+                if not _put_unless_stopped(buffer, (X, y, time.perf_counter()), stop):
+                    return
+            _put_unless_stopped(buffer, None, stop)
+        except BaseException as e:
+            _put_unless_stopped(buffer, e, stop)
+    
+    def _micro_batches(self, buffer: queue.Queue) -> Iterator[Tuple[np.ndarray, np.ndarray, float]]:
+        """
+        Pack queued chunks into micro-batches bounded by max_batch_size and max_latency.
+        
+        Yields views of one reused buffer with the arrival time of the batch's oldest sample.
+        """
+        X_batch = y_batch = None
+        pending = None
+        finished = False
+        
+        while not finished:
+            filled = 0
+            oldest = None
+            while filled < self.max_batch_size:
+                if pending is not None:
+                    item, pending = pending, None
+                else:
+                    timeout = None if oldest is None else oldest + self.max_latency - time.perf_counter()
+                    if timeout is not None and timeout <= 0:
+                        break
+                    try:
+                        item = buffer.get(timeout=timeout)
+                    except queue.Empty:
+                        break
                 
-                self.optimizer.step(gradients)
+                if item is None:
+                    finished = True
+                    break
+                if isinstance(item, BaseException):
+                    raise item
                 
-                epoch_loss += loss
+                X, y, arrived = item
+                if X_batch is None:
+                    X_batch = np.empty((self.max_batch_size, X.shape[1]), dtype=X.dtype)
+                    y_batch = np.empty(self.max_batch_size, dtype=y.dtype)
+                if oldest is None:
+                    oldest = arrived
                 
-                if i % 1000 == 0 and i > 0:
-                    self.tracker.log_metric(f'sample_{i}_loss', loss)
-            
-            epoch_loss /= n_samples
-            
-            y_pred = self.model.predict(X)
-            metric_value = self.metric_function.calculate(y, y_pred)
+                take = min(len(y), self.max_batch_size - filled)
+                X_batch[filled:filled + take] = X[:take]
+                y_batch[filled:filled + take] = y[:take]
+                filled += take
+                if take < len(y):
+                    pending = (X[take:], y[take:], arrived)
             
-            self.tracker.log_metric(f'loss_epoch_{epoch}', epoch_loss)
-            self.tracker.log_metric(f'metric_epoch_{epoch}', metric_value)
+            if filled:
+                yield X_batch[:filled], y_batch[:filled], oldest
+    
+    def _train_micro_batch(self, X: np.ndarray, y: np.ndarray) -> float:
+        """Train on the micro-batch, scoring each sample before its update; returns the summed loss."""
+        if self._fit_preprocessor:
+            try:
+                self.preprocessor.partial_fit(X)
+            except NotImplementedError as e:
+                warnings.warn(f"{e}; fitting it on the first micro-batch only", stacklevel=2)
+                self.preprocessor.fit(X)
+                self._fit_preprocessor = False
+        if self.preprocessor:
+            X = self.preprocessor.transform(X)
+        
+        if not self.per_sample:
+            loss, gradients, y_pred = self.model.forward_backward(X, y)
+            self.metric_function.update(y, y_pred)
+            self.optimizer.step(gradients)
+            return loss * len(y)
+        
+        total_loss = 0.0
+        for i in range(len(y)):
+            loss, gradients, y_pred = self.model.forward_backward(X[i:i + 1], y[i:i + 1])
+            self.metric_function.update(y[i:i + 1], y_pred)
+            self.optimizer.step(gradients)
+            total_loss += loss
+        return total_loss
+    
+    def _new_window(self) -> Dict[str, Any]:
+        self.metric_function.reset()
+        return {'loss': 0.0, 'samples': 0, 'latencies': [], 'start': time.perf_counter()}
+    
+    def _log_window(self, window: Dict[str, Any]) -> None:
+        n = window['samples']
+        elapsed = time.perf_counter() - window['start']
+        latencies = np.array(window['latencies']) * 1000
+        metric_value = self.metric_function.compute()
+        self.tracker.log_metrics({
+            'loss': window['loss'] / n,
+            **self._metric_items(metric_value, 'metric'),
+            'ingest_samples_per_second': n / elapsed,
+            'update_latency_ms_mean': latencies.mean(),
+            'update_latency_ms_p95': np.percentile(latencies, 95)
+        }, self.samples_seen)
+        if self.scheduler:
+            self.tracker.log_metric('lr_scale', self.optimizer.lr_scale, self.samples_seen)
+            self.scheduler.end_epoch(self._monitored_score(metric_value))
+
+
+class NormalEquationTrainLoop(TrainLoop):
+    """
+    Closed-form least squares training for linear models.
+    
+    One streaming pass accumulates X^T X, X^T y and y^T y (with a bias column), then
+    (X^T X + l2 * I) w = X^T y is solved by Cholesky, falling back to lstsq when the
+    system is not positive definite. An affine preprocessor is fitted in the same pass
+    and applied to the accumulated statistics afterwards; other preprocessors are
+    fitted first with fit_chunks (one extra pass, one per step for a
+    PreprocessorPipeline), and one without partial_fit is fitted on the first chunk
+    with a warning. No optimizer is needed. A validation_loader is evaluated after
+    the fit; there are no epochs, so eval_every and early stopping do not apply.
+    """
+    
+    def __init__(self, 
+                 dataloader: DataLoader,
+                 model: Model,
+                 tracker: Tracker,
+                 metricfunction: MetricFunction,
+                 optimizer: Optional[Optimizer] = None,
+                 preprocessor: Optional[Preprocessor] = None,
+                 batchiterator: Optional[BatchIterator] = None,
+                 sampler: Optional[Sampler] = None,
+                 max_eval_samples: Optional[int] = None,
+                 chunk_size: int = 65536,
+                 l2: float = 0.0,
+                 solver: str = 'cholesky',
+                 evaluate: bool = True,
+                 **kwargs):
+        super().__init__(dataloader, model, optimizer, tracker, metricfunction, preprocessor, batchiterator, sampler,
+                         max_eval_samples, **kwargs)
+        if solver not in ('cholesky', 'lstsq'):
+            raise ValueError(f"Unknown solver: {solver}")
+        if self.validation_fraction:
+            raise ValueError("NormalEquationTrainLoop streams its data; use validation_loader instead of validation_fraction")
+        self.chunk_size = chunk_size
+        self.l2 = l2
+        self.solver = solver
+        self.evaluate = evaluate
+    
+    def execute(self) -> None:
+        fold_preprocessor = isinstance(self.preprocessor, AffinePreprocessor)
+        if fold_preprocessor:
+            self.preprocessor.reset()
+            chunks = self.dataloader.iter_chunks(self.chunk_size)
+        else:
+            self._fit_preprocessor_streaming(self.chunk_size)
+            chunks = self._iter_training_chunks(self.chunk_size)
+        
+        gram = None
+        for X, y in chunks:
+            if fold_preprocessor:
+                self.preprocessor.partial_fit(X)
+            X = np.asarray(X, dtype=np.float64)
+            y = np.asarray(y, dtype=np.float64)
+            if gram is None:
+                input_dim = X.shape[1]
+                gram = np.zeros((input_dim + 1, input_dim + 1))
+                moment = np.zeros(input_dim + 1)
+                y_sq = 0.0
             
-            self.tracker.log_metric('epoch', epoch)
-            print(f"Epoch {epoch}/{self.epochs}: Loss = {epoch_loss:.4f}, Metric = {metric_value:.4f}") 
\ No newline at end of file
+            # Blocks of [X 1]^T [X 1] and [X 1]^T y
+            gram[:input_dim, :input_dim] += np.dot(X.T, X)
+            gram[:input_dim, input_dim] += X.sum(axis=0)
+            gram[input_dim, input_dim] += len(y)
+            moment[:input_dim] += np.dot(X.T, y)
+            moment[input_dim] += y.sum()
+            y_sq += np.dot(y, y)
+        
+        if gram is None:
+            raise ValueError("DataLoader produced no data")
+        gram[input_dim, :input_dim] = gram[:input_dim, input_dim]
+        n_samples = gram[input_dim, input_dim]
+        
+        if fold_preprocessor:
+            # [Z 1] = [X 1] T with T = [[diag(scale), 0], [offset, 1]]
+            scale, offset = self.preprocessor.affine_params(np.float64)
+            transform = np.zeros_like(gram)
+            transform[np.arange(input_dim), np.arange(input_dim)] = scale
+            transform[input_dim, :input_dim] = offset
+            transform[input_dim, input_dim] = 1.0
+            gram = transform.T @ gram @ transform
+            moment = transform.T @ moment
+        
+        self.tracker.log_params({
+            'solver': self.solver,
+            'l2': self.l2,
+            'chunk_size': self.chunk_size,
+            'input_dim': input_dim,
+            'n_samples': int(n_samples)
+        })
+        
+        solution = self._solve(gram, moment, input_dim)
+        self._set_linear_params(solution, input_dim)
+        
+        # Training MSE straight from the accumulated statistics
+        loss = (y_sq - 2 * np.dot(solution, moment) + solution @ gram @ solution) / n_samples
+        self.tracker.log_metric('loss', loss, 0)
+        
+        if self.evaluate:
+            metric_value = self._evaluate_streaming(self.chunk_size, self.max_eval_samples)
+            metrics = self._metric_items(metric_value, 'metric')
+            if self.validation_loader is not None:
+                metrics.update(self._metric_items(self._evaluate_chunks(self.chunk_size), 'eval_metric'))
+            self.tracker.log_metrics(metrics, 0)
+            print(f"Closed-form fit: Loss = {loss:.4f}, {self._format_metric(metric_value)}")
+        else:
+            print(f"Closed-form fit: Loss = {loss:.4f}")
+        self.tracker.flush()
+    
+    def _solve(self, gram: np.ndarray, moment: np.ndarray, input_dim: int) -> np.ndarray:
+        system = gram.copy()
+        # Ridge penalty on the weights only, not the bias
+        system[np.arange(input_dim), np.arange(input_dim)] += self.l2
+        
+        if self.solver == 'cholesky':
+            try:
+                lower = np.linalg.cholesky(system)
+                return np.linalg.solve(lower.T, np.linalg.solve(lower, moment))
+            except np.linalg.LinAlgError:
+                pass
+        return np.linalg.lstsq(system, moment, rcond=None)[0]
+    
+    def _set_linear_params(self, solution: np.ndarray, input_dim: int) -> None:
+        params = self.model.get_params()
+        if len(params) != 2 or np.shape(params[0]) != (input_dim,) or np.size(params[1]) != 1:
+            raise ValueError("NormalEquationTrainLoop needs a linear model with [weights, bias] parameters")
+        self.model.set_params([solution[:input_dim], solution[input_dim:]])
\ No newline at end of file
@@ -1,45 +1,136 @@
 import yaml
+import asyncio
+import copy
+import functools
 import importlib
 import inspect
-from typing import Dict, Any, Type, Set, List, Optional, Union
+import os
+import sys
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Type, Set, List, Optional, Union, Tuple, Callable
+
+
+class _ResolutionCache:
+    """
+    Process-wide state shared by every DependencyInjector.
+    
+    The dependency graph, the resolved component classes and the compiled
+    resolution plans only depend on the component classes that exist, so they
+    are computed once and reused until a base class gains or loses a subclass.
+    Parsed YAML files are kept until the file's mtime or size changes.
+    """
+    
+    def __init__(self):
+        self.clear()
+    
+    def clear(self) -> None:
+        # (subclasses, dependency graph, classes, plans), replaced as a whole so
+        # threads never combine a new graph with plans compiled from an old one
+        self.generation = (None, {}, {}, {})
+        self.configs = {}
+
+
+_cache = _ResolutionCache()
 
 
 class DependencyInjector:
     """
     Manages the creation and injection of dependencies based on configuration.
+    
+    Building the dependency graph inspects every component constructor, so it is
+    cached for the whole process (see _ResolutionCache), as are the classes named
+    in configs and a resolution plan per config layout: the construction order,
+    classes and injected dependencies of a component given which types are
+    configured with which classes. Creating a pipeline from an already seen
+    layout then only reads the kwargs and calls the constructors. Defining a new
+    component subclass invalidates the graph, and a class replaced in its
+    components module (a reload or monkeypatching) invalidates the plans that use
+    it; clear_cache() drops everything explicitly.
+    
+    Components are constructed in the plan's topological order. With
+    max_workers > 1 (argument, or `injector: {max_workers: N}` in the config)
+    independent components are constructed concurrently on a thread pool, and
+    components whose class declares an `async def acreate(cls, **kwargs)`
+    classmethod are created by awaiting it on an event loop. Construction times
+    are kept in construction_times; `injector: {report_timings: true}` prints
+    them with the critical path.
     """
     
-    def __init__(self, config_path: Optional[str] = None, config_dict: Optional[Dict[str, Any]] = None):
+    def __init__(self, config_path: Optional[str] = None, config_dict: Optional[Dict[str, Any]] = None,
+                 max_workers: Optional[int] = None):
         if config_path:
-            with open(config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = self._load_config(config_path)
         elif config_dict:
             self.config = config_dict
         else:
             self.config = {}
         
+        settings = self.config.get('injector') or {}
+        self.max_workers = max_workers if max_workers is not None else settings.get('max_workers', 1)
+        self.report_timings = settings.get('report_timings', False)
         self.instances = {}
-        self.dependency_graph = {}
+        # Seconds each component took to construct
+        self.construction_times = {}
         self._build_dependency_graph()
     
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop the process-wide graph, class, plan and YAML caches."""
+        _cache.clear()
+    
+    @staticmethod
+    def _base_classes() -> List[Type]:
+        from components import (
+            DataLoader, MetricFunction, Tracker, Preprocessor,
+            TrainLoop, Optimizer, Model, BatchIterator, Sampler, Scheduler
+        )
+        
+        return [
+            DataLoader, MetricFunction, Tracker, Preprocessor,
+            TrainLoop, Optimizer, Model, BatchIterator, Sampler, Scheduler
+        ]
+    
+    @staticmethod
+    def _load_config(config_path: str) -> Dict[str, Any]:
+        """Parse a YAML config, reusing the parse while the file is unchanged."""
+        path = os.path.abspath(config_path)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = _cache.configs.get(path)
+        if cached is None or cached[0] != version:
+            with open(path, 'r') as f:
+                cached = (version, yaml.safe_load(f))
+            _cache.configs[path] = cached
+        # Constructors receive nested values from the config, so each injector gets its own copy
+        return copy.deepcopy(cached[1])
+    
     def _build_dependency_graph(self):
         """
         Analyzes the component classes to build a dependency graph.
+        
+        The graph is rebuilt only when the direct subclasses of a base class
+        differ from those it was built from. self.dependency_graph is shared
+        between injectors and must not be modified.
         """
-        from components import (
-            DataLoader, MetricFunction, Tracker, Preprocessor, 
-            TrainLoop, Optimizer, Model
+        base_classes = self._base_classes()
+        # Weak references, so the cache neither keeps removed classes alive nor matches a new class
+        # that reuses a collected one's id
+        subclasses = tuple(
+            tuple(weakref.ref(subclass) for subclass in base_class.__subclasses__())
+            for base_class in base_classes
         )
+        generation = _cache.generation
+        if subclasses == generation[0]:
+            _, self.dependency_graph, self._classes, self._plans = generation
+            return
         
-        base_classes = [
-            DataLoader, MetricFunction, Tracker, Preprocessor, 
-            TrainLoop, Optimizer, Model
-        ]
-        
+        dependency_graph = {}
         # Build dependency graph based on constructor parameters
         for base_class in base_classes:
             class_name = base_class.__name__.lower()
-            self.dependency_graph[class_name] = []
+            dependency_graph[class_name] = []
             
             # Get all subclasses of the base class
             for subclass in base_class.__subclasses__():
@@ -51,13 +142,111 @@ class DependencyInjector:
                     param_type = param.annotation
                     
                     # Check if the parameter type is one of our base classes
+                    # (Optional[X] is Union[X, None], so its origin is Union). A parameter of
+                    # the class's own type, like a wrapped tracker, is configured, not injected
                     for bc in base_classes:
-                        if (param_type == bc or 
-                            (hasattr(param_type, "__origin__") and 
-                             param_type.__origin__ is Optional and 
+                        if bc is base_class:
+                            continue
+                        if (param_type == bc or
+                            (hasattr(param_type, "__origin__") and
+                             param_type.__origin__ is Union and
                              param_type.__args__[0] == bc)):
-                            if bc.__name__.lower() not in self.dependency_graph[class_name]:
-                                self.dependency_graph[class_name].append(bc.__name__.lower())
+                            if bc.__name__.lower() not in dependency_graph[class_name]:
+                                dependency_graph[class_name].append(bc.__name__.lower())
+        
+        _cache.generation = (subclasses, dependency_graph, {}, {})
+        _, self.dependency_graph, self._classes, self._plans = _cache.generation
+    
+    def _resolve_class(self, component_type: str, class_name: str) -> Type:
+        """
+        Import components.<component_type> and return its class_name attribute, cached.
+        
+        A cached class is used only while it is still that attribute of the module
+        imported as components.<component_type>, so reloading the module or
+        replacing the class resolves the new one.
+        """
+        key = (component_type, class_name)
+        module_path = f"components.{component_type.lower()}"
+        cached = self._classes.get(key)
+        if cached is not None:
+            module, component_class = cached
+            if sys.modules.get(module_path) is module and module.__dict__.get(class_name) is component_class:
+                return component_class
+        module = importlib.import_module(module_path)
+        component_class = getattr(module, class_name)
+        self._classes[key] = (module, component_class)
+        return component_class
+    
+    def _layout(self) -> Tuple:
+        """The parts of the config a resolution plan depends on: each type's class, or that it is an instance."""
+        return tuple(
+            (key, value.get('class') if isinstance(value, dict) else None)
+            for key, value in self.config.items()
+        )
+    
+    def _compile_plan(self, component_type: str) -> Tuple[Tuple[str, Optional[Type], Tuple[str, ...]], ...]:
+        """
+        Compiles the steps that create component_type from the config.
+        
+        The steps are the dependency graph restricted to the configured
+        component types, sorted topologically by a depth-first search that
+        raises ValueError on a cycle. Each step is (component type, class,
+        dependency types), dependencies first; the class is None for components
+        given as instances in the config.
+        """
+        steps = []
+        done = set()
+        visiting = []
+        
+        def visit(dep_type: str) -> None:
+            if dep_type in done:
+                return
+            if dep_type in visiting:
+                cycle = visiting[visiting.index(dep_type):] + [dep_type]
+                raise ValueError(f"Dependency cycle: {' -> '.join(cycle)}")
+            
+            component_config = self.config[dep_type]
+            # Handle case where value is already an instance
+            if not isinstance(component_config, dict):
+                steps.append((dep_type, None, ()))
+                done.add(dep_type)
+                return
+            
+            class_name = component_config.get('class')
+            if not class_name:
+                raise ValueError(f"No class specified for component type: {dep_type}")
+            
+            visiting.append(dep_type)
+            dependencies = tuple(d for d in self.dependency_graph.get(dep_type, []) if d in self.config)
+            for d in dependencies:
+                visit(d)
+            visiting.pop()
+            
+            steps.append((dep_type, self._resolve_class(dep_type, class_name), dependencies))
+            done.add(dep_type)
+        
+        visit(component_type)
+        return tuple(steps)
+    
+    def _plan(self, component_type: str) -> Tuple[Tuple[str, Optional[Type], Tuple[str, ...]], ...]:
+        """The cached resolution plan of component_type for this config's layout."""
+        key = (component_type, self._layout())
+        try:
+            plan = self._plans.get(key)
+        except TypeError:
+            # A class entry that is not hashable: compile without caching
+            return self._compile_plan(component_type)
+        if plan is None or not self._is_current(plan):
+            plan = self._compile_plan(component_type)
+            self._plans[key] = plan
+        return plan
+    
+    def _is_current(self, plan: Tuple[Tuple[str, Optional[Type], Tuple[str, ...]], ...]) -> bool:
+        """Whether every class in plan is still the one its config entry resolves to."""
+        return all(
+            component_class is None or self._resolve_class(dep_type, self.config[dep_type]['class']) is component_class
+            for dep_type, component_class, _ in plan
+        )
     
     def get_instance(self, component_type: str) -> Any:
         """
@@ -65,7 +254,7 @@ class DependencyInjector:
         
         Args:
             component_type: The type of component to get/create (e.g. 'dataloader')
-            
+        
         Returns:
             An instance of the specified component type
         """
@@ -77,36 +266,115 @@ class DependencyInjector:
         if component_type not in self.config:
             raise ValueError(f"No configuration found for component type: {component_type}")
         
-        # Get component configuration
-        component_config = self.config[component_type]
-        
-        # Handle case where value is already an instance
-        if isinstance(component_config, object) and hasattr(component_config, '__class__') and not isinstance(component_config, dict):
-            self.instances[component_type] = component_config
-            return component_config
+        # Create dependencies first, in plan order
+        steps = []
+        for step in self._plan(component_type):
+            dep_type, component_class, _ = step
+            if dep_type in self.instances:
+                continue
+            if component_class is None:
+                self.instances[dep_type] = self.config[dep_type]
+                continue
+            steps.append(step)
         
-        # Get the class to instantiate
-        class_name = component_config.get('class')
-        if not class_name:
-            raise ValueError(f"No class specified for component type: {component_type}")
-        
-        # Create dependencies first (recursive call)
-        dependencies = {}
-        for dep_type in self.dependency_graph.get(component_type, []):
-            if dep_type in self.config:
-                dependencies[dep_type] = self.get_instance(dep_type)
+        if self.max_workers > 1 and len(steps) > 1:
+            self._run(self._construct_concurrently(steps))
+        else:
+            for step in steps:
+                self._construct(step)
         
-        # Import the class
-        module_path = f"components.{component_type.lower()}"
-        module = importlib.import_module(module_path)
-        component_class = getattr(module, class_name)
+        if self.report_timings and steps:
+            self._print_timings(component_type, steps)
+        return self.instances[component_type]
+    
+    def critical_path(self, component_type: str) -> Tuple[List[str], float]:
+        """
+        Returns the chain of dependencies of component_type with the longest total
+        construction time, and that time in seconds.
         
-        kwargs = {k: v for k, v in component_config.items() if k != 'class'}
+        With concurrent construction this chain bounds the time to create
+        component_type; components given as instances or created by an earlier
+        get_instance call count as zero.
+        """
+        longest = {}
+        for dep_type, _, dependencies in self._plan(component_type):
+            before = max((longest[d] for d in dependencies), key=lambda path: path[1], default=([], 0.0))
+            longest[dep_type] = (before[0] + [dep_type], before[1] + self.construction_times.get(dep_type, 0.0))
+        return longest[component_type]
+    
+    @staticmethod
+    def _async_factory(component_class: Type) -> Optional[Callable]:
+        """The component's `async def acreate(**kwargs)` classmethod, if it declares one."""
+        factory = getattr(component_class, 'acreate', None)
+        return factory if inspect.iscoroutinefunction(factory) else None
+    
+    def _kwargs(self, step: Tuple[str, Type, Tuple[str, ...]]) -> Dict[str, Any]:
+        dep_type, _, dependencies = step
+        kwargs = {k: v for k, v in self.config[dep_type].items() if k != 'class'}
         
-        kwargs.update(dependencies)
+        kwargs.update({d: self.instances[d] for d in dependencies})
+        return kwargs
+    
+    def _construct(self, step: Tuple[str, Type, Tuple[str, ...]]) -> None:
+        """Create one component on the calling thread."""
+        dep_type, component_class, _ = step
+        kwargs = self._kwargs(step)
+        factory = self._async_factory(component_class)
+        start = time.perf_counter()
+        instance = self._run(factory(**kwargs)) if factory else component_class(**kwargs)
+        self.construction_times[dep_type] = time.perf_counter() - start
+        self.instances[dep_type] = instance
+    
+    async def _construct_concurrently(self, steps: List[Tuple[str, Type, Tuple[str, ...]]]) -> None:
+        """
+        Create the components of steps as soon as their dependencies exist.
         
-        instance = component_class(**kwargs)
+        Constructors run on a pool of max_workers threads and async factories
+        are awaited on the event loop, so independent components are built at
+        the same time. If one fails, components not yet started are cancelled
+        and its exception is raised once the running ones have finished.
+        """
+        loop = asyncio.get_running_loop()
+        tasks = {}
         
-        self.instances[component_type] = instance
+        async def build(step: Tuple[str, Type, Tuple[str, ...]]) -> None:
+            dep_type, component_class, dependencies = step
+            await asyncio.gather(*(tasks[d] for d in dependencies if d in tasks))
+            kwargs = self._kwargs(step)
+            factory = self._async_factory(component_class)
+            start = time.perf_counter()
+            if factory:
+                instance = await factory(**kwargs)
+            else:
+                instance = await loop.run_in_executor(pool, functools.partial(component_class, **kwargs))
+            self.construction_times[dep_type] = time.perf_counter() - start
+            self.instances[dep_type] = instance
         
-        return instance 
\ No newline at end of file
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='injector') as pool:
+            # Steps are in dependency order, so every dependency's task exists before its dependents'
+            for step in steps:
+                tasks[step[0]] = asyncio.ensure_future(build(step))
+            try:
+                await asyncio.gather(*tasks.values())
+            except BaseException:
+                for task in tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+                raise
+    
+    @staticmethod
+    def _run(coroutine) -> Any:
+        """Run coroutine to completion, on a helper thread if this thread already runs an event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        with ThreadPoolExecutor(max_workers=1) as helper:
+            return helper.submit(asyncio.run, coroutine).result()
+    
+    def _print_timings(self, component_type: str, steps: List[Tuple[str, Type, Tuple[str, ...]]]) -> None:
+        print(f"Constructed {component_type} ({len(steps)} components, max_workers={self.max_workers}):")
+        for dep_type, component_class, _ in steps:
+            print(f"  {dep_type:<16} {component_class.__name__:<28} {self.construction_times[dep_type] * 1e3:9.2f} ms")
+        path, seconds = self.critical_path(component_type)
+        print(f"  critical path: {' -> '.join(path)} ({seconds * 1e3:.2f} ms)")
\ No newline at end of file
@@ -4,14 +4,23 @@ Test script to demonstrate the dependency injection system.
 """
 
 import os
+import shutil
+import tempfile
+import time
 import yaml
+from typing import Optional
+import numpy as np
+import pandas as pd
 from components.trainloop import TrainLoop
 from components.dataloader import DataLoader
 from components.metricfunction import MetricFunction
 from components.model import Model
 from components.optimizer import Optimizer
 from components.preprocessor import Preprocessor
-from components.tracker import Tracker
+from components.tracker import Tracker, StdoutTracker, AsyncTracker, MetricStore
+from components.batchiterator import BatchIterator
+from components.sampler import Sampler
+from components.scheduler import Scheduler
 
 
 def test_with_yaml_file():
@@ -87,6 +96,1072 @@ def test_with_dict_config():
     # Execute training
     train_loop.execute()
 
+
+def test_streaming_chunks():
+    """Test that chunked loading covers the file and drives a streaming train loop."""
+    print("\n=== Testing Chunked Streaming ===")
+    
+    loader = DataLoader.create({'dataloader': {'class': 'CSVDataLoader', 'filename': 'data/sample_data.csv'}})
+    data = loader.load_data()
+    
+    chunks = list(loader.iter_chunks(300))
+    assert [len(y) for _, y in chunks] == [300, 300, 300, 100]
+    X = np.concatenate([X for X, _ in chunks])
+    assert np.array_equal(X, data.iloc[:, :-1].values)
+    
+    config = yaml.safe_load(open('configs/sample_config.yaml'))
+    config['trainloop'].update({'epochs': 2, 'chunk_size': 256})
+    train_loop = TrainLoop.create(config)
+    train_loop.execute()
+
+
+def test_memmap_cache():
+    """Test that cached loads are memmapped, invalidated on change and evicted by size."""
+    print("\n=== Testing Memmap Dataset Cache ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'data.csv')
+        shutil.copy('data/sample_data.csv', source)
+        config = {'dataloader': {'class': 'CSVDataLoader', 'filename': source,
+                                 'cache_dir': os.path.join(tmp, 'cache'), 'cache_max_bytes': 50000}}
+        loader = DataLoader.create(config)
+        
+        expected_X, expected_y = DataLoader.create({'dataloader': {'class': 'CSVDataLoader', 'filename': source}}).load_arrays()
+        X, y = loader.load_arrays()
+        X, y = loader.load_arrays()
+        assert isinstance(X, np.memmap)
+        assert np.array_equal(X, expected_X) and np.array_equal(y, expected_y)
+        
+        # Rewriting the source changes its fingerprint and replaces the old entry
+        pd.read_csv(source).head(500).to_csv(source, index=False)
+        X, y = loader.load_arrays()
+        assert X.shape == (500, 4)
+        assert len(os.listdir(os.path.join(tmp, 'cache'))) == 1
+        
+        # Another source pushes the cache over its cap and evicts the older entry
+        other = os.path.join(tmp, 'other.csv')
+        shutil.copy('data/sample_data.csv', other)
+        DataLoader.create({'dataloader': dict(config['dataloader'], filename=other)}).load_arrays()
+        assert len(os.listdir(os.path.join(tmp, 'cache'))) == 1
+
+
+def test_prefetch_batch_iterator():
+    """Test that the prefetching iterator yields the same batches and is injected into the train loop."""
+    print("\n=== Testing Prefetch Batch Iterator ===")
+    
+    X = np.arange(200, dtype=float).reshape(100, 2)
+    y = np.arange(100, dtype=float)
+    batches = np.array_split(np.random.permutation(100), 7)
+    
+    iterator = BatchIterator.create({'batchiterator': {'class': 'PrefetchBatchIterator', 'prefetch': 3}})
+    prefetched = list(iterator.iterate(X, y, batches))
+    assert len(prefetched) == 7 and iterator.batches == 7
+    for (X_batch, y_batch), indices in zip(prefetched, batches):
+        assert np.array_equal(X_batch, X[indices]) and np.array_equal(y_batch, y[indices])
+    
+    config = yaml.safe_load(open('configs/sample_config.yaml'))
+    config['trainloop']['epochs'] = 2
+    config['batchiterator'] = {'class': 'PrefetchBatchIterator', 'prefetch': 4}
+    train_loop = TrainLoop.create(config)
+    assert train_loop.batch_iterator.__class__.__name__ == 'PrefetchBatchIterator'
+    train_loop.execute()
+    
+    # Only a prefetching iterator reports starved batches
+    synchronous = BatchIterator.create({'batchiterator': {'class': 'SynchronousBatchIterator'}})
+    assert len(list(synchronous.iterate(X, y, batches))) == 7 and synchronous.starved_batches == 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, logged in (('SynchronousBatchIterator', False), ('PrefetchBatchIterator', True)):
+            config['batchiterator'] = {'class': name}
+            config['tracker'] = {'class': 'LocalStoreTracker', 'directory': os.path.join(tmp, name)}
+            train_loop = TrainLoop.create(config)
+            train_loop.execute()
+            names = train_loop.tracker.store.names()
+            assert 'data_wait_seconds' in names and ('data_starved_batches' in names) == logged
+            train_loop.tracker.close()
+
+
+def test_sharded_loader():
+    """Test that sharded loading matches the single file in every shard order."""
+    print("\n=== Testing Sharded DataLoader ===")
+    
+    data = pd.read_csv('data/sample_data.csv')
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(5):
+            data.iloc[i * 200:(i + 1) * 200].to_csv(os.path.join(tmp, f'part-{i:03d}.csv'), index=False)
+        
+        config = {'dataloader': {'class': 'ShardedDataLoader', 'path': os.path.join(tmp, 'part-*.csv'),
+                                 'num_workers': 3, 'order': 'interleave'}}
+        loader = DataLoader.create(config)
+        X, y = loader.load_arrays()
+        assert np.allclose(X, data.iloc[:, :-1].values)
+        
+        chunks = list(loader.iter_chunks(150))
+        assert [len(y) for _, y in chunks] == [150, 150, 150, 50, 50, 50, 150, 150, 50, 50]
+        assert np.allclose(np.sort(np.concatenate([y for _, y in chunks])), np.sort(y))
+
+
+def test_column_projection():
+    """Test loading selected columns and filtered rows straight into typed arrays."""
+    print("\n=== Testing Column Projection ===")
+    
+    data = pd.read_csv('data/sample_data.csv')
+    config = {'dataloader': {'class': 'CSVDataLoader', 'filename': 'data/sample_data.csv',
+                             'feature_columns': ['feature_2', 'feature_0'], 'target_column': 'target',
+                             'filters': [['feature_1', '>', 0]], 'dtype': 'float32'}}
+    loader = DataLoader.create(config)
+    expected = data[data['feature_1'] > 0]
+    
+    X, y = loader.load_arrays()
+    assert X.dtype == np.float32 and y.dtype == np.float32
+    assert np.allclose(X, expected[['feature_2', 'feature_0']].values)
+    assert np.allclose(y, expected['target'].values)
+    
+    chunks = list(loader.iter_chunks(100))
+    assert sum(len(y) for _, y in chunks) == len(expected)
+
+
+def test_parquet_loader():
+    """Test Parquet loading with nulls, boolean columns, several row groups and pushed-down filters."""
+    print("\n=== Testing Parquet Loader ===")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    rng = np.random.default_rng(0)
+    n = 1000
+    feature = rng.normal(size=n)
+    flag = rng.random(n) < 0.5
+    target = rng.normal(size=n)
+    missing = np.arange(n) % 7 == 0
+    table = pa.table({
+        'feature': pa.array(feature, mask=missing),
+        'flag': pa.array(flag, mask=np.arange(n) % 11 == 0),
+        'target': target
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.parquet')
+        pq.write_table(table, path, row_group_size=128)
+        assert pq.ParquetFile(path).num_row_groups > 1
+        
+        config = {'class': 'ParquetFileDataLoader', 'filename': path, 'target_column': 'target'}
+        X, y = DataLoader.create({'dataloader': config}).load_arrays()
+        assert np.isnan(X[missing, 0]).all() and np.allclose(X[~missing, 0], feature[~missing])
+        assert np.isnan(X[::11, 1]).all()
+        
+        chunks = list(DataLoader.create({'dataloader': config}).iter_chunks(100))
+        assert len(chunks) > n // 128
+        X_chunked = np.concatenate([X for X, _ in chunks])
+        assert np.allclose(X_chunked, X, equal_nan=True) and np.allclose(np.concatenate([y for _, y in chunks]), y)
+        
+        filtered = dict(config, filters=[['target', '>', 0]], dtype='float32')
+        chunks = list(DataLoader.create({'dataloader': filtered}).iter_chunks(100))
+        y_filtered = np.concatenate([y for _, y in chunks])
+        assert y_filtered.dtype == np.float32 and np.allclose(y_filtered, target[target > 0])
+        X_filtered = np.concatenate([X for X, _ in chunks])
+        assert set(np.unique(X_filtered[:, 1][~np.isnan(X_filtered[:, 1])])) <= {0.0, 1.0}
+        
+        # The cache is built by streaming the row groups
+        cached = dict(config, cache_dir=os.path.join(tmp, 'cache'))
+        X_cached, _ = DataLoader.create({'dataloader': cached}).load_arrays()
+        assert np.allclose(X_cached, X, equal_nan=True)
+
+
+def test_incremental_normalizer_fit():
+    """Test that streamed and merged normalizer statistics match a full-batch fit."""
+    print("\n=== Testing Incremental Normalizer Fit ===")
+    
+    X = np.random.default_rng(0).normal(1e4, 3.0, size=(1000, 4))
+    for name in ['MinMaxNormalizer', 'MeanVarNormalizer']:
+        full = Preprocessor.create({'preprocessor': {'class': name}})
+        full.fit(X)
+        
+        streamed = Preprocessor.create({'preprocessor': {'class': name}})
+        for start in range(0, len(X), 70):
+            streamed.partial_fit(X[start:start + 70])
+        
+        shards = []
+        for part in np.array_split(X, 3):
+            shard = Preprocessor.create({'preprocessor': {'class': name}})
+            shard.fit(part)
+            shards.append(shard)
+        merged = shards[0]
+        for shard in shards[1:]:
+            merged.merge(shard)
+        
+        assert np.allclose(streamed.transform(X), full.transform(X))
+        assert np.allclose(merged.transform(X), full.transform(X))
+
+
+def test_inplace_transform():
+    """Test the out=, inplace and dtype paths of the normalizer transforms."""
+    print("\n=== Testing In-place Transforms ===")
+    
+    X = np.random.default_rng(1).normal(5.0, 2.0, size=(500, 4))
+    for name in ['MinMaxNormalizer', 'MeanVarNormalizer']:
+        normalizer = Preprocessor.create({'preprocessor': {'class': name}})
+        expected = normalizer.fit_transform(X)
+        
+        out = np.empty_like(X)
+        assert normalizer.transform(X, out=out) is out
+        assert np.allclose(out, expected)
+        
+        X_copy = X.copy()
+        assert normalizer.transform(X_copy, inplace=True) is X_copy
+        assert np.allclose(X_copy, expected)
+        
+        normalizer = Preprocessor.create({'preprocessor': {'class': name, 'dtype': 'float32'}})
+        normalized = normalizer.fit_transform(X)
+        assert normalized.dtype == np.float32
+        assert np.allclose(normalized, expected, atol=1e-5)
+
+
+def test_preprocessor_pipeline():
+    """Test that the fused pipeline matches the steps run one by one and reuses its cache."""
+    print("\n=== Testing Preprocessor Pipeline ===")
+    
+    X = np.random.default_rng(2).normal(3.0, 4.0, size=(400, 4))
+    mean_var = Preprocessor.create({'preprocessor': {'class': 'MeanVarNormalizer'}})
+    min_max = Preprocessor.create({'preprocessor': {'class': 'MinMaxNormalizer'}})
+    expected = min_max.fit_transform(mean_var.fit_transform(X))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {'preprocessor': {'class': 'PreprocessorPipeline', 'cache_dir': tmp,
+                                   'steps': [{'class': 'MeanVarNormalizer'}, {'class': 'MinMaxNormalizer'}]}}
+        pipeline = Preprocessor.create(config)
+        assert np.allclose(pipeline.fit_transform(X), expected)
+        assert len(pipeline._stages) == 1
+        
+        cached = Preprocessor.create(config)
+        transformed = cached.fit_transform(X)
+        assert isinstance(transformed, np.memmap)
+        assert np.allclose(transformed, expected)
+        assert np.allclose(cached.transform(X[:10]), expected[:10])
+        
+        # Fitting from chunks takes one pass per step and matches the full fit
+        streamed = Preprocessor.create({'preprocessor': dict(config['preprocessor'], cache_dir=None)})
+        passes = []
+        def chunks():
+            passes.append(1)
+            return (X[start:start + 70] for start in range(0, len(X), 70))
+        streamed.fit_chunks(chunks)
+        assert len(passes) == 2 and np.allclose(streamed.transform(X), expected)
+        try:
+            streamed.partial_fit(X)
+            assert False, "PreprocessorPipeline.partial_fit should raise"
+        except NotImplementedError:
+            pass
+        
+        # A step that returns a view of its input must not let later steps overwrite the caller's array
+        import components.preprocessor
+        class ViewStep(Preprocessor):
+            def fit(self, data):
+                pass
+            def transform(self, data, **kwargs):
+                return data[:]
+        components.preprocessor.ViewStep = ViewStep
+        try:
+            viewing = Preprocessor.create({'preprocessor': {'class': 'PreprocessorPipeline', 'steps': [
+                {'class': 'ViewStep'}, {'class': 'MeanVarNormalizer'}, {'class': 'MinMaxNormalizer'}]}})
+            original = X.copy()
+            assert np.allclose(viewing.fit_transform(X), expected)
+            assert np.array_equal(X, original)
+        finally:
+            del components.preprocessor.ViewStep
+        
+        config['trainloop'] = {'class': 'StandardTrainLoop', 'epochs': 2, 'batch_size': 16}
+        config.update({
+            'dataloader': {'class': 'CSVDataLoader', 'filename': 'data/sample_data.csv'},
+            'metricfunction': {'class': 'MSE'},
+            'tracker': {'class': 'StdoutTracker'},
+            'model': {'class': 'LinearModel', 'input_dim': 4},
+            'optimizer': {'class': 'SGD', 'learning_rate': 0.05}
+        })
+        train_loop = TrainLoop.create(config)
+        assert isinstance(train_loop.preprocessor.steps[1], Preprocessor)
+        train_loop.execute()
+
+
+def test_fused_loss_and_gradients():
+    """Test that the single-pass loss and gradients match the separate calls."""
+    print("\n=== Testing Fused Loss and Gradients ===")
+    
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(64, 4))
+    y = rng.normal(size=64)
+    model = Model.create({'model': {'class': 'LinearModel', 'input_dim': 4}})
+    
+    loss, gradients = model.loss_and_gradients(X, y)
+    assert np.isclose(loss, model.compute_loss(X, y))
+    for fused, separate in zip(gradients, model.compute_gradients(X, y)):
+        assert np.allclose(fused, separate)
+
+
+def test_flat_parameter_updates():
+    """Test that in-place updates on the flat buffer match the textbook update rules."""
+    print("\n=== Testing Flat Parameter Updates ===")
+    
+    rng = np.random.default_rng(4)
+    X = rng.normal(size=(32, 4))
+    y = rng.normal(size=32)
+    
+    for name in ['SGD', 'Adam']:
+        config = {'model': {'class': 'LinearModel', 'input_dim': 4},
+                  'optimizer': {'class': name, 'learning_rate': 0.1}}
+        optimizer = Optimizer.create(config)
+        model = optimizer.model
+        buffer = model.flat_params()
+        
+        params = [p.copy() for p in model.get_params()]
+        m = [np.zeros_like(p) for p in params]
+        v = [np.zeros_like(p) for p in params]
+        for t in range(1, 6):
+            _, gradients = model.loss_and_gradients(X, y)
+            for i, grad in enumerate(gradients):
+                if name == 'SGD':
+                    params[i] = params[i] - 0.1 * grad
+                else:
+                    m[i] = 0.9 * m[i] + 0.1 * grad
+                    v[i] = 0.999 * v[i] + 0.001 * np.square(grad)
+                    m_hat = m[i] / (1 - 0.9 ** t)
+                    v_hat = v[i] / (1 - 0.999 ** t)
+                    params[i] = params[i] - 0.1 * m_hat / (np.sqrt(v_hat) + 1e-8)
+            optimizer.step(gradients)
+        
+        assert model.flat_params() is buffer and model.weights.base is buffer
+        for actual, expected in zip(model.get_params(), params):
+            assert np.allclose(actual, expected)
+
+
+def test_adam_state_roundtrip():
+    """Test that Adam/AdamW resume identically from a saved state."""
+    print("\n=== Testing Optimizer State ===")
+    
+    rng = np.random.default_rng(5)
+    X = rng.normal(size=(32, 4))
+    y = rng.normal(size=32)
+    
+    for name in ['Adam', 'AdamW']:
+        config = {'model': {'class': 'LinearModel', 'input_dim': 4},
+                  'optimizer': {'class': name, 'learning_rate': 0.05}}
+        optimizer = Optimizer.create(config)
+        for _ in range(3):
+            optimizer.step(optimizer.model.loss_and_gradients(X, y)[1])
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'adam.npz')
+            optimizer.save_state(path)
+            resumed = Optimizer.create(config)
+            resumed.model.set_params(optimizer.model.get_params())
+            resumed.load_state(path)
+        
+        for opt in (optimizer, resumed):
+            for _ in range(3):
+                opt.step(opt.model.loss_and_gradients(X, y)[1])
+        assert np.allclose(optimizer.model.flat_params(), resumed.model.flat_params())
+
+
+def test_normal_equation_train_loop():
+    """Test that the closed-form loop matches a direct least squares solve."""
+    print("\n=== Testing Normal Equation TrainLoop ===")
+    
+    data = pd.read_csv('data/sample_data.csv')
+    X = data.iloc[:, :-1].values
+    y = data.iloc[:, -1].values
+    
+    config = yaml.safe_load(open('configs/sample_config.yaml'))
+    config['trainloop'] = {'class': 'NormalEquationTrainLoop', 'chunk_size': 300}
+    del config['optimizer']
+    train_loop = TrainLoop.create(config)
+    train_loop.execute()
+    
+    Z = train_loop.preprocessor.transform(X)
+    expected = np.linalg.lstsq(np.column_stack([Z, np.ones(len(Z))]), y, rcond=None)[0]
+    assert np.allclose(train_loop.model.weights, expected[:-1])
+    assert np.allclose(train_loop.model.bias, expected[-1:])
+    
+    # A pipeline is fitted on every chunk, not just the first
+    import warnings
+    steps = [{'class': 'MeanVarNormalizer'}, {'class': 'MinMaxNormalizer'}]
+    config['preprocessor'] = {'class': 'PreprocessorPipeline', 'steps': steps}
+    config['trainloop']['chunk_size'] = 100
+    train_loop = TrainLoop.create(config)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        train_loop.execute()
+    
+    full = Preprocessor.create({'preprocessor': {'class': 'PreprocessorPipeline', 'steps': steps}})
+    Z = full.fit_transform(X)
+    assert np.allclose(train_loop.preprocessor.transform(X), Z)
+    expected = np.linalg.lstsq(np.column_stack([Z, np.ones(len(Z))]), y, rcond=None)[0]
+    assert np.allclose(train_loop.model.weights, expected[:-1])
+
+
+def test_batched_sweep():
+    """Test that a batched model matches K separately trained models and runs in the sweep loop."""
+    print("\n=== Testing Batched Sweep ===")
+    
+    rng = np.random.default_rng(6)
+    X = rng.normal(size=(64, 4))
+    y = rng.normal(size=64)
+    learning_rates = [0.001, 0.01, 0.1]
+    
+    batched = Optimizer.create({'model': {'class': 'BatchedLinearModel', 'input_dim': 4, 'n_models': 3},
+                                'optimizer': {'class': 'AdamW', 'learning_rate': learning_rates,
+                                              'weight_decay': [0.0, 0.1, 0.2]}})
+    singles = []
+    for k, lr in enumerate(learning_rates):
+        single = Optimizer.create({'model': {'class': 'LinearModel', 'input_dim': 4},
+                                   'optimizer': {'class': 'AdamW', 'learning_rate': lr, 'weight_decay': 0.1 * k}})
+        single.model.set_params([batched.model.weights[k], batched.model.bias[k:k + 1]])
+        singles.append(single)
+    
+    for _ in range(5):
+        losses, gradients = batched.model.loss_and_gradients(X, y)
+        batched.step(gradients)
+        for k, single in enumerate(singles):
+            loss, gradients = single.model.loss_and_gradients(X, y)
+            assert np.isclose(loss, losses[k])
+            single.step(gradients)
+    
+    for k, single in enumerate(singles):
+        assert np.allclose(batched.model.weights[k], single.model.weights)
+        assert np.allclose(batched.model.bias[k], single.model.bias)
+    
+    config = yaml.safe_load(open('configs/sample_config.yaml'))
+    config['model'] = {'class': 'BatchedLinearModel', 'input_dim': 4, 'n_models': 3}
+    config['optimizer']['learning_rate'] = learning_rates
+    config['trainloop'] = {'class': 'SweepTrainLoop', 'epochs': 2, 'batch_size': 32}
+    TrainLoop.create(config).execute()
+
+
+def test_data_parallel_train_loop():
+    """Test that data-parallel training matches the single-process loop for a fixed seed."""
+    print("\n=== Testing Data-Parallel TrainLoop ===")
+    
+    config = yaml.safe_load(open('configs/data_parallel_config.yaml'))
+    config['trainloop']['epochs'] = 2
+    train_loop = TrainLoop.create(config)
+    assert train_loop.model_config == config['model']
+    
+    np.random.seed(7)
+    parallel = TrainLoop.create(config)
+    parallel.execute()
+    assert parallel.samples_per_second > 0
+    
+    config['trainloop'] = {'class': 'StandardTrainLoop', 'epochs': 2, 'batch_size': 64}
+    np.random.seed(7)
+    single = TrainLoop.create(config)
+    single.execute()
+    
+    assert np.allclose(parallel.model.flat_params(), single.model.flat_params())
+
+
+def test_samplers():
+    """Test the samplers' batches and training from a memmapped dataset through an injected sampler."""
+    print("\n=== Testing Samplers ===")
+    
+    for config in [{'class': 'SequentialSampler'}, {'class': 'RandomSampler', 'seed': 1},
+                   {'class': 'BlockShuffleSampler', 'block_size': 8, 'seed': 1}]:
+        sampler = Sampler.create({'sampler': config})
+        batches = [np.arange(100)[batch] for batch in sampler.batches(100, 16)]
+        assert [len(batch) for batch in batches] == [16] * 6 + [4]
+        assert np.array_equal(np.sort(np.concatenate(batches)), np.arange(100))
+    
+    # Every block of 8 is visited contiguously
+    sampler = Sampler.create({'sampler': {'class': 'BlockShuffleSampler', 'block_size': 8, 'seed': 2}})
+    order = np.concatenate(list(sampler.batches(64, 16)))
+    assert all(len(np.unique(order[i:i + 8] // 8)) == 1 for i in range(0, 64, 8))
+    
+    weights = np.zeros(50)
+    weights[[3, 7]] = 1.0
+    sampler = Sampler.create({'sampler': {'class': 'WeightedSampler', 'weights': weights, 'num_samples': 40}})
+    drawn = np.concatenate(list(sampler.batches(50, 16)))
+    assert len(drawn) == 40 and set(drawn) <= {3, 7}
+    
+    cache_dir = tempfile.mkdtemp()
+    try:
+        config = yaml.safe_load(open('configs/sample_config.yaml'))
+        config['dataloader']['cache_dir'] = cache_dir
+        config['sampler'] = {'class': 'BlockShuffleSampler', 'block_size': 64}
+        config['trainloop']['epochs'] = 2
+        train_loop = TrainLoop.create(config)
+        assert train_loop.sampler.__class__.__name__ == 'BlockShuffleSampler'
+        
+        X, y = train_loop.dataloader.load_arrays()
+        assert isinstance(X, np.memmap)
+        train_loop.preprocessor = None
+        train_loop.execute()
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_streaming_online_train_loop():
+    """Test micro-batched online training from an iterator and from a local socket."""
+    print("\n=== Testing Streaming Online TrainLoop ===")
+    import socket
+    import threading
+    import time
+    
+    rng = np.random.default_rng(8)
+    true_weights = rng.normal(size=4)
+    X = rng.normal(size=(2000, 4))
+    y = X @ true_weights + 0.5
+    
+    def samples():
+        for i in range(len(y)):
+            if i == 1000:
+                # A pause in the stream flushes the partly filled micro-batch
+                time.sleep(0.2)
+            yield X[i], y[i]
+    
+    config = {
+        'dataloader': {'class': 'StreamDataLoader', 'source': samples()},
+        'metricfunction': {'class': 'MSE'},
+        'tracker': {'class': 'StdoutTracker'},
+        'model': {'class': 'LinearModel', 'input_dim': 4},
+        'optimizer': {'class': 'SGD', 'learning_rate': 0.1},
+        'trainloop': {'class': 'StreamingOnlineTrainLoop', 'max_batch_size': 16, 'max_latency': 0.05,
+                      'log_every': 500}
+    }
+    train_loop = TrainLoop.create(config)
+    train_loop.execute()
+    assert train_loop.samples_seen == 2000
+    assert train_loop.micro_batches > 2000 // 16
+    assert train_loop.ingest_rate > 0
+    assert np.allclose(train_loop.model.weights, true_weights, atol=0.05)
+    
+    # The same data as CSV lines over TCP, trained one sample at a time
+    server = socket.create_server(('127.0.0.1', 0))
+    port = server.getsockname()[1]
+    
+    def serve():
+        connection, _ = server.accept()
+        with connection:
+            lines = ''.join(','.join(map(str, row)) + '\n' for row in np.column_stack([X, y]))
+            connection.sendall(lines.encode())
+        server.close()
+    
+    threading.Thread(target=serve, daemon=True).start()
+    config['dataloader'] = {'class': 'StreamDataLoader', 'source': f'tcp://127.0.0.1:{port}'}
+    config['optimizer']['learning_rate'] = 0.02
+    config['trainloop'].update({'per_sample': True, 'max_samples': 1500})
+    train_loop = TrainLoop.create(config)
+    train_loop.execute()
+    assert train_loop.samples_seen == 1500
+    assert np.allclose(train_loop.model.weights, true_weights, atol=0.05)
+    
+    # A schedule counts each log_every window as an epoch
+    with tempfile.TemporaryDirectory() as tmp:
+        config['dataloader'] = {'class': 'StreamDataLoader', 'source': iter(zip(X, y))}
+        config['tracker'] = {'class': 'LocalStoreTracker', 'directory': tmp}
+        config['scheduler'] = {'class': 'StepScheduler', 'step_epochs': 1, 'gamma': 0.5}
+        config['trainloop'].update({'per_sample': False, 'max_samples': 2000})
+        train_loop = TrainLoop.create(config)
+        train_loop.execute()
+        steps, scales = train_loop.tracker.store.read('lr_scale')
+        assert steps[-1] == 2000 and np.allclose(scales[:3], [0.5, 0.25, 0.125])
+        assert np.isclose(train_loop.optimizer.lr_scale, 0.5 ** len(steps))
+
+
+def test_metric_accumulators():
+    """Test metric accumulators and that epoch metrics reuse the training predictions."""
+    print("\n=== Testing Metric Accumulators ===")
+    
+    rng = np.random.default_rng(9)
+    y = rng.normal(size=100)
+    y_pred = rng.normal(size=100)
+    for name in ['MAE', 'MSE']:
+        metric = MetricFunction.create({'metricfunction': {'class': name}})
+        other = MetricFunction.create({'metricfunction': {'class': name}})
+        metric.update(y[:30], y_pred[:30])
+        other.update(y[30:], y_pred[30:])
+        metric.merge(other)
+        assert np.isclose(metric.compute(), metric.calculate(y, y_pred))
+        
+        # (n, K) predictions of a batched model are scored per model
+        stacked = np.column_stack([y_pred, y])
+        assert np.allclose(metric.calculate(y, stacked), [metric.calculate(y, y_pred), 0.0])
+        metric.reset()
+        metric.update(y, stacked)
+        assert np.allclose(metric.compute(), [metric.calculate(y, y_pred), 0.0])
+    
+    config = yaml.safe_load(open('configs/sample_config.yaml'))
+    config['trainloop']['epochs'] = 2
+    train_loop = TrainLoop.create(config)
+    full_predictions = []
+    predict = train_loop.model.predict
+    def counting_predict(X):
+        if len(X) == 1000:
+            full_predictions.append(len(X))
+        return predict(X)
+    train_loop.model.predict = counting_predict
+    train_loop.execute()
+    assert not full_predictions
+    assert train_loop.metric_function.count == 1000
+    
+    # A metric with only calculate() is accumulated by buffering the batches
+    class MedianAbsoluteError(MetricFunction):
+        def calculate(self, y_true, y_pred):
+            return float(np.median(np.abs(np.asarray(y_pred) - np.asarray(y_true))))
+    
+    median = MedianAbsoluteError()
+    median.update(y[:30], y_pred[:30])
+    other = MedianAbsoluteError()
+    other.update(y[30:], y_pred[30:])
+    median.merge(other)
+    assert np.isclose(median.compute(), median.calculate(y, y_pred))
+    median.reset()
+    median.update(y, y_pred)
+    assert np.isclose(median.compute(), median.calculate(y, y_pred))
+    train_loop = TrainLoop.create(dict(config, metricfunction=MedianAbsoluteError()))
+    train_loop.execute()
+    assert np.isfinite(train_loop.metric_function.compute())
+    
+    # max_eval_samples adds an evaluation pass on a fixed training subset
+    config['trainloop']['max_eval_samples'] = 100
+    train_loop = TrainLoop.create(config)
+    eval_sizes = []
+    predict = train_loop.model.predict
+    def recording_predict(X):
+        if len(X) > 16:
+            eval_sizes.append(len(X))
+        return predict(X)
+    train_loop.model.predict = recording_predict
+    train_loop.execute()
+    assert eval_sizes == [100, 100]
+    assert train_loop.metric_function.count == 1000
+
+
+def test_metric_suite():
+    """Test that the metric suite matches direct formulas, chunked, merged and in float32."""
+    print("\n=== Testing Metric Suite ===")
+    
+    rng = np.random.default_rng(10)
+    y = rng.normal(size=1000) * 3 + 1
+    y_pred = y + rng.normal(size=1000)
+    residual = y_pred - y
+    error = y - y_pred
+    expected = {
+        'mse': np.mean(residual ** 2),
+        'mae': np.mean(np.abs(residual)),
+        'rmse': np.sqrt(np.mean(residual ** 2)),
+        'r2': 1 - np.sum(residual ** 2) / np.sum((y - y.mean()) ** 2),
+        'max_error': np.max(np.abs(residual)),
+        'bias': np.mean(residual),
+        'pinball_0.9': np.mean(np.maximum(0.9 * error, -0.1 * error))
+    }
+    config = {'metricfunction': {'class': 'MetricSuite', 'metrics': list(expected), 'chunk_size': 128}}
+    suite = MetricFunction.create(config)
+    result = suite.calculate(y, y_pred)
+    assert list(result) == list(expected)
+    for name, value in expected.items():
+        assert np.isclose(result[name], value), name
+    
+    other = MetricFunction.create(config)
+    suite.update(y[:300], y_pred[:300])
+    other.update(y[300:], y_pred[300:])
+    suite.merge(other)
+    for name, value in suite.compute().items():
+        assert np.isclose(value, expected[name]), name
+    
+    config['metricfunction']['dtype'] = 'float32'
+    for name, value in MetricFunction.create(config).calculate(y, y_pred).items():
+        assert np.isclose(value, expected[name], rtol=1e-4), name
+    
+    log = tempfile.NamedTemporaryFile(suffix='.log', delete=False).name
+    try:
+        config = yaml.safe_load(open('configs/sample_config.yaml'))
+        config['metricfunction'] = {'class': 'MetricSuite', 'metrics': ['rmse', 'r2', 'pinball_0.5']}
+        config['tracker'] = {'class': 'LogfileTracker', 'logfile': log}
+        config['trainloop']['epochs'] = 2
+        TrainLoop.create(config).execute()
+        contents = open(log).read()
+        assert 'METRIC: rmse = ' in contents and 'METRIC: r2 = ' in contents and 'METRIC: pinball_0.5 = ' in contents
+    finally:
+        os.remove(log)
+
+
+def test_validation_and_early_stopping():
+    """Test the validation split, evaluation cadence and early stopping with best-parameter restore."""
+    print("\n=== Testing Validation and Early Stopping ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        config = yaml.safe_load(open('configs/sample_config.yaml'))
+        config['tracker'] = {'class': 'LocalStoreTracker', 'directory': tmp}
+        config['trainloop'].update({'epochs': 7, 'validation_fraction': 0.2, 'eval_every': 3})
+        train_loop = TrainLoop.create(config)
+        train_loop.execute()
+        assert train_loop.metric_function.count == 800
+        evaluated, _ = train_loop.tracker.store.read('eval_metric')
+        assert list(evaluated) == [2, 5, 6]
+        
+        config['trainloop'].pop('validation_fraction')
+        config['trainloop']['validation_loader'] = dict(config['dataloader'])
+        train_loop = TrainLoop.create(config)
+        train_loop.execute()
+        assert train_loop.metric_function.count == 1000
+    
+    # No improvement can beat a huge min_delta, so training stops after `patience`
+    # evaluations and restores the parameters of the first epoch
+    config = yaml.safe_load(open('configs/sample_config.yaml'))
+    config['trainloop'].update({'epochs': 20, 'validation_fraction': 0.2,
+                                'early_stopping_patience': 2, 'early_stopping_min_delta': 1e9})
+    np.random.seed(0)
+    train_loop = TrainLoop.create(config)
+    train_loop.execute()
+    assert train_loop.stopped_epoch == 2
+    
+    config['trainloop'].update({'epochs': 1, 'early_stopping_patience': None})
+    np.random.seed(0)
+    reference = TrainLoop.create(config)
+    reference.execute()
+    for param, expected in zip(train_loop.model.get_params(), reference.model.get_params()):
+        assert np.allclose(param, expected)
+
+
+def test_schedulers():
+    """Test the schedule shapes, checkpointing and wiring a scheduler into the train loop."""
+    print("\n=== Testing Schedulers ===")
+    
+    def create(scheduler):
+        return Scheduler.create({'model': {'class': 'LinearModel', 'input_dim': 4},
+                                 'optimizer': {'class': 'SGD', 'learning_rate': 0.1},
+                                 'scheduler': scheduler})
+    
+    def scales(scheduler, epochs, steps_per_epoch, scores=None):
+        scheduler.start(epochs, steps_per_epoch)
+        values = []
+        for epoch in range(epochs):
+            for _ in range(steps_per_epoch):
+                values.append(scheduler.optimizer.lr_scale)
+                scheduler.step()
+            scheduler.end_epoch(scores[epoch] if scores else None)
+        return np.array(values)
+    
+    warmup = scales(create({'class': 'WarmupScheduler', 'warmup_epochs': 1}), 2, 4)
+    assert np.allclose(warmup, [0.1, 0.325, 0.55, 0.775, 1, 1, 1, 1])
+    cosine = scales(create({'class': 'CosineScheduler', 'min_factor': 0.1}), 4, 2)
+    assert np.isclose(cosine[0], 1.0) and np.all(np.diff(cosine) < 0) and cosine[-1] > 0.1
+    step = scales(create({'class': 'StepScheduler', 'step_epochs': 2, 'gamma': 0.5}), 4, 2)
+    assert np.allclose(step, [1, 1, 1, 1, 0.5, 0.5, 0.5, 0.5])
+    one_cycle = scales(create({'class': 'OneCycleScheduler', 'pct_start': 0.25}), 4, 2)
+    assert np.isclose(one_cycle[0], 1 / 25) and np.isclose(one_cycle.max(), 1.0)
+    assert np.argmax(one_cycle) == 2 and np.all(np.diff(one_cycle[2:]) < 0)
+    plateau = scales(create({'class': 'ReduceOnPlateauScheduler', 'patience': 1, 'gamma': 0.5}), 5, 1,
+                     [1.0, 0.5, 0.5, 0.5, 0.5])
+    assert np.allclose(plateau, [1, 1, 1, 1, 0.5])
+    
+    # A resumed scheduler continues the schedule where the checkpoint left off
+    scheduler = create({'class': 'ReduceOnPlateauScheduler', 'patience': 0, 'gamma': 0.5, 'warmup_epochs': 2})
+    scales(scheduler, 2, 3, [1.0, 2.0])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'scheduler.npz')
+        scheduler.save_state(path)
+        resumed = create({'class': 'ReduceOnPlateauScheduler', 'patience': 0, 'gamma': 0.5, 'warmup_epochs': 2})
+        resumed.load_state(path)
+    assert resumed.state_dict() == scheduler.state_dict()
+    assert resumed.optimizer.lr_scale == scheduler.optimizer.lr_scale == 0.5
+    
+    config = yaml.safe_load(open('configs/scheduler_config.yaml'))
+    train_loop = TrainLoop.create(config)
+    assert train_loop.scheduler.optimizer is train_loop.optimizer
+    train_loop.execute()
+    assert train_loop.scheduler.steps_per_epoch == 63
+    assert np.isclose(train_loop.optimizer.lr_scale, 0.0)
+    assert train_loop.metric_function.compute() < 0.02
+
+
+def test_async_tracker():
+    """Test that AsyncTracker writes everything in order, in batches, and applies its overflow policy."""
+    print("\n=== Testing Async Tracker ===")
+    from core.dependency_injection import DependencyInjector
+    
+    # The wrapped tracker is configuration, never the injected outer tracker
+    assert 'tracker' not in DependencyInjector(config_dict={}).dependency_graph['tracker']
+    
+    log = tempfile.NamedTemporaryFile(suffix='.log', delete=False).name
+    try:
+        tracker = Tracker.create({'tracker': {'class': 'AsyncTracker', 'flush_size': 100,
+                                              'tracker': {'class': 'LogfileTracker', 'logfile': log}}})
+        tracker.log_params({'lr': 0.1})
+        for step in range(1000):
+            tracker.log_metrics({'loss': step, 'step': step})
+        tracker.flush()
+        lines = open(log).read().splitlines()
+        assert lines[1:3] == ['PARAMS:', '  lr = 0.1']
+        assert [line for line in lines if 'loss' in line] == [f'METRIC: loss = {step}' for step in range(1000)]
+        # Repeated names start a new batch, so each (loss, step) pair is one inner log_metrics call
+        assert tracker.batches_written == 1000
+        tracker.close()
+        
+        config = yaml.safe_load(open('configs/sample_config.yaml'))
+        config['tracker'] = {'class': 'AsyncTracker', 'tracker': {'class': 'LogfileTracker', 'logfile': log}}
+        config['trainloop']['epochs'] = 2
+        train_loop = TrainLoop.create(config)
+        train_loop.execute()
+        assert 'METRIC: metric = ' in open(log).read()
+        train_loop.tracker.close()
+    finally:
+        os.remove(log)
+    
+    class SlowTracker(StdoutTracker):
+        def log_metrics(self, metrics, step=None):
+            time.sleep(0.05)
+    
+    tracker = AsyncTracker(SlowTracker(), capacity=10, flush_size=10, overflow='drop')
+    for step in range(100):
+        tracker.log_metric('loss', step)
+    assert tracker.dropped > 0
+    tracker.close()
+    
+    class FailingTracker(StdoutTracker):
+        def log_metrics(self, metrics, step=None):
+            raise IOError("disk full")
+    
+    tracker = AsyncTracker(FailingTracker(), flush_interval=0.01)
+    tracker.log_metric('loss', 1.0)
+    try:
+        tracker.flush()
+        assert False, "inner tracker errors should surface on the training thread"
+    except RuntimeError as e:
+        assert isinstance(e.__cause__, IOError)
+    try:
+        tracker.close()
+    except RuntimeError:
+        pass
+
+
+def test_metric_store():
+    """Test step-indexed logging into the local metric store: spills, range reads, downsampling and reopening."""
+    print("\n=== Testing Metric Store ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = Tracker.create({'tracker': {'class': 'LocalStoreTracker', 'directory': tmp, 'spill_size': 64}})
+        for step in range(1000):
+            tracker.log_metrics({'loss': 1.0 / (step + 1), 'lr': 0.1}, step)
+        tracker.log_metric('samples', 10)
+        tracker.log_metric('samples', 20)
+        tracker.log_params({'batch_size': 16})
+        store = tracker.store
+        assert store.names() == ['loss', 'lr', 'samples']
+        
+        steps, values = store.read('loss', 100, 200)
+        assert list(steps) == list(range(100, 200)) and np.allclose(values, 1.0 / (steps + 1))
+        assert list(store.read('samples')[0]) == [0, 1]
+        steps, values = store.downsample('loss', 10, how='max')
+        assert len(steps) == 10 and steps[-1] == 999 and np.isclose(values[0], 1.0)
+        assert np.isclose(store.downsample('lr', 7)[1], 0.1).all()
+        
+        tracker.flush()
+        # A torn final block is dropped when the file is reopened
+        with open(os.path.join(tmp, 'metrics.bin'), 'ab') as f:
+            f.write(b'MBLK\x04')
+        reopened = MetricStore(os.path.join(tmp, 'metrics.bin'))
+        steps, values = reopened.read('loss')
+        assert list(steps) == list(range(1000)) and np.allclose(values, 1.0 / (steps + 1))
+        reopened.append('samples', 30)
+        reopened.flush()
+        assert list(MetricStore(os.path.join(tmp, 'metrics.bin')).read('samples')[0]) == [0, 1, 2]
+        assert yaml.safe_load(open(os.path.join(tmp, 'params.json'))) == {'batch_size': 16}
+        
+        # close() writes what is still buffered
+        closing = Tracker.create({'tracker': {'class': 'LocalStoreTracker', 'directory': os.path.join(tmp, 'closed')}})
+        closing.log_metric('loss', 0.5, 3)
+        closing.close()
+        assert closing.store._file is None
+        steps, values = MetricStore(os.path.join(tmp, 'closed', 'metrics.bin')).read('loss')
+        assert list(steps) == [3] and list(values) == [0.5]
+        
+        # Logging after close() appends to the blocks already written
+        store = MetricStore(os.path.join(tmp, 'reused.bin'), spill_size=4)
+        for step in range(10):
+            store.append('loss', step * 0.1, step)
+        store.close()
+        store.append('loss', 9.9, 99)
+        store.flush()
+        expected_steps = list(range(10)) + [99]
+        assert list(store.read('loss')[0]) == expected_steps
+        steps, values = MetricStore(os.path.join(tmp, 'reused.bin')).read('loss')
+        assert list(steps) == expected_steps and np.isclose(values[-1], 9.9)
+
+
+def test_mlflow_tracker():
+    """Test that MLFlowTracker writes an MLflow file-store run with batched metric appends."""
+    print("\n=== Testing MLflow Tracker ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {'class': 'MLFlowTracker', 'tracking_uri': 'file://' + tmp, 'experiment_name': 'sample',
+                  'run_name': 'r1', 'tags': {'team': 'ml'}, 'flush_size': 10}
+        tracker = Tracker.create({'tracker': config})
+        assert yaml.safe_load(open(os.path.join(tmp, '0', 'meta.yaml')))['name'] == 'Default'
+        assert yaml.safe_load(open(os.path.join(tmp, '1', 'meta.yaml')))['name'] == 'sample'
+        run_dir = tracker.run_dir
+        assert open(os.path.join(run_dir, 'tags', 'team')).read() == 'ml'
+        assert open(os.path.join(run_dir, 'tags', 'mlflow.runName')).read() == 'r1'
+        
+        metric_path = os.path.join(run_dir, 'metrics', 'loss')
+        for step in range(9):
+            tracker.log_metric('loss', 1.0 / (step + 1), step)
+        # Nothing is written until flush_size metrics are buffered
+        assert not os.path.exists(metric_path)
+        tracker.log_metrics({'loss': 0.1, 'metric': 0.5}, 9)
+        lines = [line.split() for line in open(metric_path).read().splitlines()]
+        assert [int(step) for _, _, step in lines] == list(range(10))
+        assert np.isclose(float(lines[-1][1]), 0.1)
+        
+        tracker.log_params({'batch_size': 16})
+        tracker.log_params({'batch_size': 16})
+        try:
+            tracker.log_params({'batch_size': 32})
+            assert False, "Changing a logged param should raise"
+        except ValueError:
+            pass
+        assert open(os.path.join(run_dir, 'params', 'batch_size')).read() == '16'
+        
+        tracker.log_metric('loss', 0.05, 10)
+        tracker.end_run()
+        meta = yaml.safe_load(open(os.path.join(run_dir, 'meta.yaml')))
+        assert meta['status'] == 3 and meta['end_time'] >= meta['start_time']
+        assert len(open(metric_path).read().splitlines()) == 11
+        
+        # A second tracker reuses the experiment
+        again = Tracker.create({'tracker': dict(config, run_name='r2')})
+        assert again.experiment_id == '1'
+        again.end_run()
+
+
+def test_cached_resolution():
+    """Test that injectors share the dependency graph and plans until components or config files change."""
+    print("\n=== Testing Cached Resolution ===")
+    import gc
+    from core.dependency_injection import DependencyInjector
+    
+    config = yaml.safe_load(open('configs/sample_config.yaml'))
+    first = DependencyInjector(config_dict=config)
+    second = DependencyInjector(config_dict=dict(config, optimizer={'class': 'Adam', 'learning_rate': 0.1}))
+    assert first.dependency_graph is second.dependency_graph
+    assert first._plan('trainloop') is second._plan('trainloop')
+    assert second.get_instance('optimizer').learning_rate == 0.1
+    # A different class is a different layout
+    sgd = DependencyInjector(config_dict=dict(config, optimizer={'class': 'SGD'}))
+    assert sgd._plan('trainloop') is not first._plan('trainloop')
+    assert type(sgd.get_instance('trainloop').optimizer).__name__ == 'SGD'
+    
+    # Defining a component subclass rebuilds the graph from its constructor
+    class ProbeTracker(Tracker):
+        def __init__(self, optimizer: Optimizer, **kwargs):
+            self.optimizer = optimizer
+    assert 'optimizer' in DependencyInjector(config_dict=config).dependency_graph['tracker']
+    del ProbeTracker
+    gc.collect()
+    assert 'optimizer' not in DependencyInjector(config_dict=config).dependency_graph['tracker']
+    
+    # Replacing a class inside its module, as a reload or monkeypatch does, is picked up too
+    import components.optimizer
+    original = components.optimizer.SGD
+    class PatchedSGD(original):
+        pass
+    components.optimizer.SGD = PatchedSGD
+    try:
+        assert type(DependencyInjector(config_dict=dict(config, optimizer={'class': 'SGD'}))
+                    .get_instance('trainloop').optimizer) is PatchedSGD
+    finally:
+        components.optimizer.SGD = original
+    assert type(sgd.get_instance('optimizer')) is original
+    assert type(DependencyInjector(config_dict=dict(config, optimizer={'class': 'SGD'}))
+                .get_instance('optimizer')) is original
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'config.yaml')
+        with open(path, 'w') as f:
+            yaml.safe_dump(config, f)
+        loaded = DependencyInjector(config_path=path)
+        loaded.config['model']['input_dim'] = 99
+        assert DependencyInjector(config_path=path).config['model']['input_dim'] == 4
+        with open(path, 'w') as f:
+            yaml.safe_dump(dict(config, model={'class': 'LinearModel', 'input_dim': 7}), f)
+        os.utime(path, ns=(0, 0))
+        assert DependencyInjector(config_path=path).get_instance('model').input_dim == 7
+
+
+def test_concurrent_construction():
+    """Test concurrent construction of independent components, async factories, timings and cycle detection."""
+    print("\n=== Testing Concurrent Construction ===")
+    import asyncio
+    import gc
+    import components.model
+    import components.tracker
+    import components.sampler
+    from components.model import LinearModel
+    from core.dependency_injection import DependencyInjector
+    
+    class SlowModel(LinearModel):
+        def __init__(self, **kwargs):
+            time.sleep(0.2)
+            super().__init__(**kwargs)
+    
+    class SlowStoreTracker(StdoutTracker):
+        @classmethod
+        async def acreate(cls, **kwargs):
+            await asyncio.sleep(0.2)
+            return cls(**kwargs)
+    
+    components.model.SlowModel = SlowModel
+    components.tracker.SlowStoreTracker = SlowStoreTracker
+    try:
+        config = yaml.safe_load(open('configs/sample_config.yaml'))
+        config.update(model={'class': 'SlowModel', 'input_dim': 4}, tracker={'class': 'SlowStoreTracker'})
+        serial = DependencyInjector(config_dict=config)
+        start = time.perf_counter()
+        serial.get_instance('trainloop')
+        assert time.perf_counter() - start >= 0.4
+        assert isinstance(serial.get_instance('tracker'), SlowStoreTracker)
+        
+        concurrent = DependencyInjector(config_dict=dict(config, injector={'max_workers': 4, 'report_timings': True}))
+        start = time.perf_counter()
+        train_loop = concurrent.get_instance('trainloop')
+        assert time.perf_counter() - start < 0.35
+        assert train_loop.model is concurrent.get_instance('model')
+        assert train_loop.optimizer.model is train_loop.model
+        assert set(concurrent.construction_times) == {
+            'dataloader', 'metricfunction', 'tracker', 'preprocessor', 'model', 'optimizer', 'trainloop'}
+        path, seconds = concurrent.critical_path('trainloop')
+        assert path[-1] == 'trainloop' and 'model' in path and 0.2 <= seconds < 0.35
+        
+        # Async factories also work when the injector is used inside a running event loop
+        async def build_in_loop(max_workers, component_type):
+            return DependencyInjector(config_dict=config, max_workers=max_workers).get_instance(component_type)
+        for max_workers in (1, 4):
+            for component_type in ('tracker', 'trainloop'):
+                instance = asyncio.run(build_in_loop(max_workers, component_type))
+                assert type(instance).__name__ == ('SlowStoreTracker' if component_type == 'tracker'
+                                                   else 'StandardTrainLoop')
+    finally:
+        del components.model.SlowModel, components.tracker.SlowStoreTracker
+    
+    # A model that needs a sampler and a sampler that needs a model form a cycle, found before constructing
+    class SampledModel(Model):
+        def __init__(self, sampler: Optional[Sampler] = None, **kwargs):
+            pass
+    
+    class ModelSampler(Sampler):
+        def __init__(self, model: Optional[Model] = None, **kwargs):
+            pass
+    
+    components.model.SampledModel = SampledModel
+    components.sampler.ModelSampler = ModelSampler
+    try:
+        injector = DependencyInjector(config_dict={'model': {'class': 'SampledModel'},
+                                                   'sampler': {'class': 'ModelSampler'}})
+        injector.get_instance('model')
+        assert False, "A dependency cycle should raise"
+    except ValueError as e:
+        assert 'model -> sampler -> model' in str(e)
+    finally:
+        del components.model.SampledModel, components.sampler.ModelSampler
+        del SampledModel, ModelSampler, injector
+        gc.collect()
+
+
 if __name__ == "__main__":
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
     
@@ -95,5 +1170,31 @@ if __name__ == "__main__":
     # Run tests
     test_with_yaml_file()
     test_with_dict_config()
+    test_streaming_chunks()
+    test_memmap_cache()
+    test_prefetch_batch_iterator()
+    test_sharded_loader()
+    test_column_projection()
+    test_parquet_loader()
+    test_incremental_normalizer_fit()
+    test_inplace_transform()
+    test_preprocessor_pipeline()
+    test_fused_loss_and_gradients()
+    test_flat_parameter_updates()
+    test_adam_state_roundtrip()
+    test_normal_equation_train_loop()
+    test_batched_sweep()
+    test_data_parallel_train_loop()
+    test_samplers()
+    test_streaming_online_train_loop()
+    test_metric_accumulators()
+    test_metric_suite()
+    test_validation_and_early_stopping()
+    test_schedulers()
+    test_async_tracker()
+    test_metric_store()
+    test_mlflow_tracker()
+    test_cached_resolution()
+    test_concurrent_construction()
     
     print("\nAll tests completed.") 
\ No newline at end of file